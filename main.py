@@ -2,16 +2,23 @@
 """Main entry point for Obsidian audio transcription watcher"""
 
 import argparse
+import signal
 import sys
 from pathlib import Path
 
 from src.config import Config
+from src.constants import MAX_CONCURRENT_SEGMENTS
 from src.obsidian.handler import ObsidianTranscriptionHandler
 from src.obsidian.watcher import VaultWatcher
 from src.utils.system import ensure_ffmpeg, validate_directory_path
 from src.utils.logging import setup_logging, get_logger
 
 
+def _raise_keyboard_interrupt(signum, frame):
+    """Turn SIGTERM into KeyboardInterrupt so shutdown runs the same cleanup"""
+    raise KeyboardInterrupt
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -50,12 +57,25 @@ def main():
         help='起動時に既存ファイルもスキャンして処理'
     )
 
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='--scan-existing の既存ファイルをBatch API（半額・最大24時間）でまとめて処理'
+    )
+
     parser.add_argument(
         '--no-summary',
         action='store_true',
         help='要約の生成を無効化（文字起こしのみ）'
     )
 
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help=f'VAD分割したセグメントを同時に文字起こしする数（デフォルト: {MAX_CONCURRENT_SEGMENTS}）'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -97,8 +117,9 @@ def main():
         vault_path = validate_directory_path(Path(args.watch_folder))
         config.watch_folder = vault_path
 
-        # Get database path
+        # Get database and cache paths
         db_path = config.get_db_path()
+        cache_path = config.get_cache_path()
 
         logger.info("Starting Obsidian audio transcription watcher")
         logger.info(f"Vault: {vault_path}")
@@ -110,7 +131,9 @@ def main():
             vault_path=vault_path,
             db_path=db_path,
             create_summary=config.create_summary,
-            verbose=config.verbose
+            verbose=config.verbose,
+            cache_path=cache_path,
+            max_concurrency=config.max_concurrency
         )
 
         # Create watcher
@@ -119,18 +142,33 @@ def main():
             process_callback=handler.process_audio_file
         )
 
-        # Scan existing files if requested
-        if config.scan_existing:
-            logger.info("Scanning existing files")
-            watcher.scan_existing_files()
-
-        # Start watching
-        logger.info("Starting file system watcher")
-        print(f"\n🎧 音声ファイル監視中: {vault_path}")
-        print(f"  要約生成: {'有効' if config.create_summary else '無効'}")
-        print("  終了するには Ctrl+C を押してください\n")
-
-        watcher.run_forever()
+        # systemd stops the service with SIGTERM; handle it like Ctrl+C so
+        # the database is compacted on the way out
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+        try:
+            # Scan existing files if requested
+            if config.scan_existing:
+                if config.batch_mode:
+                    # Runs in the background; the job is cancelled if we exit
+                    # before it finishes
+                    logger.info("Scanning existing files (Batch API)")
+                    handler.start_batch_scan(watcher.find_audio_files())
+                else:
+                    logger.info("Scanning existing files")
+                    watcher.scan_existing_files(
+                        segment_concurrency=config.max_concurrency
+                    )
+
+            # Start watching
+            logger.info("Starting file system watcher")
+            print(f"\n🎧 音声ファイル監視中: {vault_path}")
+            print(f"  要約生成: {'有効' if config.create_summary else '無効'}")
+            print("  終了するには Ctrl+C を押してください\n")
+
+            watcher.run_forever()
+        finally:
+            handler.close()
 
         print("\n👋 監視を終了しました")
 
@@ -0,0 +1,88 @@
+"""Persistent cache for Gemini API results"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def hash_text(text: str) -> str:
+    """
+    Calculate the SHA-256 hash of a text
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed key-value cache for transcription and summary results"""
+
+    def __init__(self, cache_path: Path):
+        """
+        Initialize cache
+
+        Args:
+            cache_path: Path to the SQLite cache file
+        """
+        self.cache_path = cache_path
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(cache_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        logger.info(f"Opened result cache: {cache_path}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached text or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        logger.debug(f"Cache hit: {key}")
+        return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Store a result
+
+        Args:
+            key: Cache key
+            value: Text to cache
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -1,51 +1,302 @@
 """Gemini API client wrapper"""
 
-from typing import Optional, Any
+import asyncio
+import functools
+import importlib.util
+import mimetypes
+import threading
+import time
+from typing import Optional, Any, Awaitable, Dict, List, Tuple, TypeVar, Union
 from pathlib import Path
+import httpx
 from google import genai
-from google.genai.types import File
-
-from src.constants import TRANSCRIPTION_MODEL, SUMMARY_MODEL
-from src.api.retry import retry_with_backoff
+from google.genai.types import (
+    BatchJob,
+    Content,
+    File,
+    FileData,
+    FileState,
+    HttpOptions,
+    InlinedRequest,
+    JobState,
+    Part,
+)
+
+from src.constants import (
+    AUDIO_MIME_TYPES,
+    TRANSCRIPTION_MODEL,
+    SUMMARY_MODEL,
+    MAX_CONCURRENT_SEGMENTS,
+    PROMPT_VERSION,
+    BATCH_POLL_INTERVAL,
+    DEFAULT_TIMEOUT,
+    HTTP_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+)
+from src.api.cache import ResultCache, hash_text
+from src.api.retry import (
+    RetryableError,
+    retry_with_backoff,
+    retry_with_backoff_async,
+)
 from src.utils.logging import get_logger
+from src.utils.system import hash_file
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+class BatchInterruptedError(Exception):
+    """Raised when waiting for a batch job is stopped before it finishes"""
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# Batch job states after which polling stops
+BATCH_TERMINAL_STATES = {
+    JobState.JOB_STATE_SUCCEEDED,
+    JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    JobState.JOB_STATE_FAILED,
+    JobState.JOB_STATE_CANCELLED,
+    JobState.JOB_STATE_EXPIRED,
+}
+
+# Prompts are built once; only segment times, context and text vary per call
+_TRANSCRIBE_INSTRUCTIONS = (
+    "文字起こししてください。「あー」や「えーと」などの口語的な表現は削除し、"
+    "内容を保ちつつ読みやすい文章にしてください。"
+)
+_TRANSCRIBE_FULL_PROMPT = "この音声ファイルを" + _TRANSCRIBE_INSTRUCTIONS
+_TRANSCRIBE_SEGMENT_PROMPT = (
+    "この音声ファイル（元の音声の{start:.1f}秒から{end:.1f}秒の部分）を"
+    + _TRANSCRIBE_INSTRUCTIONS
+)
+
+_SUMMARY_PROMPT_HEAD = """以下の音声文字起こしを読んで、構造化された要約を作成してください。
+
+要約の形式：
+1. **主要なトピック**: 箇条書き
+2. **重要なポイント**: 最も重要な情報を箇条書き
+3. **結論・まとめ**: 完結かつ要点を押さえた文章
+4. **キーワード**: 重要な用語やコンセプトとそれぞれの説明を箇条書きで
+
+"""
+_SUMMARY_PROMPT_BODY = """
+
+文字起こし内容：
+---
+"""
+_SUMMARY_PROMPT_TAIL = """
+---
+
+要約は明確で読みやすく、マークダウン形式で作成してください。"""
+
+
+@functools.lru_cache(maxsize=4)
+def get_genai_client(api_key: str) -> genai.Client:
+    """
+    Get a shared genai client for an API key
+
+    The client owns the HTTP connection pool, so sharing it across
+    GeminiClient instances keeps connections alive between files.
+
+    Args:
+        api_key: Google API key
+
+    Returns:
+        genai client with request timeouts configured
+    """
+    client_args = _http_client_args()
+    # The SDK passes async client args to aiohttp instead when it is
+    # installed, which does not accept httpx options
+    async_client_args = None if _has_module("aiohttp") else client_args
+    # Request timeouts are enforced by the SDK's HTTP client (milliseconds)
+    return genai.Client(
+        api_key=api_key,
+        http_options=HttpOptions(
+            timeout=DEFAULT_TIMEOUT * 1000,
+            client_args=client_args,
+            async_client_args=async_client_args,
+        ),
+    )
+
+
+def _http_client_args() -> Dict[str, Any]:
+    """
+    Get httpx client options for the shared API connection pool
+
+    Idle connections are kept long enough to be reused between segments and
+    between files, and HTTP/2 multiplexes concurrent segment requests over
+    one connection when the h2 package is installed.
+
+    Returns:
+        Keyword arguments for httpx.Client and httpx.AsyncClient
+    """
+    return {
+        "limits": httpx.Limits(
+            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "http2": _has_module("h2"),
+    }
+
+
+def _has_module(name: str) -> bool:
+    """Check whether an optional module is installed without importing it"""
+    return importlib.util.find_spec(name) is not None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared background event loop, starting it on first use
+
+    Returns:
+        Event loop running forever on a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="gemini-async", daemon=True
+            ).start()
+    return _loop
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the shared background event loop and wait for it
+
+    The async HTTP connections of the genai client belong to the loop they
+    were opened on, so all async API work runs on one long-lived loop
+    instead of a fresh asyncio.run() loop per file. Safe to call from any
+    thread other than the loop's own.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
 
 class GeminiClient:
     """Wrapper for Gemini API client with retry logic"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_path: Optional[Path] = None):
         """
         Initialize Gemini client
 
         Args:
             api_key: Google API key
+            cache_path: Optional path to a persistent result cache
         """
         self.api_key = api_key
         self.transcription_model = TRANSCRIPTION_MODEL
         self.summary_model = SUMMARY_MODEL
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client(api_key)
+        self.cache = ResultCache(cache_path) if cache_path else None
+        # Uploaded files keyed by content hash, reused while still active
+        self._upload_cache: Dict[str, File] = {}
         logger.info("Initialized Gemini client")
         logger.info(f"Transcription model: {self.transcription_model}")
         logger.info(f"Summary model: {self.summary_model}")
 
-    def upload_file(self, file_path: Path) -> File:
+    def upload_file(self, file_path: Path, file_hash: Optional[str] = None) -> File:
+        """
+        Upload a file to Gemini API, reusing a previous upload of the same content
+
+        Args:
+            file_path: Path to the file to upload
+            file_hash: Optional precomputed content hash of the file
+
+        Returns:
+            Uploaded file object
         """
-        Upload a file to Gemini API
+        file_hash = file_hash or hash_file(file_path)
+        reusable = self._get_reusable_upload(file_hash)
+        if reusable:
+            return reusable
+
+        logger.debug(f"Uploading file: {file_path}")
+        uploaded = retry_with_backoff(lambda: self._upload(file_path))
+        self._upload_cache[file_hash] = uploaded
+        return uploaded
+
+    async def upload_file_async(
+        self, file_path: Path, file_hash: Optional[str] = None
+    ) -> File:
+        """
+        Upload a file to Gemini API without blocking the event loop
 
         Args:
             file_path: Path to the file to upload
+            file_hash: Optional precomputed content hash of the file
 
         Returns:
             Uploaded file object
         """
+        file_hash = file_hash or await asyncio.to_thread(hash_file, file_path)
+        reusable = await asyncio.to_thread(self._get_reusable_upload, file_hash)
+        if reusable:
+            return reusable
+
         logger.debug(f"Uploading file: {file_path}")
+        uploaded = await retry_with_backoff_async(lambda: self._upload_async(file_path))
+        self._upload_cache[file_hash] = uploaded
+        return uploaded
+
+    @staticmethod
+    def _mime_type(file_path: Path) -> Optional[str]:
+        """Get the MIME type sent with an upload"""
+        mime_type = AUDIO_MIME_TYPES.get(file_path.suffix.lower())
+        if mime_type is None:
+            mime_type, _ = mimetypes.guess_type(file_path.name)
+        return mime_type
+
+    def _upload(self, file_path: Path) -> File:
+        """Perform a single upload attempt, streaming the file in chunks"""
+        with open(file_path, "rb") as f:
+            return self.client.files.upload(
+                file=f, config={"mime_type": self._mime_type(file_path)}
+            )
 
-        def upload():
-            return self.client.files.upload(file=str(file_path))
+    async def _upload_async(self, file_path: Path) -> File:
+        """Perform a single upload attempt on the SDK's async transport"""
+        return await self.client.aio.files.upload(
+            file=str(file_path), config={"mime_type": self._mime_type(file_path)}
+        )
 
-        return retry_with_backoff(upload)
+    def _get_reusable_upload(self, file_hash: str) -> Optional[File]:
+        """
+        Return a previously uploaded file if it is still active on the server
+
+        Args:
+            file_hash: Content hash of the file
+
+        Returns:
+            Active file object or None if the file must be uploaded again
+        """
+        cached = self._upload_cache.get(file_hash)
+        if cached is None or not cached.name:
+            return None
+
+        try:
+            current = self.client.files.get(name=cached.name)
+        except Exception as e:
+            logger.debug(f"Cached upload {cached.name} is no longer available: {e}")
+            self._upload_cache.pop(file_hash, None)
+            return None
+
+        if current.state != FileState.ACTIVE:
+            self._upload_cache.pop(file_hash, None)
+            return None
+
+        logger.debug(f"Reusing uploaded file: {cached.name}")
+        return current
 
     def generate_content(
         self,
@@ -71,28 +322,78 @@ class GeminiClient:
         # Use provided model or default to summary model
         use_model = model or self.summary_model
 
-        def generate():
-            contents = [prompt]
-            if file:
-                contents.append(file)
+        return retry_with_backoff(
+            lambda: self._generate(prompt, file, use_model, **kwargs)
+        )
 
-            response = self.client.models.generate_content(
-                model=use_model, contents=contents, **kwargs
-            )
-            # Check if response has text attribute and it's not None
-            if hasattr(response, "text") and response.text:
-                return response.text
-            else:
-                # Treat None response as retryable error
-                logger.warning("API response has no text content, will retry")
-                from src.api.retry import RetryableError
+    async def generate_content_async(
+        self,
+        prompt: str,
+        file: Optional[File] = None,
+        model: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Generate content using Gemini API without blocking the event loop
 
-                raise RetryableError("API returned empty response")
+        Args:
+            prompt: Text prompt
+            file: Optional file object to include
+            model: Optional model override
+            **kwargs: Additional arguments for generate_content
 
-        return retry_with_backoff(generate)
+        Returns:
+            Generated text content
+        """
+        logger.debug(f"Generating content with prompt length: {len(prompt)}")
+
+        use_model = model or self.summary_model
+
+        return await retry_with_backoff_async(
+            lambda: self._generate_async(prompt, file, use_model, **kwargs)
+        )
+
+    def _generate(
+        self, prompt: str, file: Optional[File], model: str, **kwargs: Any
+    ) -> str:
+        """Perform a single generate_content attempt"""
+        contents: List[Any] = [prompt]
+        if file:
+            contents.append(file)
+
+        response = self.client.models.generate_content(
+            model=model, contents=contents, **kwargs
+        )
+        # Check if response has text attribute and it's not None
+        if hasattr(response, "text") and response.text:
+            return response.text
+
+        # Treat None response as retryable error
+        logger.warning("API response has no text content, will retry")
+        raise RetryableError("API returned empty response")
+
+    async def _generate_async(
+        self, prompt: str, file: Optional[File], model: str, **kwargs: Any
+    ) -> str:
+        """Perform a single generate_content attempt on the SDK's async transport"""
+        contents: List[Any] = [prompt]
+        if file:
+            contents.append(file)
+
+        response = await self.client.aio.models.generate_content(
+            model=model, contents=contents, **kwargs
+        )
+        if hasattr(response, "text") and response.text:
+            return response.text
+
+        logger.warning("API response has no text content, will retry")
+        raise RetryableError("API returned empty response")
 
     def transcribe_audio(
-        self, audio_path: Path, segment_info: Optional[tuple[float, float]] = None
+        self,
+        audio_path: Path,
+        segment_info: Optional[tuple[float, float]] = None,
+        file_hash: Optional[str] = None,
     ) -> str:
         """
         Transcribe an audio file
@@ -100,35 +401,350 @@ class GeminiClient:
         Args:
             audio_path: Path to the audio file
             segment_info: Optional tuple of (start_time, end_time) for segments
+            file_hash: Optional precomputed content hash of the file
 
         Returns:
             Transcribed text
         """
         logger.info(f"Transcribing audio: {audio_path}")
 
-        # Upload the audio file
-        audio_file = self.upload_file(audio_path)
+        file_hash = file_hash or hash_file(audio_path)
 
-        # Create the prompt
-        if segment_info:
-            start, end = segment_info
-            prompt = (
-                f"この音声ファイル（元の音声の{start:.1f}秒から{end:.1f}秒の部分）を"
-                f"文字起こししてください。「あー」や「えーと」などの口語的な表現は削除し、内容を保ちつつ読みやすい文章にしてください。"
-            )
-        else:
-            prompt = "この音声ファイルを文字起こししてください。「あー」や「えーと」などの口語的な表現は削除し、内容を保ちつつ読みやすい文章にしてください。"
+        cache_key = None
+        if self.cache:
+            cache_key = self._transcription_cache_key(file_hash, segment_info)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached transcription for: {audio_path}")
+                return cached
+
+        # Upload the audio file
+        audio_file = self.upload_file(audio_path, file_hash)
 
         # Generate transcription using transcription model
         transcription = self.generate_content(
-            prompt, audio_file, model=self.transcription_model
+            self._build_transcription_prompt(segment_info),
+            audio_file,
+            model=self.transcription_model,
         )
 
         # Note: None check is now handled in generate_content with retry
         logger.info(f"Transcription completed, length: {len(transcription)} characters")
 
+        if self.cache and cache_key:
+            self.cache.put(cache_key, transcription)
+
+        return transcription
+
+    async def transcribe_audio_async(
+        self, audio_path: Path, segment_info: Optional[tuple[float, float]] = None
+    ) -> str:
+        """
+        Transcribe an audio file without blocking the event loop
+
+        Args:
+            audio_path: Path to the audio file
+            segment_info: Optional tuple of (start_time, end_time) for segments
+
+        Returns:
+            Transcribed text
+        """
+        logger.info(f"Transcribing audio: {audio_path}")
+
+        file_hash = await asyncio.to_thread(hash_file, audio_path)
+
+        cache_key = None
+        if self.cache:
+            cache_key = self._transcription_cache_key(file_hash, segment_info)
+            # SQLite calls block, so keep them off the shared event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                logger.info(f"Using cached transcription for: {audio_path}")
+                return cached
+
+        audio_file = await self.upload_file_async(audio_path, file_hash)
+
+        transcription = await self.generate_content_async(
+            self._build_transcription_prompt(segment_info),
+            audio_file,
+            model=self.transcription_model,
+        )
+
+        logger.info(f"Transcription completed, length: {len(transcription)} characters")
+
+        if self.cache and cache_key:
+            await asyncio.to_thread(self.cache.put, cache_key, transcription)
+
         return transcription
 
+    async def transcribe_segments(
+        self,
+        segments: List[Tuple[float, float, Path]],
+        max_concurrency: int = MAX_CONCURRENT_SEGMENTS,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Transcribe audio segments concurrently
+
+        Args:
+            segments: List of (start_time, end_time, segment_path) tuples
+            max_concurrency: Maximum number of segments in flight at once
+
+        Returns:
+            Transcribed text for each segment in input order, or the exception
+            raised for a segment that failed
+        """
+        return await asyncio.gather(
+            *self.start_segment_tasks(segments, max_concurrency),
+            return_exceptions=True,
+        )
+
+    def start_segment_tasks(
+        self,
+        segments: List[Tuple[float, float, Path]],
+        max_concurrency: int = MAX_CONCURRENT_SEGMENTS,
+    ) -> List["asyncio.Task[str]"]:
+        """
+        Schedule segment transcriptions on the running event loop
+
+        Must be called from a coroutine. The tasks run concurrently, at most
+        max_concurrency at a time, while the caller awaits them.
+
+        Args:
+            segments: List of (start_time, end_time, segment_path) tuples
+            max_concurrency: Maximum number of segments in flight at once
+
+        Returns:
+            One task per segment, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return [
+            self.start_segment_task(start, end, path, semaphore)
+            for start, end, path in segments
+        ]
+
+    def start_segment_task(
+        self,
+        start: float,
+        end: float,
+        segment_path: Path,
+        semaphore: asyncio.Semaphore,
+    ) -> "asyncio.Task[str]":
+        """
+        Schedule one segment transcription on the running event loop
+
+        Args:
+            start: Segment start time in seconds
+            end: Segment end time in seconds
+            segment_path: Path to the segment audio file
+            semaphore: Semaphore shared by all segments of the file, bounding
+                how many are in flight at once
+
+        Returns:
+            Task resolving to the transcribed text
+        """
+
+        async def transcribe() -> str:
+            async with semaphore:
+                return await self.transcribe_audio_async(
+                    segment_path, segment_info=(start, end)
+                )
+
+        return asyncio.ensure_future(transcribe())
+
+    def transcribe_audio_batch(
+        self,
+        items: List[Tuple[Path, Optional[tuple[float, float]]]],
+        stop_event: Optional[threading.Event] = None,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Transcribe audio files through the Batch API (discounted, high latency)
+
+        Args:
+            items: List of (audio_path, segment_info) tuples
+            stop_event: Optional event that stops waiting for the job when set
+
+        Returns:
+            Transcribed text for each item in input order, or the exception
+            describing why an item failed
+
+        Raises:
+            BatchInterruptedError: If stop_event was set before the job finished
+        """
+        results: List[Union[str, BaseException, None]] = [None] * len(items)
+        cache_keys: List[Optional[str]] = [None] * len(items)
+        requests: List[InlinedRequest] = []
+        request_indices: List[int] = []
+
+        for i, (audio_path, segment_info) in enumerate(items):
+            try:
+                file_hash = hash_file(audio_path)
+                if self.cache:
+                    cache_key = self._transcription_cache_key(file_hash, segment_info)
+                    cached = self.cache.get(cache_key)
+                    if cached is not None:
+                        logger.info(f"Using cached transcription for: {audio_path}")
+                        results[i] = cached
+                        continue
+                    cache_keys[i] = cache_key
+
+                audio_file = self.upload_file(audio_path, file_hash)
+                prompt = self._build_transcription_prompt(segment_info)
+                requests.append(
+                    InlinedRequest(
+                        contents=[
+                            Content(
+                                role="user",
+                                parts=[
+                                    Part(text=prompt),
+                                    Part(
+                                        file_data=FileData(
+                                            file_uri=audio_file.uri,
+                                            mime_type=audio_file.mime_type,
+                                        )
+                                    ),
+                                ],
+                            )
+                        ]
+                    )
+                )
+                request_indices.append(i)
+            except Exception as e:
+                logger.error(f"Failed to prepare batch request for {audio_path}: {e}")
+                results[i] = e
+
+        if requests:
+            name = self.submit_batch(requests)
+            try:
+                job = self.wait_for_batch(name, stop_event=stop_event)
+            except BaseException:
+                # Nobody will collect the results, so stop paying for them
+                self.cancel_batch(name)
+                raise
+            responses = (
+                job.dest.inlined_responses
+                if job.dest and job.dest.inlined_responses
+                else []
+            )
+
+            for j, i in enumerate(request_indices):
+                if job.state not in (
+                    JobState.JOB_STATE_SUCCEEDED,
+                    JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+                ):
+                    results[i] = RuntimeError(f"Batch job ended in state {job.state}")
+                    continue
+                if j >= len(responses):
+                    results[i] = RuntimeError("Batch job returned no response")
+                    continue
+
+                inlined = responses[j]
+                text = inlined.response.text if inlined.response else None
+                if text:
+                    results[i] = text
+                    key = cache_keys[i]
+                    if self.cache and key:
+                        self.cache.put(key, text)
+                else:
+                    error = inlined.error.message if inlined.error else "empty response"
+                    results[i] = RuntimeError(f"Batch request failed: {error}")
+
+        return [
+            r if r is not None else RuntimeError("Missing batch result")
+            for r in results
+        ]
+
+    def submit_batch(
+        self, requests: List[InlinedRequest], display_name: str = "scan-existing"
+    ) -> str:
+        """
+        Submit transcription requests as a Batch API job
+
+        Args:
+            requests: Inlined generate_content requests
+            display_name: Display name of the batch job
+
+        Returns:
+            Name of the created batch job
+        """
+        logger.info(f"Submitting batch job with {len(requests)} requests")
+        job = retry_with_backoff(
+            lambda: self.client.batches.create(
+                model=self.transcription_model,
+                src=requests,
+                config={"display_name": display_name},
+            )
+        )
+        logger.info(f"Created batch job: {job.name}")
+        return job.name or ""
+
+    def wait_for_batch(
+        self,
+        name: str,
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        stop_event: Optional[threading.Event] = None,
+    ) -> BatchJob:
+        """
+        Poll a batch job until it reaches a terminal state
+
+        Args:
+            name: Name of the batch job
+            poll_interval: Seconds between status checks
+            stop_event: Optional event that stops waiting when set
+
+        Returns:
+            Final batch job object
+
+        Raises:
+            BatchInterruptedError: If stop_event was set before the job finished
+        """
+        while True:
+            job = retry_with_backoff(lambda: self.client.batches.get(name=name))
+            if job.state in BATCH_TERMINAL_STATES:
+                logger.info(f"Batch job {name} finished with state: {job.state}")
+                return job
+            logger.debug(f"Batch job {name} state: {job.state}")
+            if stop_event is None:
+                time.sleep(poll_interval)
+            elif stop_event.wait(poll_interval):
+                raise BatchInterruptedError(f"Stopped waiting for batch job {name}")
+
+    def cancel_batch(self, name: str) -> None:
+        """
+        Cancel a batch job, logging rather than raising on failure
+
+        Args:
+            name: Name of the batch job
+        """
+        try:
+            self.client.batches.cancel(name=name)
+            logger.info(f"Cancelled batch job: {name}")
+        except Exception as e:
+            logger.error(f"Failed to cancel batch job {name}: {e}")
+
+    def _transcription_cache_key(
+        self, file_hash: str, segment_info: Optional[tuple[float, float]]
+    ) -> str:
+        """Build the cache key for a transcription request"""
+        if segment_info:
+            start, end = segment_info
+            segment = f"{start:.1f}-{end:.1f}"
+        else:
+            segment = "full"
+        return (
+            f"transcription:{file_hash}:{self.transcription_model}:"
+            f"{PROMPT_VERSION}:{segment}"
+        )
+
+    @staticmethod
+    def _build_transcription_prompt(
+        segment_info: Optional[tuple[float, float]] = None,
+    ) -> str:
+        """Create the transcription prompt for a whole file or a segment"""
+        if segment_info:
+            start, end = segment_info
+            return _TRANSCRIBE_SEGMENT_PROMPT.format(start=start, end=end)
+        return _TRANSCRIBE_FULL_PROMPT
+
     def summarize_text(self, text: str, context: str = "") -> str:
         """
         Summarize text using Gemini API
@@ -142,22 +758,26 @@ class GeminiClient:
         """
         logger.info(f"Generating summary for text of length: {len(text)}")
 
-        prompt = f"""以下の音声文字起こしを読んで、構造化された要約を作成してください。
-
-要約の形式：
-1. **主要なトピック**: 箇条書き
-2. **重要なポイント**: 最も重要な情報を箇条書き
-3. **結論・まとめ**: 完結かつ要点を押さえた文章
-4. **キーワード**: 重要な用語やコンセプトとそれぞれの説明を箇条書きで
-
-{f"コンテキスト: {context}" if context else ""}
-
-文字起こし内容：
----
-{text}
----
+        context_line = f"コンテキスト: {context}" if context else ""
+        prompt = "".join(
+            (
+                _SUMMARY_PROMPT_HEAD,
+                context_line,
+                _SUMMARY_PROMPT_BODY,
+                text,
+                _SUMMARY_PROMPT_TAIL,
+            )
+        )
 
-要約は明確で読みやすく、マークダウン形式で作成してください。"""
+        cache_key = None
+        if self.cache:
+            cache_key = (
+                f"summary:{hash_text(prompt)}:{self.summary_model}:{PROMPT_VERSION}"
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached summary")
+                return cached
 
         # Use summary model (already default in generate_content)
         summary = self.generate_content(prompt, model=self.summary_model)
@@ -165,4 +785,7 @@ class GeminiClient:
         # Note: None check is now handled in generate_content with retry
         logger.info("Summary generated successfully")
 
+        if self.cache and cache_key:
+            self.cache.put(cache_key, summary)
+
         return summary
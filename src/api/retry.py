@@ -1,14 +1,17 @@
 """Retry logic for API calls"""
 
+import asyncio
+import random
+import re
 import time
-import threading
-from typing import Callable, TypeVar, Optional
-from concurrent.futures import TimeoutError
+from typing import Awaitable, Callable, TypeVar, Optional
+
+import httpx
 
 from src.constants import (
     MAX_RETRIES,
-    DEFAULT_TIMEOUT,
     RETRY_BACKOFF_BASE,
+    RETRY_JITTER_FACTOR,
     MAX_RETRY_WAIT,
     RETRYABLE_ERROR_KEYWORDS,
 )
@@ -18,6 +21,11 @@ logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+_RETRYABLE_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in RETRYABLE_ERROR_KEYWORDS),
+    re.IGNORECASE,
+)
+
 
 class RetryableError(Exception):
     """Exception that indicates an error that should trigger a retry"""
@@ -35,65 +43,89 @@ def is_retryable_error(error: Exception) -> bool:
     Returns:
         True if the error should trigger a retry
     """
-    # RetryableError is always retryable
-    if isinstance(error, RetryableError):
+    # RetryableError and request timeouts are always retryable
+    if isinstance(error, (RetryableError, httpx.TimeoutException, TimeoutError)):
         return True
 
-    error_msg = str(error).lower()
-    return any(keyword in error_msg for keyword in RETRYABLE_ERROR_KEYWORDS)
+    return _RETRYABLE_RE.search(str(error)) is not None
 
 
-def execute_with_timeout(func: Callable[[], T], timeout: int = DEFAULT_TIMEOUT) -> T:
+def get_retry_after(error: Exception) -> Optional[float]:
     """
-    Execute a function with a timeout
+    Extract the server-requested retry delay from an error
+
+    Looks for a retry_after attribute, a Retry-After response header and the
+    RetryInfo detail Gemini attaches to 429 responses, in that order.
 
     Args:
-        func: Function to execute
-        timeout: Timeout in seconds
+        error: The exception to inspect
 
     Returns:
-        Function result
-
-    Raises:
-        TimeoutError: If function execution exceeds timeout
-        Exception: Any exception raised by the function
+        Delay in seconds, or None if the server did not provide one
     """
-    result: list[Optional[T]] = [None]
-    exception: list[Optional[Exception]] = [None]
-
-    def run_func():
-        try:
-            result[0] = func()
-        except Exception as e:
-            exception[0] = e
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        header = headers.get("retry-after")
+        if header is not None:
+            try:
+                return float(header)
+            except ValueError:
+                pass
+
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for detail in details.get("error", {}).get("details", []):
+            delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    pass
+
+    return None
+
+
+def get_backoff_wait_time(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Calculate the wait time before a retry attempt
 
-    thread = threading.Thread(target=run_func)
-    thread.start()
-    thread.join(timeout)
+    Exponential backoff is jittered so that concurrent callers hitting the
+    same rate limit do not retry in lockstep. A server-provided delay takes
+    precedence over the backoff schedule.
 
-    if thread.is_alive():
-        logger.warning(f"Function execution timed out after {timeout} seconds")
-        raise TimeoutError(f"Function execution timed out after {timeout} seconds")
+    Args:
+        attempt: Retry attempt number (1 for the first retry)
+        retry_after: Optional delay requested by the server in seconds
 
-    if exception[0]:
-        raise exception[0]
+    Returns:
+        Wait time in seconds
+    """
+    if retry_after is not None:
+        return min(retry_after, MAX_RETRY_WAIT)
 
-    return result[0]  # type: ignore
+    wait_time = min(RETRY_BACKOFF_BASE * (2 ** (attempt - 1)), MAX_RETRY_WAIT)
+    return wait_time * random.uniform(1 - RETRY_JITTER_FACTOR, 1 + RETRY_JITTER_FACTOR)
 
 
 def retry_with_backoff(
     func: Callable[[], T],
     max_retries: int = MAX_RETRIES,
-    timeout: int = DEFAULT_TIMEOUT,
     on_retry: Optional[Callable[[int, Exception], None]] = None,
 ) -> T:
     """
     Execute a function with retry logic and exponential backoff
 
+    Per-request timeouts are enforced by the HTTP client; a timed out
+    request surfaces as a retryable exception.
+
     Args:
         func: Function to execute
         max_retries: Maximum number of retry attempts
-        timeout: Timeout for each attempt in seconds
         on_retry: Optional callback called before each retry with (attempt_number, last_error)
 
     Returns:
@@ -108,25 +140,70 @@ def retry_with_backoff(
         try:
             if attempt > 0:
                 # Calculate exponential backoff
-                wait_time = min(
-                    RETRY_BACKOFF_BASE * (2 ** (attempt - 1)), MAX_RETRY_WAIT
-                )
+                wait_time = get_backoff_wait_time(attempt, get_retry_after(last_error))
                 logger.info(
-                    f"Retry {attempt}/{max_retries}: waiting {wait_time} seconds"
+                    f"Retry {attempt}/{max_retries}: waiting {wait_time:.1f} seconds"
                 )
                 time.sleep(wait_time)
 
             if attempt > 0:
                 logger.info(f"Retry {attempt}/{max_retries}: executing request")
 
-            return execute_with_timeout(func, timeout)
+            return func()
 
-        except TimeoutError as e:
+        except Exception as e:
             last_error = e
-            logger.warning(f"Attempt {attempt + 1} timed out: {e}")
-            if on_retry and attempt < max_retries - 1:
-                on_retry(attempt + 1, e)
-            continue
+
+            if is_retryable_error(e):
+                logger.warning(f"Retryable error on attempt {attempt + 1}: {e}")
+                if on_retry and attempt < max_retries - 1:
+                    on_retry(attempt + 1, e)
+                continue
+            else:
+                logger.error(f"Non-retryable error: {e}")
+                raise e
+
+    # All retries exhausted
+    error_msg = f"Maximum retries ({max_retries}) reached. Last error: {last_error}"
+    logger.error(error_msg)
+    raise Exception(error_msg)
+
+
+async def retry_with_backoff_async(
+    func: Callable[[], Awaitable[T]],
+    max_retries: int = MAX_RETRIES,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+) -> T:
+    """
+    Await a coroutine function with retry logic and exponential backoff
+
+    Async counterpart of retry_with_backoff that waits with asyncio.sleep,
+    so concurrent calls back off without blocking the event loop.
+
+    Args:
+        func: Function returning a new awaitable for each attempt
+        max_retries: Maximum number of retry attempts
+        on_retry: Optional callback called before each retry with (attempt_number, last_error)
+
+    Returns:
+        Function result
+
+    Raises:
+        Exception: The last exception if all retries are exhausted
+    """
+    last_error: Optional[Exception] = None
+
+    for attempt in range(max_retries):
+        try:
+            if attempt > 0:
+                wait_time = get_backoff_wait_time(attempt, get_retry_after(last_error))
+                logger.info(
+                    f"Retry {attempt}/{max_retries}: waiting {wait_time:.1f} seconds"
+                )
+                await asyncio.sleep(wait_time)
+                logger.info(f"Retry {attempt}/{max_retries}: executing request")
+
+            return await func()
 
         except Exception as e:
             last_error = e
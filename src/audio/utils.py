@@ -1,14 +1,29 @@
 """Audio utility functions"""
 
+import functools
+import subprocess
 from pathlib import Path
+from typing import Tuple
+
+import numpy as np
 import soundfile as sf
 from pydub import AudioSegment
 
 from src.constants import AUDIO_EXTENSIONS
 from src.utils.logging import get_logger
+from src.utils.system import ensure_ffmpeg
 
 logger = get_logger(__name__)
 
+# Suffixes of the major formats libsndfile can decode without FFmpeg; RAW is
+# left out because headerless files need their parameters spelled out
+_SOUNDFILE_SUFFIXES = frozenset(
+    f".{name.lower()}" for name in sf.available_formats() if name != "RAW"
+)
+
+# Frames read per block when downmixing with soundfile
+_SOUNDFILE_BLOCK_FRAMES = 1 << 20
+
 
 def is_audio_file(path: Path) -> bool:
     """
@@ -20,34 +35,257 @@ def is_audio_file(path: Path) -> bool:
     Returns:
         True if the file has an audio extension
     """
-    return path.suffix.lower() in AUDIO_EXTENSIONS
+    suffix = path.suffix
+    # Most non-audio events (directories, dotfiles) have no suffix at all
+    if not suffix:
+        return False
+    return suffix.lower() in AUDIO_EXTENSIONS
 
 
-def get_audio_duration(audio_path: Path) -> float:
+@functools.lru_cache(maxsize=1024)
+def _probe_duration(path: str, mtime_ns: int, size_bytes: int) -> float:
     """
-    Get the duration of an audio file in seconds
+    Read the duration of an audio file from its header
+
+    Cached per (path, mtime_ns, size_bytes), so a modified file is probed
+    again while repeated lookups of an unchanged file cost a single stat.
 
     Args:
-        audio_path: Path to the audio file
+        path: Path to the audio file
+        mtime_ns: Modification time in nanoseconds, used as a cache key
+        size_bytes: File size in bytes, used as a cache key
 
     Returns:
         Duration in seconds
     """
     try:
-        info = sf.info(str(audio_path))
+        info = sf.info(path)
         duration = info.duration
-        logger.debug(f"Audio duration for {audio_path}: {duration:.2f} seconds")
+        logger.debug(f"Audio duration for {path}: {duration:.2f} seconds")
+        return duration
+    except Exception as e:
+        logger.warning(f"Failed to get duration with soundfile: {e}, trying ffprobe")
+    try:
+        # Reads the container header rather than decoding the whole file
+        duration = _ffprobe_duration(path)
+        logger.debug(f"Audio duration for {path}: {duration:.2f} seconds")
         return duration
     except Exception as e:
-        logger.warning(f"Failed to get duration with soundfile: {e}, trying pydub")
+        logger.warning(f"Failed to get duration with ffprobe: {e}, trying pydub")
+    try:
+        audio = AudioSegment.from_file(path)
+        duration = audio.duration_seconds
+        logger.debug(f"Audio duration for {path}: {duration:.2f} seconds")
+        return duration
+    except Exception as e:
+        logger.error(f"Failed to get audio duration: {e}")
+        raise
+
+
+def _ffprobe_duration(path: str) -> float:
+    """
+    Read the duration of an audio file from its container metadata
+
+    Args:
+        path: Path to the audio file
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        RuntimeError: If ffprobe fails or reports no duration
+    """
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    output = result.stdout.decode("utf-8", errors="replace").strip()
+    if result.returncode != 0 or not output or output == "N/A":
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffprobe failed to read {path}: {stderr or output}")
+    return float(output)
+
+
+def probe_audio(audio_path: Path) -> Tuple[float, int]:
+    """
+    Get the duration and size of an audio file
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Tuple of (duration in seconds, size in bytes)
+    """
+    stat = audio_path.stat()
+    duration = _probe_duration(str(audio_path), stat.st_mtime_ns, stat.st_size)
+    return duration, stat.st_size
+
+
+def get_audio_duration(audio_path: Path) -> float:
+    """
+    Get the duration of an audio file in seconds
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Duration in seconds
+    """
+    return probe_audio(audio_path)[0]
+
+
+def load_audio_pcm(audio_path: Path, sampling_rate: int) -> np.ndarray:
+    """
+    Decode an audio file into mono float32 PCM samples
+
+    Formats libsndfile reads natively, WAV included, are decoded with
+    soundfile and need no FFmpeg. Anything else is decoded, downmixed and
+    resampled in a single FFmpeg pass that streams raw samples through a
+    pipe, so no intermediate file is written.
+
+    Args:
+        audio_path: Path to the audio file
+        sampling_rate: Target sampling rate in Hz
+
+    Returns:
+        1-D float32 array of samples in the range [-1, 1]
+
+    Raises:
+        RuntimeError: If FFmpeg is needed but not installed, or fails to
+            decode the file
+    """
+    if audio_path.suffix.lower() in _SOUNDFILE_SUFFIXES:
         try:
-            audio = AudioSegment.from_file(str(audio_path))
-            duration = audio.duration_seconds
-            logger.debug(f"Audio duration for {audio_path}: {duration:.2f} seconds")
-            return duration
-        except Exception as e:
-            logger.error(f"Failed to get audio duration: {e}")
-            raise
+            samples = _load_pcm_soundfile(audio_path, sampling_rate)
+        except (sf.LibsndfileError, ValueError) as e:
+            # Unusual codecs inside a supported container, e.g. MP3 in WAV
+            logger.debug(f"soundfile cannot decode {audio_path}: {e}, using FFmpeg")
+            samples = _load_pcm_ffmpeg(audio_path, sampling_rate)
+    else:
+        samples = _load_pcm_ffmpeg(audio_path, sampling_rate)
+
+    logger.debug(
+        f"Decoded {audio_path}: {len(samples) / sampling_rate:.2f} seconds "
+        f"at {sampling_rate} Hz"
+    )
+    return samples
+
+
+def _load_pcm_soundfile(audio_path: Path, sampling_rate: int) -> np.ndarray:
+    """
+    Decode a libsndfile-readable file into mono float32 PCM samples
+
+    Channels are averaged block by block, so only the mono signal at the
+    file's own rate is held in memory before resampling. The frame count of
+    compressed formats is only an estimate, so the buffer grows if the
+    decoder yields more.
+
+    Args:
+        audio_path: Path to the audio file
+        sampling_rate: Target sampling rate in Hz
+
+    Returns:
+        1-D writable float32 array of samples
+    """
+    with sf.SoundFile(str(audio_path)) as f:
+        source_rate = f.samplerate
+        samples = np.empty(f.frames, dtype=np.float32)
+        position = 0
+        for block in f.blocks(
+            blocksize=_SOUNDFILE_BLOCK_FRAMES, dtype="float32", always_2d=True
+        ):
+            end = position + len(block)
+            if end > len(samples):
+                grown = np.empty(max(end, len(samples) * 5 // 4), dtype=np.float32)
+                grown[:position] = samples[:position]
+                samples = grown
+            block.mean(axis=1, out=samples[position:end])
+            position = end
+    samples = samples[:position]
+
+    if source_rate != sampling_rate:
+        samples = _resample(samples, source_rate, sampling_rate)
+    return samples
+
+
+def _resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resample mono samples with torchaudio's band-limited sinc interpolation
+
+    torchaudio is imported here rather than at module level, since most
+    callers of this module never resample.
+
+    Args:
+        samples: 1-D float32 samples at source_rate
+        source_rate: Sampling rate of samples in Hz
+        target_rate: Target sampling rate in Hz
+
+    Returns:
+        1-D writable float32 array at target_rate
+    """
+    import torch
+    import torchaudio.functional
+
+    resampled = torchaudio.functional.resample(
+        torch.from_numpy(samples), source_rate, target_rate
+    )
+    return resampled.numpy()
+
+
+def _load_pcm_ffmpeg(audio_path: Path, sampling_rate: int) -> np.ndarray:
+    """
+    Decode any FFmpeg-readable file into mono float32 PCM samples
+
+    Args:
+        audio_path: Path to the audio file
+        sampling_rate: Target sampling rate in Hz
+
+    Returns:
+        1-D writable float32 array of samples
+
+    Raises:
+        RuntimeError: If FFmpeg is not installed or fails to decode the file
+    """
+    # Report a missing FFmpeg with installation instructions rather than
+    # the bare FileNotFoundError from subprocess
+    ensure_ffmpeg()
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            str(audio_path),
+            "-ac",
+            "1",
+            "-ar",
+            str(sampling_rate),
+            "-f",
+            "f32le",
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed to decode {audio_path}: {stderr}")
+
+    # bytearray keeps the array writable, which torch.from_numpy expects
+    return np.frombuffer(bytearray(result.stdout), dtype=np.float32)
 
 
 def format_duration(seconds: float) -> str:
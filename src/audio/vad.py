@@ -2,10 +2,13 @@
 
 import os
 import tempfile
+import threading
 from pathlib import Path
-from typing import List, Tuple
-from pydub import AudioSegment
-from silero_vad import load_silero_vad, read_audio, get_speech_timestamps
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+import soundfile as sf
+import torch
+from silero_vad import load_silero_vad, get_speech_timestamps
 
 from src.constants import (
     VAD_THRESHOLD,
@@ -13,12 +16,36 @@ from src.constants import (
     MIN_SILENCE_DURATION_MS,
     SPEECH_PAD_MS,
     MAX_SEGMENT_DURATION,
+    MIN_SEGMENT_DURATION,
 )
-from src.audio.utils import get_audio_duration
+from src.audio.utils import load_audio_pcm
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_model = None
+_model_lock = threading.Lock()
+# The model carries recurrent state between windows, so only one thread may
+# run detection on the shared instance at a time
+_inference_lock = threading.Lock()
+
+
+def get_vad_model():
+    """
+    Get the shared Silero VAD model, loading it on first use
+
+    Returns:
+        Silero VAD model
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            logger.info("Loading Silero VAD model (ONNX Runtime)")
+            # The ONNX model runs on the CPU execution provider and is faster
+            # than the TorchScript checkpoint on 512-sample windows
+            _model = load_silero_vad(onnx=True)
+    return _model
+
 
 class VADProcessor:
     """Voice Activity Detection processor for audio splitting"""
@@ -31,11 +58,13 @@ class VADProcessor:
     def _ensure_model(self):
         """Ensure VAD model is loaded"""
         if self.model is None:
-            logger.info("Loading Silero VAD model")
-            self.model = load_silero_vad()
+            self.model = get_vad_model()
 
     def split_audio(
-        self, audio_path: Path, max_duration: float = MAX_SEGMENT_DURATION
+        self,
+        audio_path: Path,
+        max_duration: float = MAX_SEGMENT_DURATION,
+        output_dir: Optional[Path] = None,
     ) -> List[Tuple[float, float, Path]]:
         """
         Split audio file using VAD
@@ -43,34 +72,58 @@ class VADProcessor:
         Args:
             audio_path: Path to the audio file
             max_duration: Maximum duration for each segment in seconds
+            output_dir: Directory for the segment files, or None for
+                individual files in the system temporary directory
 
         Returns:
             List of tuples (start_time, end_time, segment_path)
         """
-        logger.info(f"Splitting audio file: {audio_path}")
-        self._ensure_model()
+        segments: List[Tuple[float, float, Path]] = []
+        try:
+            segments.extend(self.iter_segments(audio_path, max_duration, output_dir))
+        except Exception:
+            for _, _, segment_path in segments:
+                if segment_path != audio_path and segment_path.exists():
+                    os.remove(segment_path)
+            raise
+        return segments
 
-        # Convert to WAV if needed
-        temp_wav_path = None
-        if not str(audio_path).lower().endswith(".wav"):
-            logger.debug("Converting audio to WAV format for VAD processing")
-            audio = AudioSegment.from_file(str(audio_path))
-            temp_wav_path = tempfile.NamedTemporaryFile(
-                suffix=".wav", delete=False
-            ).name
-            audio.export(temp_wav_path, format="wav")
-            wav_path = temp_wav_path
-        else:
-            wav_path = str(audio_path)
+    def iter_segments(
+        self,
+        audio_path: Path,
+        max_duration: float = MAX_SEGMENT_DURATION,
+        output_dir: Optional[Path] = None,
+    ) -> Iterator[Tuple[float, float, Path]]:
+        """
+        Split audio file using VAD, yielding each segment once it is written
 
-        try:
-            # Read audio and detect speech segments
-            logger.debug("Reading audio file for VAD processing")
-            wav = read_audio(wav_path, sampling_rate=VAD_SAMPLING_RATE)
+        Speech detection needs the whole file, but segment files are written
+        one at a time, so a consumer can start uploading the first segments
+        while later ones are still being written. Yielded segment files are
+        owned by the consumer, which must remove them; writing them to a
+        dedicated output_dir lets the consumer remove the directory at once.
+
+        Args:
+            audio_path: Path to the audio file
+            max_duration: Maximum duration for each segment in seconds
+            output_dir: Directory for the segment files, or None for
+                individual files in the system temporary directory
 
-            logger.debug("Detecting speech segments")
+        Yields:
+            Tuples (start_time, end_time, segment_path); the original file is
+            yielded as the only segment when no speech is detected
+        """
+        logger.info("Splitting audio file: %s", audio_path)
+        self._ensure_model()
+
+        # Decode once; the same samples feed VAD and segment extraction
+        logger.debug("Decoding audio for VAD processing")
+        samples = load_audio_pcm(audio_path, VAD_SAMPLING_RATE)
+
+        logger.debug("Detecting speech segments")
+        with _inference_lock:
             speech_timestamps = get_speech_timestamps(
-                wav,
+                torch.from_numpy(samples),
                 self.model,
                 threshold=VAD_THRESHOLD,
                 sampling_rate=VAD_SAMPLING_RATE,
@@ -79,21 +132,16 @@ class VADProcessor:
                 return_seconds=True,
             )
 
-            if not speech_timestamps:
-                logger.warning("No speech segments detected, returning entire audio")
-                return [(0, get_audio_duration(audio_path), audio_path)]
+        if not speech_timestamps:
+            logger.warning("No speech segments detected, returning entire audio")
+            yield (0, len(samples) / VAD_SAMPLING_RATE, audio_path)
+            return
 
-            # Group timestamps into segments based on max_duration
-            segments = self._group_segments(speech_timestamps, max_duration)
+        # Group timestamps into segments based on max_duration
+        segments = self._group_segments(speech_timestamps, max_duration)
 
-            # Create audio segments
-            return self._create_audio_segments(audio_path, segments)
-
-        finally:
-            # Clean up temporary WAV file
-            if temp_wav_path and os.path.exists(temp_wav_path):
-                os.remove(temp_wav_path)
-                logger.debug("Cleaned up temporary WAV file")
+        # Create audio segments
+        yield from self._write_segments(samples, segments, output_dir)
 
     def _group_segments(
         self, timestamps: List[dict], max_duration: float
@@ -101,6 +149,10 @@ class VADProcessor:
         """
         Group speech timestamps into segments based on maximum duration
 
+        A final group shorter than MIN_SEGMENT_DURATION is merged into the
+        previous one when that keeps it within max_duration plus
+        MIN_SEGMENT_DURATION.
+
         Args:
             timestamps: List of speech timestamp dictionaries
             max_duration: Maximum duration for each segment
@@ -125,48 +177,71 @@ class VADProcessor:
                 current_start = timestamp["start"]
                 current_end = timestamp["end"]
 
-        # Add the last segment
-        segments.append((current_start, current_end))
+        # Add the last segment. A short tail would cost a full API round trip
+        # for a few seconds of audio, so it joins the previous segment when the
+        # combined span stays within the limit plus the short-segment allowance
+        if (
+            segments
+            and current_end - current_start < MIN_SEGMENT_DURATION
+            and current_end - segments[-1][0] <= max_duration + MIN_SEGMENT_DURATION
+        ):
+            segments[-1] = (segments[-1][0], current_end)
+        else:
+            segments.append((current_start, current_end))
 
         logger.info(
-            f"Grouped {len(timestamps)} speech segments into {len(segments)} chunks"
+            "Grouped %d speech segments into %d chunks", len(timestamps), len(segments)
         )
         return segments
 
-    def _create_audio_segments(
-        self, audio_path: Path, segments: List[Tuple[float, float]]
-    ) -> List[Tuple[float, float, Path]]:
+    def _write_segments(
+        self,
+        samples: np.ndarray,
+        segments: List[Tuple[float, float]],
+        output_dir: Optional[Path] = None,
+    ) -> Iterator[Tuple[float, float, Path]]:
         """
-        Create audio segment files from timestamp segments
+        Write audio segment files from timestamp segments
 
         Args:
-            audio_path: Original audio file path
+            samples: Decoded mono samples at VAD_SAMPLING_RATE
             segments: List of (start_time, end_time) tuples
+            output_dir: Directory for the segment files, or None for
+                individual files in the system temporary directory
 
-        Returns:
-            List of tuples (start_time, end_time, segment_path)
+        Yields:
+            Tuples (start_time, end_time, segment_path) as each file is written
         """
-        logger.debug(f"Creating {len(segments)} audio segment files")
-        audio = AudioSegment.from_file(str(audio_path))
-        temp_files = []
+        logger.debug("Creating %d audio segment files", len(segments))
 
         for i, (start, end) in enumerate(segments):
-            start_ms = int(start * 1000)
-            end_ms = int(end * 1000)
-
-            # Extract segment
-            segment = audio[start_ms:end_ms]
+            start_sample = int(start * VAD_SAMPLING_RATE)
+            end_sample = int(end * VAD_SAMPLING_RATE)
 
             # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix=f"_segment_{i}.wav", delete=False
-            )
-            segment.export(temp_file.name, format="wav")
-            temp_files.append((start, end, Path(temp_file.name)))
+            if output_dir is not None:
+                segment_path = output_dir / f"segment_{i}.wav"
+            else:
+                with tempfile.NamedTemporaryFile(
+                    suffix=f"_segment_{i}.wav", delete=False
+                ) as temp_file:
+                    segment_path = Path(temp_file.name)
+            try:
+                sf.write(
+                    str(segment_path),
+                    samples[start_sample:end_sample],
+                    VAD_SAMPLING_RATE,
+                    subtype="PCM_16",
+                )
+            except Exception:
+                segment_path.unlink(missing_ok=True)
+                raise
 
-            duration = end - start
             logger.debug(
-                f"Segment {i + 1}: {start:.2f}s - {end:.2f}s (duration: {duration:.2f}s)"
+                "Segment %d: %.2fs - %.2fs (duration: %.2fs)",
+                i + 1,
+                start,
+                end,
+                end - start,
             )
-
-        return temp_files
+            yield (start, end, segment_path)
@@ -6,6 +6,8 @@ from typing import Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+from src.constants import MAX_CONCURRENT_SEGMENTS
+
 
 @dataclass
 class Config:
@@ -17,6 +19,8 @@ class Config:
     create_summary: bool = True
     verbose: bool = False
     scan_existing: bool = False
+    batch_mode: bool = False
+    max_concurrency: int = MAX_CONCURRENT_SEGMENTS
     env_file: Path = Path(".env")
 
     @classmethod
@@ -66,6 +70,13 @@ class Config:
             config.create_summary = not args.no_summary
         if hasattr(args, "scan_existing"):
             config.scan_existing = args.scan_existing
+        if hasattr(args, "batch"):
+            config.batch_mode = args.batch
+        concurrency = getattr(args, "concurrency", None)
+        if concurrency is not None:
+            if concurrency < 1:
+                raise ValueError("--concurrency must be at least 1")
+            config.max_concurrency = concurrency
 
         return config
 
@@ -81,3 +92,7 @@ class Config:
             return self.watch_folder / ".transcription_db.json"
 
         return Path(".transcription_db.json")
+
+    def get_cache_path(self) -> Path:
+        """Get the result cache path, stored next to the database"""
+        return self.get_db_path().parent / ".transcription_cache.sqlite"
@@ -1,18 +1,34 @@
 """Application constants and configuration defaults"""
 
-from typing import Set
+from typing import Dict, FrozenSet
 
 # Audio file extensions
-AUDIO_EXTENSIONS: Set[str] = {
-    ".mp3",
-    ".m4a",
-    ".wav",
-    ".aac",
-    ".flac",
-    ".ogg",
-    ".opus",
-    ".webm",
-    ".wma",
+AUDIO_EXTENSIONS: FrozenSet[str] = frozenset(
+    {
+        ".mp3",
+        ".m4a",
+        ".wav",
+        ".aac",
+        ".flac",
+        ".ogg",
+        ".opus",
+        ".webm",
+        ".wma",
+    }
+)
+
+# MIME types sent with uploads; mimetypes guesses video/webm and
+# platform-specific values for some of these
+AUDIO_MIME_TYPES: Dict[str, str] = {
+    ".mp3": "audio/mp3",
+    ".m4a": "audio/mp4",
+    ".wav": "audio/wav",
+    ".aac": "audio/aac",
+    ".flac": "audio/flac",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".webm": "audio/webm",
+    ".wma": "audio/x-ms-wma",
 }
 
 # API settings
@@ -22,6 +38,12 @@ MAX_RETRIES = 5
 DEFAULT_TIMEOUT = 600  # 10 minutes
 RETRY_BACKOFF_BASE = 10  # Base seconds for exponential backoff
 MAX_RETRY_WAIT = 120  # Maximum wait between retries
+RETRY_JITTER_FACTOR = 0.25  # Randomize backoff by +/-25% to spread out retries
+MAX_CONCURRENT_SEGMENTS = 4  # Maximum number of segments transcribed in parallel
+PROMPT_VERSION = "1"  # Bump when prompts change to invalidate cached results
+BATCH_POLL_INTERVAL = 30  # Seconds between Batch API job status checks
+HTTP_KEEPALIVE_CONNECTIONS = 16  # Idle API connections kept open for reuse
+HTTP_KEEPALIVE_EXPIRY = 60  # Seconds an idle API connection is kept open
 
 # VAD settings
 VAD_THRESHOLD = 0.5
@@ -29,6 +51,8 @@ VAD_SAMPLING_RATE = 16000
 MIN_SILENCE_DURATION_MS = 500
 SPEECH_PAD_MS = 30
 MAX_SEGMENT_DURATION = 600  # 10 minutes
+MIN_SEGMENT_DURATION = 30  # Shorter trailing segments join the previous one
+SEGMENT_RAM_DIR = "/dev/shm"  # RAM-backed directory for segment files, if present
 
 # Server error keywords for retry logic
 RETRYABLE_ERROR_KEYWORDS = [
@@ -50,3 +74,9 @@ MAX_TRANSCRIPTION_PREVIEW_LENGTH = 15000  # Characters for summary generation
 # Obsidian note settings
 DEFAULT_TAGS = ["音声文字起こし", "自動生成"]
 SUMMARY_TAGS = ["音声要約", "自動生成"]
+
+# File watcher settings
+FILE_SETTLE_SECONDS = 0.5  # Quiet period after the last event before processing
+FILE_STABLE_INTERVAL = 0.2  # Seconds between size samples of a settled file
+FILE_STABLE_MAX_WAIT = 10.0  # Stop waiting for the size to settle after this long
+MAX_SCAN_WORKERS = 8  # Cap on parallel hashes and API requests in flight when scanning
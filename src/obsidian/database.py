@@ -1,19 +1,34 @@
 """Database for tracking processed files"""
 
-import json
-import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, Any, List
+from typing import Dict, Iterable, Iterator, Optional, Any, List, Set, Tuple
 from enum import Enum
 
+from src.constants import MAX_SCAN_WORKERS
+from src.obsidian.storage import open_storage
 from src.utils.logging import get_logger
+from src.utils.system import hash_file
 
 logger = get_logger(__name__)
 
 # Database schema version
 SCHEMA_VERSION = "1.0.0"
 
+# Hash algorithm for new entries; hashes are stored as "<algorithm>:<hex>",
+# while unprefixed hashes are MD5 digests written by earlier versions
+HASH_ALGORITHM = "blake2b"
+LEGACY_HASH_ALGORITHM = "md5"
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO 8601 string with second precision"""
+    return datetime.now().isoformat(timespec="seconds")
+
 
 class ProcessingStatus(Enum):
     """Processing status for files"""
@@ -33,23 +48,38 @@ class ProcessedFilesDatabase:
         Initialize database
 
         Args:
-            db_path: Path to the database JSON file
+            db_path: Path to the database file; .db/.sqlite/.sqlite3 paths are
+                stored in SQLite, anything else as a JSON document
         """
         self.db_path = db_path
+        self._storage = open_storage(db_path)
         self.data: Dict[str, Any] = {}
+        # File keys modified since the last save; None forces a full rewrite
+        self._changed: Optional[Set[str]] = set()
+        # Guards data and the file; reentrant because mutators call save()
+        self._lock = threading.RLock()
+        # Content hash -> key of the completed entry, for detecting moved files
+        self._by_hash: Dict[str, str] = {}
+        # Nesting depth of batched() blocks and whether they have unsaved changes
+        self._batch_depth = 0
+        self._dirty = False
         self.load()
 
     def load(self) -> None:
         """Load database from file"""
-        if self.db_path.exists():
+        if self._storage.exists():
             try:
-                with open(self.db_path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
+                self.data = self._storage.load()
 
                 # Initialize if empty or invalid structure
                 if not self.data or "version" not in self.data:
                     self._initialize_schema()
                 else:
+                    rekeyed = self._canonicalize_keys()
+                    if rekeyed:
+                        self._changed = None
+                    if rekeyed or "status_counts" not in self.data:
+                        self._recount_statuses()
                     file_count = len(self.data.get("files", {}))
                     logger.info(
                         f"Loaded database v{self.data['version']} with {file_count} files"
@@ -62,86 +92,437 @@ class ProcessedFilesDatabase:
             logger.info("Database file does not exist, creating new database")
             self._initialize_schema()
 
+        self._rebuild_hash_index()
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        """
+        Get the canonical database key for a path
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Absolute path string with symlinks and ".." resolved
+        """
+        return str(file_path.resolve())
+
+    def _canonicalize_keys(self) -> bool:
+        """
+        Re-key entries written with relative or non-normalized paths
+
+        Returns:
+            True if any key changed
+        """
+        files = self.data.get("files", {})
+        canonical = {self._key(Path(path)): entry for path, entry in files.items()}
+        if canonical.keys() == files.keys():
+            return False
+        self.data["files"] = canonical
+        return True
+
+    def _recount_statuses(self) -> None:
+        """Rebuild the per-status counters from the file entries"""
+        counts = {status.value: 0 for status in ProcessingStatus}
+        for entry in self.data.get("files", {}).values():
+            status = entry.get("status")
+            if status in counts:
+                counts[status] += 1
+        self.data["status_counts"] = counts
+
+    def _update_status_count(
+        self, old_status: Optional[str], new_status: Optional[str]
+    ) -> None:
+        """
+        Move one file between per-status counters
+
+        Args:
+            old_status: Previous status value, or None for a new entry
+            new_status: New status value, or None for a removed entry
+        """
+        counts = self.data.setdefault(
+            "status_counts", {status.value: 0 for status in ProcessingStatus}
+        )
+        if old_status in counts:
+            counts[old_status] = max(0, counts[old_status] - 1)
+        if new_status in counts:
+            counts[new_status] += 1
+
+    def _rebuild_hash_index(self) -> None:
+        """Build the content hash index from completed entries"""
+        self._by_hash = {
+            entry["hash"]: key
+            for key, entry in self.data.get("files", {}).items()
+            if entry.get("hash")
+            and entry.get("status") == ProcessingStatus.COMPLETED.value
+        }
+
+    def _unindex(self, key: str, file_entry: Dict[str, Any]) -> None:
+        """Drop an entry's hash from the index if it points at that entry"""
+        file_hash = file_entry.get("hash")
+        if file_hash and self._by_hash.get(file_hash) == key:
+            del self._by_hash[file_hash]
+
     def _initialize_schema(self) -> None:
         """Initialize database schema"""
+        # Whatever is on disk is missing or unreadable, so the next save must
+        # rewrite it instead of appending to a journal nothing can replay
+        self._changed = None
+        now = _now_iso()
         self.data = {
             "version": SCHEMA_VERSION,
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
+            "created_at": now,
+            "last_updated": now,
             "statistics": {
                 "total_processed": 0,
                 "total_failed": 0,
                 "total_size_bytes": 0,
                 "total_duration_seconds": 0,
             },
+            "status_counts": {status.value: 0 for status in ProcessingStatus},
             "files": {},
         }
         logger.info(f"Initialized new database schema v{SCHEMA_VERSION}")
 
     def save(self) -> None:
         """Save database to file"""
-        try:
-            # Ensure directory exists
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            try:
+                # Ensure directory exists
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Update last_updated timestamp
-            self.data["last_updated"] = datetime.now().isoformat()
+                # Update last_updated timestamp
+                self.data["last_updated"] = _now_iso()
 
-            with open(self.db_path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+                # Only tracked entries are rewritten when the backend supports
+                # it; a save without tracked changes rewrites everything
+                self._storage.save(self.data, self._changed or None)
+                self._changed = set()
 
-            logger.debug(f"Saved database with {len(self.data['files'])} files")
-        except Exception as e:
-            logger.error(f"Failed to save database: {e}")
-            raise
+                logger.debug(f"Saved database with {len(self.data['files'])} files")
+            except Exception as e:
+                logger.error(f"Failed to save database: {e}")
+                raise
+
+    @contextmanager
+    def batched(self) -> Iterator["ProcessedFilesDatabase"]:
+        """
+        Defer saving until the outermost batched block exits
+
+        Mutations inside the block only mark the database dirty; it is
+        written once on exit, even if the block raises.
+
+        Yields:
+            The database itself
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._dirty = False
+                    self.save()
+
+    def _mark_changed(self, *keys: str) -> None:
+        """Record file keys modified since the last save (lock held)"""
+        if self._changed is not None:
+            self._changed.update(keys)
+
+    def _commit(self) -> None:
+        """Save now, or mark dirty when inside a batched block (lock held)"""
+        if self._batch_depth > 0:
+            self._dirty = True
+        else:
+            self.save()
 
-    def get_file_hash(self, file_path: Path) -> str:
+    def get_file_hash(self, file_path: Path, algorithm: str = HASH_ALGORITHM) -> str:
         """
-        Calculate MD5 hash of a file
+        Calculate the content hash of a file
 
         Args:
             file_path: Path to the file
+            algorithm: hashlib algorithm name
+
+        Returns:
+            Hash string, prefixed with the algorithm unless it is legacy MD5
+        """
+        digest = hash_file(file_path, algorithm)
+        if algorithm == LEGACY_HASH_ALGORITHM:
+            return digest
+        return f"{algorithm}:{digest}"
+
+    def batch_hash(
+        self,
+        file_paths: Iterable[Path],
+        algorithm: str = HASH_ALGORITHM,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Hash many files with several reads in flight at once
+
+        hashlib and file reads release the GIL, so a thread pool keeps
+        multiple files being read from disk while others are digested.
+
+        Args:
+            file_paths: Paths of the files to hash
+            algorithm: hashlib algorithm name
+            max_workers: Number of files hashed in parallel; defaults to
+                twice the CPU count, capped at MAX_SCAN_WORKERS
 
         Returns:
-            MD5 hash string
+            Dictionary mapping each file's database key to its hash; files
+            that cannot be read are left out
         """
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+        keys = list(dict.fromkeys(self._key(path) for path in file_paths))
+        if max_workers is None:
+            max_workers = min(MAX_SCAN_WORKERS, (os.cpu_count() or 1) * 2)
 
-    def is_processed(self, file_path: Path) -> bool:
+        def hash_one(key: str) -> Optional[str]:
+            try:
+                return self.get_file_hash(Path(key), algorithm)
+            except OSError as e:
+                logger.warning(f"Failed to hash {key}: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hash"
+        ) as executor:
+            hashes = executor.map(hash_one, keys)
+            return {
+                key: h for key, h in zip(keys, hashes, strict=True) if h is not None
+            }
+
+    @staticmethod
+    def _hash_algorithm(stored_hash: str) -> str:
+        """Return the algorithm a stored hash was computed with"""
+        algorithm, separator, _ = stored_hash.partition(":")
+        return algorithm if separator else LEGACY_HASH_ALGORITHM
+
+    def is_unchanged(self, file_path: Path) -> bool:
+        """
+        Check whether a processed file is untouched, without reading it
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the file has a completed entry whose size and
+            modification time still match the file
+        """
+        key = self._key(file_path)
+        file_entry = self.data.get("files", {}).get(key)
+        if (
+            file_entry is None
+            or file_entry.get("status") != ProcessingStatus.COMPLETED.value
+        ):
+            return False
+        size, mtime_ns = self._stat_fingerprint(Path(key))
+        return (
+            size is not None
+            and file_entry.get("size") == size
+            and file_entry.get("mtime_ns") == mtime_ns
+        )
+
+    def is_processed(self, file_path: Path, file_digest: Optional[str] = None) -> bool:
         """
         Check if a file has been successfully processed
 
         Args:
             file_path: Path to the file
+            file_digest: Optional hash_file digest of the file, used instead
+                of reading it again
 
         Returns:
             True if file has been processed with same hash
         """
-        str_path = str(file_path)
+        key = self._key(file_path)
+        file_path = Path(key)
 
         files = self.data.get("files", {})
-        if str_path not in files:
-            return False
+        if key not in files:
+            return self._match_moved_file(file_path, key, file_digest)
 
-        file_entry = files[str_path]
+        file_entry = files[key]
 
         # Check status
         if file_entry.get("status") != ProcessingStatus.COMPLETED.value:
             return False
 
-        # Check if file hash matches
-        try:
-            current_hash = self.get_file_hash(file_path)
-            stored_hash = file_entry.get("hash")
-            return current_hash == stored_hash
-        except Exception as e:
-            logger.warning(f"Failed to check file hash: {e}")
+        # An unchanged size and modification time means the content was not
+        # touched, so the file does not need to be read at all
+        size, mtime_ns = self._stat_fingerprint(file_path)
+        if size is not None:
+            if (
+                file_entry.get("size") == size
+                and file_entry.get("mtime_ns") == mtime_ns
+            ):
+                return True
+            # A different size means different content without reading it
+            if file_entry.get("size") is not None and file_entry["size"] != size:
+                return False
+
+        # Check if file hash matches, using the algorithm the entry was
+        # stored with so entries from older versions stay valid
+        stored_hash = file_entry.get("hash")
+        if not stored_hash:
+            return False
+        algorithm = self._hash_algorithm(stored_hash)
+        if file_digest is not None and algorithm == HASH_ALGORITHM:
+            current_hash = f"{HASH_ALGORITHM}:{file_digest}"
+        else:
+            try:
+                current_hash = self.get_file_hash(file_path, algorithm)
+            except Exception as e:
+                logger.warning(f"Failed to check file hash: {e}")
+                return False
+        if current_hash != stored_hash:
+            return False
+
+        # The file was only touched; record its new fingerprint so later
+        # checks skip the hash again
+        if size is not None:
+            with self._lock:
+                if self.data["files"].get(key) is file_entry:
+                    file_entry["size"], file_entry["mtime_ns"] = size, mtime_ns
+                    self._mark_changed(key)
+                    self._commit()
+        return True
+
+    def is_processed_batch(
+        self, file_paths: Iterable[Path], max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Check whether each of many files has been successfully processed
+
+        Files are looked up in one snapshot of the database, and those whose
+        size and mtime match their entry, or whose size differs from it, are
+        answered without being read. Only the rest are hashed, together
+        through batch_hash, before going through is_processed.
+
+        Args:
+            file_paths: Paths to the files
+            max_workers: Number of files hashed in parallel; defaults to
+                twice the CPU count, capped at MAX_SCAN_WORKERS
+
+        Returns:
+            For each path in order, True if it has been processed with the
+            same content
+        """
+        paths = list(file_paths)
+        results: List[Optional[bool]] = [None] * len(paths)
+        completed = ProcessingStatus.COMPLETED.value
+        with self._lock:
+            files = dict(self.data.get("files", {}))
+            may_be_moved = bool(self._by_hash)
+
+        for index, path in enumerate(paths):
+            key = self._key(path)
+            file_entry = files.get(key)
+            if file_entry is None:
+                # Unknown paths only need hashing if they could be a move
+                if not may_be_moved:
+                    results[index] = False
+            elif file_entry.get("status") != completed:
+                results[index] = False
+            else:
+                size, mtime_ns = self._stat_fingerprint(Path(key))
+                stored_size = file_entry.get("size")
+                if size is not None and stored_size == size:
+                    if file_entry.get("mtime_ns") == mtime_ns:
+                        results[index] = True
+                elif size is not None and stored_size is not None:
+                    results[index] = False
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            hashes = self.batch_hash(
+                [paths[index] for index in pending], max_workers=max_workers
+            )
+            for index in pending:
+                file_hash = hashes.get(self._key(paths[index]))
+                # batch_hash returns stored-hash strings; pass on the digest
+                digest = file_hash.partition(":")[2] if file_hash else None
+                results[index] = self.is_processed(paths[index], digest)
+
+        return [bool(result) for result in results]
+
+    def _match_moved_file(
+        self, file_path: Path, key: str, file_digest: Optional[str] = None
+    ) -> bool:
+        """
+        Check whether an unknown path has the content of a processed file
+
+        If the processed file no longer exists at its recorded path, the
+        entry is moved to the new path so later checks hit the fingerprint.
+
+        Args:
+            file_path: Path to the file
+            key: Canonical key of the file
+            file_digest: Optional hash_file digest of the file
+
+        Returns:
+            True if a completed entry with the same content hash was moved
+            here from a path that no longer exists
+        """
+        if not self._by_hash:
+            return False
+
+        if file_digest is not None:
+            file_hash = f"{HASH_ALGORITHM}:{file_digest}"
+        else:
+            try:
+                file_hash = self.get_file_hash(file_path)
+            except Exception as e:
+                logger.warning(f"Failed to check file hash: {e}")
+                return False
+
+        old_key = self._by_hash.get(file_hash)
+        if old_key is None:
+            return False
+
+        if Path(old_key).exists():
+            # A copy, not a move: it has no notes of its own yet
+            logger.debug(f"Same content as processed file {old_key}: {file_path}")
             return False
 
+        with self._lock:
+            files = self.data["files"]
+            # Another thread may have claimed the entry since the lookup
+            if self._by_hash.get(file_hash) != old_key or old_key not in files:
+                return key in files
+            file_entry = files.pop(old_key)
+            file_entry["size"], file_entry["mtime_ns"] = self._stat_fingerprint(
+                file_path
+            )
+            file_entry["updated_at"] = _now_iso()
+            files[key] = file_entry
+            self._by_hash[file_hash] = key
+            self._mark_changed(old_key, key)
+            self._commit()
+        logger.info(f"Detected moved file: {old_key} -> {file_path}")
+        return True
+
+    @staticmethod
+    def _stat_fingerprint(file_path: Path) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the size and modification time used to detect unchanged files
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Tuple of (size in bytes, mtime in nanoseconds), or Nones if the
+            file cannot be stat'ed
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None, None
+        return stat.st_size, stat.st_mtime_ns
+
     def add_processed_file(
         self,
         file_path: Path,
@@ -149,6 +530,7 @@ class ProcessedFilesDatabase:
         summary_path: Optional[Path] = None,
         duration_seconds: Optional[float] = None,
         file_size_bytes: Optional[int] = None,
+        file_digest: Optional[str] = None,
     ) -> None:
         """
         Add a successfully processed file to the database
@@ -159,46 +541,63 @@ class ProcessedFilesDatabase:
             summary_path: Optional path to the summary markdown
             duration_seconds: Optional audio duration in seconds
             file_size_bytes: Optional file size in bytes
+            file_digest: Optional hash_file digest of the audio file, used
+                instead of reading it again
         """
         try:
-            file_hash = self.get_file_hash(file_path)
-            str_path = str(file_path)
-
-            # Check if this was previously failed
-            was_failed = False
-            if str_path in self.data["files"]:
-                old_entry = self.data["files"][str_path]
-                if old_entry.get("status") == ProcessingStatus.FAILED.value:
-                    was_failed = True
-                    self.data["statistics"]["total_failed"] = max(
-                        0, self.data["statistics"]["total_failed"] - 1
+            if file_digest is not None:
+                file_hash = f"{HASH_ALGORITHM}:{file_digest}"
+            else:
+                file_hash = self.get_file_hash(file_path)
+            size, mtime_ns = self._stat_fingerprint(file_path)
+            str_path = self._key(file_path)
+
+            with self._lock:
+                # Check if this was previously failed
+                was_failed = False
+                if str_path in self.data["files"]:
+                    old_entry = self.data["files"][str_path]
+                    self._unindex(str_path, old_entry)
+                    if old_entry.get("status") == ProcessingStatus.FAILED.value:
+                        was_failed = True
+                        self.data["statistics"]["total_failed"] = max(
+                            0, self.data["statistics"]["total_failed"] - 1
+                        )
+
+                old_status = self.data["files"].get(str_path, {}).get("status")
+                self._update_status_count(old_status, ProcessingStatus.COMPLETED.value)
+                now = _now_iso()
+                self.data["files"][str_path] = {
+                    "hash": file_hash,
+                    "size": size,
+                    "mtime_ns": mtime_ns,
+                    "status": ProcessingStatus.COMPLETED.value,
+                    "processed_at": now,
+                    "updated_at": now,
+                    "outputs": {
+                        "transcription": str(markdown_path),
+                        "summary": str(summary_path) if summary_path else None,
+                    },
+                    "metadata": {
+                        "duration_seconds": duration_seconds,
+                        "file_size_bytes": file_size_bytes,
+                    },
+                    "error": None,
+                }
+                self._by_hash[file_hash] = str_path
+
+                # Update statistics
+                if not was_failed:
+                    self.data["statistics"]["total_processed"] += 1
+                if duration_seconds:
+                    self.data["statistics"]["total_duration_seconds"] += (
+                        duration_seconds
                     )
+                if file_size_bytes:
+                    self.data["statistics"]["total_size_bytes"] += file_size_bytes
 
-            self.data["files"][str_path] = {
-                "hash": file_hash,
-                "status": ProcessingStatus.COMPLETED.value,
-                "processed_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "outputs": {
-                    "transcription": str(markdown_path),
-                    "summary": str(summary_path) if summary_path else None,
-                },
-                "metadata": {
-                    "duration_seconds": duration_seconds,
-                    "file_size_bytes": file_size_bytes,
-                },
-                "error": None,
-            }
-
-            # Update statistics
-            if not was_failed:
-                self.data["statistics"]["total_processed"] += 1
-            if duration_seconds:
-                self.data["statistics"]["total_duration_seconds"] += duration_seconds
-            if file_size_bytes:
-                self.data["statistics"]["total_size_bytes"] += file_size_bytes
-
-            self.save()
+                self._mark_changed(str_path)
+                self._commit()
             logger.info(f"Added processed file to database: {file_path}")
         except Exception as e:
             logger.error(f"Failed to add processed file to database: {e}")
@@ -216,7 +615,7 @@ class ProcessedFilesDatabase:
             file_size_bytes: Optional file size in bytes
         """
         try:
-            str_path = str(file_path)
+            str_path = self._key(file_path)
 
             # Try to get file hash if file exists
             file_hash = None
@@ -225,31 +624,36 @@ class ProcessedFilesDatabase:
             except:  # noqa: E722
                 pass
 
-            # Check if this was previously processed
-            was_processed = False
-            if str_path in self.data["files"]:
-                old_entry = self.data["files"][str_path]
-                if old_entry.get("status") == ProcessingStatus.COMPLETED.value:
-                    was_processed = True
-                    self.data["statistics"]["total_processed"] = max(
-                        0, self.data["statistics"]["total_processed"] - 1
-                    )
-
-            self.data["files"][str_path] = {
-                "hash": file_hash,
-                "status": ProcessingStatus.FAILED.value,
-                "processed_at": None,
-                "updated_at": datetime.now().isoformat(),
-                "outputs": {"transcription": None, "summary": None},
-                "metadata": {"file_size_bytes": file_size_bytes},
-                "error": error,
-            }
-
-            # Update statistics
-            if not was_processed:
-                self.data["statistics"]["total_failed"] += 1
-
-            self.save()
+            with self._lock:
+                # Check if this was previously processed
+                was_processed = False
+                if str_path in self.data["files"]:
+                    old_entry = self.data["files"][str_path]
+                    self._unindex(str_path, old_entry)
+                    if old_entry.get("status") == ProcessingStatus.COMPLETED.value:
+                        was_processed = True
+                        self.data["statistics"]["total_processed"] = max(
+                            0, self.data["statistics"]["total_processed"] - 1
+                        )
+
+                old_status = self.data["files"].get(str_path, {}).get("status")
+                self._update_status_count(old_status, ProcessingStatus.FAILED.value)
+                self.data["files"][str_path] = {
+                    "hash": file_hash,
+                    "status": ProcessingStatus.FAILED.value,
+                    "processed_at": None,
+                    "updated_at": _now_iso(),
+                    "outputs": {"transcription": None, "summary": None},
+                    "metadata": {"file_size_bytes": file_size_bytes},
+                    "error": error,
+                }
+
+                # Update statistics
+                if not was_processed:
+                    self.data["statistics"]["total_failed"] += 1
+
+                self._mark_changed(str_path)
+                self._commit()
             logger.info(f"Added failed file to database: {file_path}")
         except Exception as e:
             logger.error(f"Failed to add failed file to database: {e}")
@@ -264,7 +668,7 @@ class ProcessedFilesDatabase:
         Returns:
             Dictionary with processed file info or None
         """
-        return self.data.get("files", {}).get(str(file_path))
+        return self.data.get("files", {}).get(self._key(file_path))
 
     def remove_processed_file(self, file_path: Path) -> None:
         """
@@ -273,34 +677,52 @@ class ProcessedFilesDatabase:
         Args:
             file_path: Path to the file
         """
-        str_path = str(file_path)
-        files = self.data.get("files", {})
-
-        if str_path in files:
-            file_entry = files[str_path]
-
-            # Update statistics
-            stats = self.data["statistics"]
-            if file_entry.get("status") == ProcessingStatus.COMPLETED.value:
-                stats["total_processed"] = max(0, stats["total_processed"] - 1)
-                if file_entry.get("metadata", {}).get("duration_seconds"):
-                    stats["total_duration_seconds"] = max(
-                        0,
-                        stats["total_duration_seconds"]
-                        - file_entry["metadata"]["duration_seconds"],
-                    )
-                if file_entry.get("metadata", {}).get("file_size_bytes"):
-                    stats["total_size_bytes"] = max(
-                        0,
-                        stats["total_size_bytes"]
-                        - file_entry["metadata"]["file_size_bytes"],
-                    )
-            elif file_entry.get("status") == ProcessingStatus.FAILED.value:
-                stats["total_failed"] = max(0, stats["total_failed"] - 1)
-
-            del files[str_path]
-            self.save()
-            logger.info(f"Removed file from database: {file_path}")
+        with self._lock:
+            str_path = self._key(file_path)
+            files = self.data.get("files", {})
+
+            if str_path in files:
+                file_entry = files[str_path]
+                self._unindex(str_path, file_entry)
+                self._update_status_count(file_entry.get("status"), None)
+
+                # Update statistics
+                stats = self.data["statistics"]
+                if file_entry.get("status") == ProcessingStatus.COMPLETED.value:
+                    stats["total_processed"] = max(0, stats["total_processed"] - 1)
+                    if file_entry.get("metadata", {}).get("duration_seconds"):
+                        stats["total_duration_seconds"] = max(
+                            0,
+                            stats["total_duration_seconds"]
+                            - file_entry["metadata"]["duration_seconds"],
+                        )
+                    if file_entry.get("metadata", {}).get("file_size_bytes"):
+                        stats["total_size_bytes"] = max(
+                            0,
+                            stats["total_size_bytes"]
+                            - file_entry["metadata"]["file_size_bytes"],
+                        )
+                elif file_entry.get("status") == ProcessingStatus.FAILED.value:
+                    stats["total_failed"] = max(0, stats["total_failed"] - 1)
+
+                del files[str_path]
+                self._mark_changed(str_path)
+                self._commit()
+                logger.info(f"Removed file from database: {file_path}")
+
+    def compact(self) -> None:
+        """Merge incrementally written changes into a single database file"""
+        with self._lock:
+            self.data["last_updated"] = _now_iso()
+            self._storage.compact(self.data)
+            self._changed = set()
+            logger.debug(f"Compacted database with {len(self.data['files'])} files")
+
+    def close(self) -> None:
+        """Compact and close the storage backend"""
+        with self._lock:
+            self.compact()
+            self._storage.close()
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -323,16 +745,17 @@ class ProcessedFilesDatabase:
         Returns:
             List of file entries with their paths
         """
-        files = self.data.get("files", {})
+        with self._lock:
+            files = self.data.get("files", {})
 
-        result = []
-        for file_path, file_data in files.items():
-            if status is None or file_data.get("status") == status.value:
-                entry = file_data.copy()
-                entry["path"] = file_path
-                result.append(entry)
+            result = []
+            for file_path, file_data in files.items():
+                if status is None or file_data.get("status") == status.value:
+                    entry = file_data.copy()
+                    entry["path"] = file_path
+                    result.append(entry)
 
-        return result
+            return result
 
     def cleanup_orphaned_entries(self) -> int:
         """
@@ -341,14 +764,16 @@ class ProcessedFilesDatabase:
         Returns:
             Number of entries removed
         """
-        files = self.data.get("files", {})
+        with self._lock:
+            file_paths = list(self.data.get("files", {}))
         removed_count = 0
 
-        for file_path in list(files.keys()):
-            if not Path(file_path).exists():
-                logger.info(f"Removing orphaned entry: {file_path}")
-                self.remove_processed_file(Path(file_path))
-                removed_count += 1
+        with self.batched():
+            for file_path in file_paths:
+                if not Path(file_path).exists():
+                    logger.info(f"Removing orphaned entry: {file_path}")
+                    self.remove_processed_file(Path(file_path))
+                    removed_count += 1
 
         if removed_count > 0:
             logger.info(f"Cleaned up {removed_count} orphaned database entries")
@@ -362,15 +787,11 @@ class ProcessedFilesDatabase:
         Returns:
             Dictionary with summary information
         """
-        stats = self.get_statistics()
-        files = self.data.get("files", {})
-
-        # Count by status
-        status_counts = {}
-        for status in ProcessingStatus:
-            status_counts[status.value] = sum(
-                1 for f in files.values() if f.get("status") == status.value
-            )
+        with self._lock:
+            stats = dict(self.get_statistics())
+            total_files = len(self.data.get("files", {}))
+            # Counts are maintained incrementally by the mutators
+            status_counts = dict(self.data.get("status_counts", {}))
 
         # Format sizes
         total_gb = stats.get("total_size_bytes", 0) / (1024**3)
@@ -380,7 +801,7 @@ class ProcessedFilesDatabase:
             "version": self.data.get("version"),
             "created_at": self.data.get("created_at"),
             "last_updated": self.data.get("last_updated"),
-            "total_files": len(files),
+            "total_files": total_files,
             "status_breakdown": status_counts,
             "total_size_gb": round(total_gb, 2),
             "total_duration_hours": round(total_hours, 2),
@@ -1,12 +1,17 @@
 """Main handler for processing audio files in Obsidian"""
 
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
+from src.api.client import BatchInterruptedError
+from src.audio.utils import probe_audio
+from src.constants import MAX_CONCURRENT_SEGMENTS
 from src.transcription.service import TranscriptionService
 from src.obsidian.database import ProcessedFilesDatabase
 from src.obsidian.note import NoteGenerator
 from src.utils.logging import get_logger
+from src.utils.system import hash_file
 
 logger = get_logger(__name__)
 
@@ -21,6 +26,8 @@ class ObsidianTranscriptionHandler:
         db_path: Path,
         create_summary: bool = True,
         verbose: bool = False,
+        cache_path: Optional[Path] = None,
+        max_concurrency: int = MAX_CONCURRENT_SEGMENTS,
     ):
         """
         Initialize handler
@@ -31,19 +38,29 @@ class ObsidianTranscriptionHandler:
             db_path: Path to the database file
             create_summary: Whether to create summaries
             verbose: Enable verbose logging
+            cache_path: Optional path to a persistent result cache
+            max_concurrency: Maximum number of VAD segments transcribed at once
         """
         self.vault_path = vault_path
         self.create_summary = create_summary
         self.verbose = verbose
 
         # Initialize services
-        self.transcription_service = TranscriptionService(api_key, verbose)
+        self.transcription_service = TranscriptionService(
+            api_key, verbose, cache_path=cache_path, max_concurrency=max_concurrency
+        )
         self.database = ProcessedFilesDatabase(db_path)
         self.note_generator = NoteGenerator(vault_path)
 
+        # Set by close() to stop a running Batch API scan
+        self._batch_stop = threading.Event()
+        self._batch_thread: Optional[threading.Thread] = None
+
         logger.info("Initialized Obsidian transcription handler")
         logger.info(f"Vault path: {vault_path}")
         logger.info(f"Database path: {db_path}")
+        if cache_path:
+            logger.info(f"Cache path: {cache_path}")
         logger.info(
             f"Summary generation: {'enabled' if create_summary else 'disabled'}"
         )
@@ -61,72 +78,177 @@ class ObsidianTranscriptionHandler:
         logger.info(f"Processing audio file: {audio_path}")
 
         try:
+            # Untouched files are answered from their size and mtime alone
+            if self.database.is_unchanged(audio_path):
+                logger.info(f"File already processed: {audio_path}")
+                return True
+
+            # Hash once; the processed check, moved-file lookup, API cache,
+            # upload reuse and the database entry all use the same digest
+            file_digest = hash_file(audio_path)
+
             # Check if already processed
-            if self.database.is_processed(audio_path):
+            if self.database.is_processed(audio_path, file_digest=file_digest):
                 logger.info(f"File already processed: {audio_path}")
                 return True
 
             # Transcribe the audio
             logger.info("Starting transcription")
-            transcription = self.transcription_service.transcribe_file(audio_path)
+            transcription = self.transcription_service.transcribe_file(
+                audio_path, file_hash=file_digest
+            )
 
             if not transcription:
                 logger.error("Transcription returned empty result")
                 return False
 
-            # Create and save transcription note
-            logger.info("Creating transcription note")
-            transcription_content = self.note_generator.create_transcription_note(
-                audio_path, transcription
-            )
+            self._save_results(audio_path, transcription, file_digest)
+            return True
 
-            transcription_path = audio_path.parent / f"{audio_path.stem}_文字起こし.md"
-            self.note_generator.save_note(transcription_content, transcription_path)
+        except Exception as e:
+            logger.error(f"Failed to process audio file: {e}", exc_info=True)
+            return False
 
-            # Create summary if enabled
-            summary_path: Optional[Path] = None
-            if self.create_summary:
-                logger.info("Generating summary")
-                summary = self.transcription_service.generate_summary(
-                    transcription, audio_path
-                )
+    def process_files_batch(self, audio_paths: List[Path]) -> int:
+        """
+        Process several audio files with a single Batch API job
 
-                if summary:
-                    logger.info("Creating summary note")
-                    summary_content = self.note_generator.create_summary_note(
-                        audio_path, transcription, summary
-                    )
-
-                    summary_path = audio_path.parent / f"{audio_path.stem}_要約.md"
-                    self.note_generator.save_note(summary_content, summary_path)
-                else:
-                    logger.warning("Summary generation failed")
-
-            # Get file metadata for database
-            try:
-                from src.audio.utils import get_audio_duration
-
-                duration = get_audio_duration(audio_path)
-                file_size = audio_path.stat().st_size
-            except:  # noqa: E722
-                duration = None
-                file_size = None
-
-            # Update database
-            self.database.add_processed_file(
-                audio_path,
-                transcription_path,
-                summary_path,
-                duration_seconds=duration,
-                file_size_bytes=file_size,
-            )
+        Args:
+            audio_paths: Paths to the audio files
 
-            logger.info(f"Successfully processed: {audio_path}")
-            return True
+        Returns:
+            Number of files processed successfully
+
+        Raises:
+            BatchInterruptedError: If close() was called before the job finished
+        """
+        pending = []
+        processed = self.database.is_processed_batch(audio_paths)
+        for audio_path, is_processed in zip(audio_paths, processed, strict=True):
+            if is_processed:
+                logger.info(f"File already processed: {audio_path}")
+            else:
+                pending.append(audio_path)
+
+        if not pending:
+            logger.info("No unprocessed audio files found")
+            return 0
+        if self._batch_stop.is_set():
+            raise BatchInterruptedError("Stopped before submitting batch job")
+
+        logger.info(f"Processing {len(pending)} audio files via Batch API")
+        results = self.transcription_service.transcribe_files_batch(
+            pending, stop_event=self._batch_stop
+        )
+
+        succeeded = 0
+        # Record all results with a single database write
+        with self.database.batched():
+            for audio_path, result in zip(pending, results, strict=True):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to transcribe {audio_path}: {result}")
+                    continue
+                if not result:
+                    logger.error(f"Transcription returned empty result: {audio_path}")
+                    continue
+
+                try:
+                    self._save_results(audio_path, result)
+                    succeeded += 1
+                except Exception as e:
+                    logger.error(f"Failed to process audio file: {e}", exc_info=True)
+
+        logger.info(f"Batch processing completed: {succeeded}/{len(pending)} files")
+        return succeeded
+
+    def start_batch_scan(self, audio_paths: List[Path]) -> threading.Thread:
+        """
+        Run process_files_batch on a background thread
 
+        A batch job can take hours, so it runs alongside the watcher instead
+        of delaying it. close() stops the wait and cancels the job.
+
+        Args:
+            audio_paths: Paths to the audio files
+
+        Returns:
+            The started thread
+        """
+        self._batch_thread = threading.Thread(
+            target=self._run_batch_scan,
+            args=(audio_paths,),
+            name="batch-scan",
+            daemon=True,
+        )
+        self._batch_thread.start()
+        return self._batch_thread
+
+    def _run_batch_scan(self, audio_paths: List[Path]) -> None:
+        """Thread target for start_batch_scan that logs instead of raising"""
+        try:
+            self.process_files_batch(audio_paths)
+        except BatchInterruptedError as e:
+            logger.info(f"Batch scan stopped: {e}")
         except Exception as e:
-            logger.error(f"Failed to process audio file: {e}", exc_info=True)
-            return False
+            logger.error(f"Batch scan failed: {e}", exc_info=True)
+
+    def _save_results(
+        self, audio_path: Path, transcription: str, file_digest: Optional[str] = None
+    ) -> None:
+        """
+        Create notes for a transcription and record the file in the database
+
+        Args:
+            audio_path: Path to the audio file
+            transcription: Transcribed text
+            file_digest: Optional hash_file digest of the audio file
+        """
+        # Get file metadata once for both notes and the database
+        try:
+            duration, file_size = probe_audio(audio_path)
+        except:  # noqa: E722
+            duration = None
+            file_size = None
+
+        # Create and save transcription note
+        logger.info("Creating transcription note")
+        transcription_content = self.note_generator.create_transcription_note(
+            audio_path, transcription, duration=duration, file_size_bytes=file_size
+        )
+
+        transcription_path = audio_path.parent / f"{audio_path.stem}_文字起こし.md"
+        self.note_generator.save_note(transcription_content, transcription_path)
+
+        # Create summary if enabled
+        summary_path: Optional[Path] = None
+        if self.create_summary:
+            logger.info("Generating summary")
+            summary = self.transcription_service.generate_summary(
+                transcription, audio_path
+            )
+
+            if summary:
+                logger.info("Creating summary note")
+                summary_content = self.note_generator.create_summary_note(
+                    audio_path, transcription, summary, duration=duration
+                )
+
+                summary_path = audio_path.parent / f"{audio_path.stem}_要約.md"
+                self.note_generator.save_note(summary_content, summary_path)
+            else:
+                logger.warning("Summary generation failed")
+
+        # Update database
+        self.database.add_processed_file(
+            audio_path,
+            transcription_path,
+            summary_path,
+            duration_seconds=duration,
+            file_size_bytes=file_size,
+            file_digest=file_digest,
+        )
+
+        logger.info(f"Successfully processed: {audio_path}")
 
     def reprocess_file(self, audio_path: Path) -> bool:
         """
@@ -145,3 +267,10 @@ class ObsidianTranscriptionHandler:
 
         # Process the file
         return self.process_audio_file(audio_path)
+
+    def close(self) -> None:
+        """Stop any batch scan, then flush and close the processed files database"""
+        self._batch_stop.set()
+        if self._batch_thread is not None:
+            self._batch_thread.join()
+        self.database.close()
@@ -1,15 +1,81 @@
 """Obsidian note generation"""
 
+import os
+import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence, Tuple, Union
 
-from src.audio.utils import get_audio_duration, format_duration, get_file_size_mb
+from src.audio.utils import format_duration, get_audio_duration, probe_audio
 from src.constants import DEFAULT_TAGS, SUMMARY_TAGS
 from src.utils.logging import get_logger
+from src.utils.system import write_all
 
 logger = get_logger(__name__)
 
+# A note is rendered as (header, text, footer); the transcription or summary
+# text sits between the two templates and is written without being copied
+# into one combined string
+NoteParts = Tuple[str, str, str]
+
+_TRANSCRIPTION_HEADER = """---
+tags: {tags}
+created: {created}
+source: {relative_path}
+duration: {duration_str}
+file_size: {file_size_mb:.2f} MB
+---
+
+# {stem} - 文字起こし
+
+## メタ情報
+- **元ファイル**: [[{relative_path}]]
+- **録音時間**: {duration_str}
+- **ファイルサイズ**: {file_size_mb:.2f} MB
+- **文字起こし日時**: {created_jp}
+
+## 文字起こし内容
+
+"""
+
+_SUMMARY_HEADER = """---
+tags: {tags}
+created: {created}
+source: {relative_path}
+duration: {duration_str}
+transcription_length: {char_count}文字
+---
+
+# {stem} - 要約
+
+## メタ情報
+- **元ファイル**: [[{relative_path}]]
+- **文字起こし**: [[{stem}_文字起こし]]
+- **録音時間**: {duration_str}
+- **文字数**: {char_count:,}文字
+- **要約生成日時**: {created_jp}
+
+## 要約
+
+"""
+
+_TRANSCRIPTION_FOOTER = """
+
+---
+*このノートはGemini APIによって自動生成されました*
+"""
+
+_SUMMARY_FOOTER = """
+
+---
+
+## 関連ノート
+- [[{stem}_文字起こし|完全な文字起こしを見る]]
+
+---
+*このノートはGemini APIによって自動生成されました*
+"""
+
 
 class NoteGenerator:
     """Generator for Obsidian markdown notes"""
@@ -24,8 +90,13 @@ class NoteGenerator:
         self.vault_path = vault_path
 
     def create_transcription_note(
-        self, audio_path: Path, transcription: str, tags: Optional[list] = None
-    ) -> str:
+        self,
+        audio_path: Path,
+        transcription: str,
+        tags: Optional[list] = None,
+        duration: Optional[float] = None,
+        file_size_bytes: Optional[int] = None,
+    ) -> NoteParts:
         """
         Create a transcription markdown note
 
@@ -33,9 +104,11 @@ class NoteGenerator:
             audio_path: Path to the audio file
             transcription: Transcribed text
             tags: Optional custom tags
+            duration: Audio duration in seconds, if already known
+            file_size_bytes: Audio file size in bytes, if already known
 
         Returns:
-            Markdown content
+            Markdown content as (header, transcription, footer)
         """
         logger.debug(f"Creating transcription note for: {audio_path}")
 
@@ -45,11 +118,12 @@ class NoteGenerator:
         except ValueError:
             relative_path = audio_path
 
-        # Get file metadata
+        # Get file metadata, probing only when the caller did not pass it
         try:
-            duration = get_audio_duration(audio_path)
+            if duration is None or file_size_bytes is None:
+                duration, file_size_bytes = probe_audio(audio_path)
             duration_str = format_duration(duration)
-            file_size_mb = get_file_size_mb(audio_path)
+            file_size_mb = file_size_bytes / (1024 * 1024)
         except Exception as e:
             logger.warning(f"Failed to get file metadata: {e}")
             duration_str = "不明"
@@ -59,31 +133,19 @@ class NoteGenerator:
         if tags is None:
             tags = DEFAULT_TAGS
 
-        # Create markdown content
-        markdown_content = f"""---
-tags: {tags}
-created: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-source: {relative_path}
-duration: {duration_str}
-file_size: {file_size_mb:.2f} MB
----
-
-# {audio_path.stem} - 文字起こし
-
-## メタ情報
-- **元ファイル**: [[{relative_path}]]
-- **録音時間**: {duration_str}
-- **ファイルサイズ**: {file_size_mb:.2f} MB
-- **文字起こし日時**: {datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")}
-
-## 文字起こし内容
-
-{transcription}
-
----
-*このノートはGemini APIによって自動生成されました*
-"""
-        return markdown_content
+        now = datetime.now()
+        header = _TRANSCRIPTION_HEADER.format_map(
+            {
+                "tags": tags,
+                "created": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "created_jp": now.strftime("%Y年%m月%d日 %H:%M:%S"),
+                "relative_path": relative_path,
+                "duration_str": duration_str,
+                "file_size_mb": file_size_mb,
+                "stem": audio_path.stem,
+            }
+        )
+        return header, transcription, _TRANSCRIPTION_FOOTER
 
     def create_summary_note(
         self,
@@ -91,7 +153,8 @@ file_size: {file_size_mb:.2f} MB
         transcription: str,
         summary: str,
         tags: Optional[list] = None,
-    ) -> str:
+        duration: Optional[float] = None,
+    ) -> NoteParts:
         """
         Create a summary markdown note
 
@@ -100,9 +163,10 @@ file_size: {file_size_mb:.2f} MB
             transcription: Original transcribed text
             summary: Summary text
             tags: Optional custom tags
+            duration: Audio duration in seconds, if already known
 
         Returns:
-            Markdown content
+            Markdown content as (header, summary, footer)
         """
         logger.debug(f"Creating summary note for: {audio_path}")
 
@@ -112,9 +176,10 @@ file_size: {file_size_mb:.2f} MB
         except ValueError:
             relative_path = audio_path
 
-        # Get file metadata
+        # Get file metadata, probing only when the caller did not pass it
         try:
-            duration = get_audio_duration(audio_path)
+            if duration is None:
+                duration = get_audio_duration(audio_path)
             duration_str = format_duration(duration)
         except Exception as e:
             logger.warning(f"Failed to get file metadata: {e}")
@@ -127,55 +192,50 @@ file_size: {file_size_mb:.2f} MB
         if tags is None:
             tags = SUMMARY_TAGS
 
-        # Create markdown content
-        markdown_content = f"""---
-tags: {tags}
-created: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-source: {relative_path}
-duration: {duration_str}
-transcription_length: {char_count}文字
----
-
-# {audio_path.stem} - 要約
-
-## メタ情報
-- **元ファイル**: [[{relative_path}]]
-- **文字起こし**: [[{audio_path.stem}_文字起こし]]
-- **録音時間**: {duration_str}
-- **文字数**: {char_count:,}文字
-- **要約生成日時**: {datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")}
-
-## 要約
-
-{summary}
-
----
-
-## 関連ノート
-- [[{audio_path.stem}_文字起こし|完全な文字起こしを見る]]
-
----
-*このノートはGemini APIによって自動生成されました*
-"""
-        return markdown_content
-
-    def save_note(self, content: str, file_path: Path) -> None:
+        now = datetime.now()
+        header = _SUMMARY_HEADER.format_map(
+            {
+                "tags": tags,
+                "created": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "created_jp": now.strftime("%Y年%m月%d日 %H:%M:%S"),
+                "relative_path": relative_path,
+                "duration_str": duration_str,
+                "char_count": char_count,
+                "stem": audio_path.stem,
+            }
+        )
+        return header, summary, _SUMMARY_FOOTER.format(stem=audio_path.stem)
+
+    def save_note(self, content: Union[str, Sequence[str]], file_path: Path) -> None:
         """
         Save markdown note to file
 
+        The note is written to a hidden temporary file beside the target
+        and renamed over it, so Obsidian and sync clients never see a
+        partially written note.
+
         Args:
-            content: Markdown content
+            content: Markdown content, or parts written in order
             file_path: Path to save the file
         """
+        if isinstance(content, str):
+            content = (content,)
+
+        # Dot-prefixed so Obsidian ignores it while it exists
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.tmp")
         try:
             # Ensure directory exists
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Save file
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                write_all(fd, [part.encode("utf-8") for part in content])
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, file_path)
 
             logger.info(f"Saved note: {file_path}")
         except Exception as e:
+            tmp_path.unlink(missing_ok=True)
             logger.error(f"Failed to save note: {e}")
             raise
@@ -0,0 +1,347 @@
+"""Storage backends for the processed files database"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.utils.logging import get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+logger = get_logger(__name__)
+
+# Database paths with these suffixes are stored in SQLite, anything else in JSON
+SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+
+# JSON databases larger than this are parsed incrementally when ijson is present
+STREAMING_LOAD_THRESHOLD = 10 * 1024 * 1024
+
+# The JSON journal is merged into the snapshot once it grows past this size
+JOURNAL_COMPACT_THRESHOLD = 4 * 1024 * 1024
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data to indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_line(data: Any) -> bytes:
+    """Serialize data to a single line of compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n").encode(
+        "utf-8"
+    )
+
+
+def _loads(payload: bytes) -> Any:
+    """Parse UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+class JsonStorage:
+    """Stores the database as a JSON snapshot plus an append-only journal
+
+    Incremental saves append one line per changed entry to a ".jsonl"
+    journal next to the snapshot, so a mutation costs O(1) writes instead
+    of rewriting every entry. The journal is merged into the snapshot by
+    compact(), which runs on full saves, on load, on close and once the
+    journal exceeds JOURNAL_COMPACT_THRESHOLD.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize JSON storage
+
+        Args:
+            db_path: Path to the database JSON file
+        """
+        self.db_path = db_path
+        self.journal_path = db_path.with_suffix(".jsonl")
+
+    def exists(self) -> bool:
+        """Check whether the database snapshot or journal exists"""
+        return self.db_path.exists() or self.journal_path.exists()
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the snapshot and replay the journal on top of it
+
+        Returns:
+            Parsed database dictionary
+        """
+        data: Dict[str, Any] = {}
+        if self.db_path.exists():
+            if (
+                ijson is not None
+                and self.db_path.stat().st_size > STREAMING_LOAD_THRESHOLD
+            ):
+                data = self._load_streaming()
+            else:
+                data = _loads(self.db_path.read_bytes())
+        if self.journal_path.exists():
+            if not self._replay_journal(data):
+                # Later appends would be glued onto the partial line and lost
+                logger.info(f"Compacting damaged journal: {self.journal_path}")
+            # A journal left over from a run that was killed before close()
+            # is folded in now, so it does not keep growing across restarts
+            self.compact(data)
+        return data
+
+    def _load_streaming(self) -> Dict[str, Any]:
+        """
+        Parse the snapshot incrementally with ijson
+
+        Values are built directly from the token stream, so the raw file
+        contents are never held in memory alongside the parsed objects.
+
+        Returns:
+            Parsed database dictionary
+        """
+        logger.debug(f"Streaming large database file: {self.db_path}")
+        with open(self.db_path, "rb") as f:
+            return dict(ijson.kvitems(f, "", use_float=True))
+
+    def _replay_journal(self, data: Dict[str, Any]) -> bool:
+        """
+        Apply journal records to a loaded snapshot in place
+
+        Args:
+            data: Database dictionary read from the snapshot
+
+        Returns:
+            True if every journal line was read, False if any was skipped
+        """
+        files = data.setdefault("files", {})
+        replayed = 0
+        intact = True
+        with open(self.journal_path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    # A crash mid-append leaves a partial last line
+                    logger.warning(
+                        f"Skipping corrupt journal line {line_number}: "
+                        f"{self.journal_path}"
+                    )
+                    intact = False
+                    continue
+                op = record.get("op")
+                if op == "upsert":
+                    files[record["path"]] = record["entry"]
+                elif op == "delete":
+                    files.pop(record["path"], None)
+                elif op == "meta":
+                    data.update(record["data"])
+                replayed += 1
+        logger.debug(f"Replayed {replayed} journal records: {self.journal_path}")
+        return intact
+
+    def save(
+        self, data: Dict[str, Any], changed_keys: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Write the database
+
+        Args:
+            data: Database dictionary
+            changed_keys: File keys modified since the last save; each is
+                appended to the journal as an upsert, or as a delete when it
+                is no longer in data. None rewrites the snapshot.
+        """
+        if changed_keys is None:
+            self.compact(data)
+            return
+
+        files = data.get("files", {})
+        records = []
+        for key in changed_keys:
+            entry = files.get(key)
+            if entry is None:
+                records.append(_dumps_line({"op": "delete", "path": key}))
+            else:
+                records.append(
+                    _dumps_line({"op": "upsert", "path": key, "entry": entry})
+                )
+        meta = {key: value for key, value in data.items() if key != "files"}
+        records.append(_dumps_line({"op": "meta", "data": meta}))
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        # Records are flushed to the OS but not fsync'ed; a crash can lose
+        # the last few, which only means those files are processed again
+        with open(self.journal_path, "ab") as f:
+            f.write(b"".join(records))
+            journal_size = f.tell()
+
+        if journal_size > JOURNAL_COMPACT_THRESHOLD:
+            logger.debug(f"Journal reached {journal_size} bytes, compacting")
+            self.compact(data)
+
+    def compact(self, data: Dict[str, Any]) -> None:
+        """
+        Rewrite the snapshot from data and discard the journal
+
+        Args:
+            data: Database dictionary
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Serialize up front so the file is written in one call rather than
+        # one small write per JSON token. Writing to a sibling file and
+        # renaming it over the database means readers and crashes never see
+        # a truncated file.
+        tmp_path = self.db_path.with_name(self.db_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.db_path)
+        # Only dropped once the snapshot containing its records is in place
+        self.journal_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Release resources (nothing to do for JSON storage)"""
+
+
+class SqliteStorage:
+    """Stores one row per file in SQLite so updates touch only changed rows"""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize SQLite storage
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, hash TEXT, status TEXT, "
+            "updated_at TEXT, entry TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_hash ON files (hash)")
+
+    def exists(self) -> bool:
+        """Check whether the database has been written before"""
+        row = self._conn.execute("SELECT 1 FROM meta WHERE key = 'version'").fetchone()
+        return row is not None
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read all rows into the database dictionary layout
+
+        Returns:
+            Database dictionary
+        """
+        data: Dict[str, Any] = {
+            key: json.loads(value)
+            for key, value in self._conn.execute("SELECT key, value FROM meta")
+        }
+        data["files"] = {
+            path: json.loads(entry)
+            for path, entry in self._conn.execute("SELECT path, entry FROM files")
+        }
+        return data
+
+    def save(
+        self, data: Dict[str, Any], changed_keys: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Write the database
+
+        Args:
+            data: Database dictionary
+            changed_keys: File keys modified since the last save; rows for
+                keys no longer in data are deleted. None rewrites every row.
+        """
+        files = data.get("files", {})
+        meta = [
+            (key, json.dumps(value, ensure_ascii=False))
+            for key, value in data.items()
+            if key != "files"
+        ]
+
+        self._conn.execute("BEGIN")
+        try:
+            if changed_keys is None:
+                self._conn.execute("DELETE FROM files")
+                changed_keys = files.keys()
+
+            for key in changed_keys:
+                entry = files.get(key)
+                if entry is None:
+                    self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files "
+                    "(path, hash, status, updated_at, entry) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        entry.get("hash"),
+                        entry.get("status"),
+                        entry.get("updated_at"),
+                        json.dumps(entry, ensure_ascii=False),
+                    ),
+                )
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def compact(self, data: Dict[str, Any]) -> None:
+        """
+        Fold the write-ahead log back into the main database file
+
+        Rows are already written incrementally, so data is not needed.
+
+        Args:
+            data: Database dictionary; unused
+        """
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self._conn.close()
+
+
+def open_storage(db_path: Path):
+    """
+    Open the storage backend matching a database path
+
+    Args:
+        db_path: Path to the database file
+
+    Returns:
+        SqliteStorage for .db/.sqlite/.sqlite3 paths, JsonStorage otherwise
+    """
+    if db_path.suffix.lower() in SQLITE_SUFFIXES:
+        logger.info(f"Using SQLite database storage: {db_path}")
+        return SqliteStorage(db_path)
+    return JsonStorage(db_path)
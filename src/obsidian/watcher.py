@@ -1,50 +1,253 @@
 """File system watcher for Obsidian vault"""
 
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Union
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEvent,
+    FileSystemEventHandler,
+)
 
-from src.audio.utils import is_audio_file
-from src.constants import AUDIO_EXTENSIONS
+from src.constants import (
+    AUDIO_EXTENSIONS,
+    FILE_SETTLE_SECONDS,
+    FILE_STABLE_INTERVAL,
+    FILE_STABLE_MAX_WAIT,
+    MAX_CONCURRENT_SEGMENTS,
+    MAX_SCAN_WORKERS,
+)
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Only events that can mean "a new or updated audio file is ready", plus
+# deletions to forget a file; other event types (opened, closed, ...) are
+# dropped before reaching Python handlers
+WATCHED_EVENT_TYPES: List[type[FileSystemEvent]] = [
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+]
+
+
+def wait_until_stable(
+    path: Path,
+    interval: float = FILE_STABLE_INTERVAL,
+    max_wait: float = FILE_STABLE_MAX_WAIT,
+) -> bool:
+    """
+    Wait until a file's size stops changing
+
+    Writers that pause without emitting events (network shares, sync
+    clients) are caught by comparing two size samples taken interval apart.
+
+    Args:
+        path: Path to the file
+        interval: Seconds between size samples
+        max_wait: Maximum seconds to wait before giving up
+
+    Returns:
+        True if two successive samples matched, False if the file vanished
+        or was still growing when max_wait elapsed
+    """
+    deadline = time.monotonic() + max_wait
+    try:
+        size = path.stat().st_size
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            current = path.stat().st_size
+            if current == size:
+                return True
+            size = current
+    except OSError:
+        return False
+    logger.warning(f"File still growing after {max_wait:.0f}s: {path}")
+    return False
+
+
+def _audio_event_path(src_path: Union[str, bytes]) -> Optional[Path]:
+    """
+    Get the path of an event if it names an audio file
+
+    The suffix is checked on the raw event string, so the many events for
+    notes, attachments and editor temp files never build a Path.
+
+    Args:
+        src_path: Path from a file system event, as str or bytes
+
+    Returns:
+        Path of the audio file, or None for other files
+    """
+    src_path = os.fsdecode(src_path)
+    if os.path.splitext(src_path)[1].lower() not in AUDIO_EXTENSIONS:
+        return None
+    return Path(src_path)
+
+
+class EventDebouncer:
+    """Run a callback once per path after events for that path stop arriving"""
+
+    def __init__(
+        self, callback: Callable[[Path], None], delay: float = FILE_SETTLE_SECONDS
+    ):
+        """
+        Initialize debouncer
+
+        Args:
+            callback: Function called with the path once it has settled
+            delay: Quiet period in seconds required before the callback runs
+        """
+        self.callback = callback
+        self.delay = delay
+        self._timers: Dict[Path, threading.Timer] = {}
+        self._lock = threading.Lock()
+        # A single worker keeps files processed one at a time, off the
+        # observer thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="audio-processor"
+        )
+
+    def schedule(self, path: Path) -> None:
+        """
+        Schedule the callback for a path, restarting its quiet period
+
+        Args:
+            path: Path that received a file system event
+        """
+        with self._lock:
+            pending = self._timers.get(path)
+            if pending is not None:
+                pending.cancel()
+            timer = threading.Timer(self.delay, self._fire, args=(path,))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _fire(self, path: Path) -> None:
+        """Hand a settled path to the worker unless it was rescheduled"""
+        with self._lock:
+            if self._timers.get(path) is not threading.current_thread():
+                return
+            del self._timers[path]
+            self._executor.submit(self._run, path)
+
+    def _run(self, path: Path) -> None:
+        """Invoke the callback, logging failures instead of losing them"""
+        try:
+            # The quiet period only covers writers that keep emitting events
+            wait_until_stable(path)
+            self.callback(path)
+        except Exception as e:
+            logger.error(f"Failed to process {path}: {e}")
+
+    def close(self) -> None:
+        """Drop pending events and wait for in-flight processing to finish"""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+        self._executor.shutdown(wait=True)
+
 
 class AudioFileHandler(FileSystemEventHandler):
     """Handler for audio file system events"""
 
-    def __init__(self, process_callback):
+    def __init__(self, process_callback, delay: float = FILE_SETTLE_SECONDS):
         """
         Initialize handler
 
         Args:
-            process_callback: Callback function to process audio files
+            process_callback: Callback function to process audio files; it
+                returns True once a file has been handled
+            delay: Seconds a file must go without events before it is processed
         """
         self.process_callback = process_callback
+        # Modification time of each path when it last entered the pipeline
+        self._last_seen: Dict[Path, int] = {}
+        self._lock = threading.Lock()
+        self.debouncer = EventDebouncer(self._process, delay)
         super().__init__()
 
+    def _process(self, path: Path) -> None:
+        """
+        Run the callback for a settled path unless it is unchanged
+
+        Editors and sync tools touch files without changing them, so events
+        for a path whose mtime matches the last processed one are dropped
+        before the callback re-hashes the file.
+
+        Args:
+            path: Path of the settled audio file
+        """
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        with self._lock:
+            if mtime_ns is not None and self._last_seen.get(path) == mtime_ns:
+                logger.debug(f"Skipping unchanged audio file: {path}")
+                return
+            self._last_seen[path] = mtime_ns
+
+        if not self.process_callback(path):
+            # Let a later event retry the same version of the file
+            with self._lock:
+                self._last_seen.pop(path, None)
+
+    def _forget(self, path: Path) -> None:
+        """Drop the recorded mtime of a path that no longer exists"""
+        with self._lock:
+            self._last_seen.pop(path, None)
+
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation event"""
         if not event.is_directory:
-            path = Path(event.src_path)
-            if is_audio_file(path):
+            path = _audio_event_path(event.src_path)
+            if path is not None:
                 logger.info(f"New audio file detected: {path}")
-                # Wait a bit to ensure file is fully written
-                time.sleep(2)
-                self.process_callback(path)
+                self.debouncer.schedule(path)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification event"""
         if not event.is_directory:
-            path = Path(event.src_path)
-            if is_audio_file(path):
-                logger.info(f"Audio file modified: {path}")
-                # Wait a bit to ensure file is fully written
-                time.sleep(2)
-                self.process_callback(path)
+            path = _audio_event_path(event.src_path)
+            if path is not None:
+                # Recorders flush in small chunks, so this fires many times
+                logger.debug(f"Audio file modified: {path}")
+                self.debouncer.schedule(path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle file deletion event"""
+        if not event.is_directory:
+            path = _audio_event_path(event.src_path)
+            if path is not None:
+                self._forget(path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle file move event (e.g. sync tools renaming a finished download)"""
+        if not event.is_directory:
+            source = _audio_event_path(event.src_path)
+            if source is not None:
+                self._forget(source)
+            path = _audio_event_path(event.dest_path)
+            if path is not None:
+                logger.info(f"Audio file moved into place: {path}")
+                self.debouncer.schedule(path)
+
+    def close(self) -> None:
+        """Stop dispatching events and wait for in-flight processing"""
+        self.debouncer.close()
 
 
 class VaultWatcher:
@@ -61,24 +264,81 @@ class VaultWatcher:
         self.vault_path = vault_path
         self.process_callback = process_callback
         self.observer: Optional[Observer] = None
+        self.event_handler: Optional[AudioFileHandler] = None
         logger.info(f"Initialized vault watcher for: {vault_path}")
 
-    def scan_existing_files(self) -> None:
-        """Scan and process existing audio files in the vault"""
-        logger.info(f"Scanning existing audio files in: {self.vault_path}")
+    def iter_audio_files(self) -> Iterator[Path]:
+        """
+        Lazily yield existing audio files in the vault
+
+        The vault is walked once and each file name is matched against the
+        extension set, instead of one recursive glob per extension.
 
-        audio_files = []
-        for ext in AUDIO_EXTENSIONS:
-            pattern = f"*{ext}"
-            audio_files.extend(self.vault_path.rglob(pattern))
+        Yields:
+            Audio file paths
+        """
+        for dirpath, _, filenames in os.walk(self.vault_path):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in AUDIO_EXTENSIONS:
+                    yield Path(dirpath, filename)
 
+    def find_audio_files(self) -> List[Path]:
+        """
+        Find existing audio files in the vault
+
+        Returns:
+            List of audio file paths
+        """
+        logger.info(f"Scanning existing audio files in: {self.vault_path}")
+        audio_files = list(self.iter_audio_files())
         logger.info(f"Found {len(audio_files)} audio files")
+        return audio_files
+
+    def scan_existing_files(
+        self,
+        max_workers: Optional[int] = None,
+        segment_concurrency: int = MAX_CONCURRENT_SEGMENTS,
+    ) -> None:
+        """
+        Scan and process existing audio files in the vault
+
+        Processing is dominated by API round trips, so files are handled by a
+        bounded thread pool as the walk finds them.
+
+        A worker on a long file has up to segment_concurrency segment requests
+        in flight and holds the file's decoded 16 kHz float32 PCM, about 230 MB
+        per hour of audio, until its segments are written. The default pool is
+        therefore sized so that workers times segment_concurrency stays within
+        MAX_SCAN_WORKERS, which bounds both requests and decoded audio.
+
+        Args:
+            max_workers: Number of files processed in parallel; defaults to
+                twice the CPU count, capped at MAX_SCAN_WORKERS and divided by
+                segment_concurrency
+            segment_concurrency: Segments each file transcribes at once
+        """
+        if max_workers is None:
+            max_workers = max(
+                1,
+                min(MAX_SCAN_WORKERS, (os.cpu_count() or 1) * 2) // segment_concurrency,
+            )
+        logger.info(
+            f"Scanning existing audio files in: {self.vault_path} "
+            f"({max_workers} workers)"
+        )
 
-        for audio_path in audio_files:
-            try:
-                self.process_callback(audio_path)
-            except Exception as e:
-                logger.error(f"Failed to process {audio_path}: {e}")
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="scan"
+        ) as executor:
+            futures = {
+                executor.submit(self.process_callback, audio_path): audio_path
+                for audio_path in self.iter_audio_files()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process {futures[future]}: {e}")
 
     def start(self) -> None:
         """Start watching the vault directory"""
@@ -87,11 +347,26 @@ class VaultWatcher:
             return
 
         logger.info("Starting vault watcher")
-        event_handler = AudioFileHandler(self.process_callback)
+        self.event_handler = AudioFileHandler(self.process_callback)
         self.observer = Observer()
-        self.observer.schedule(event_handler, str(self.vault_path), recursive=True)
+        # A single recursive watch on the vault root covers every subfolder
+        self.observer.schedule(
+            self.event_handler,
+            str(self.vault_path),
+            recursive=True,
+            event_filter=WATCHED_EVENT_TYPES,
+        )
         self.observer.start()
-        logger.info("Vault watcher started")
+        # Observer resolves to the native backend (inotify, FSEvents,
+        # ReadDirectoryChangesW, kqueue) and only falls back to polling when
+        # that backend cannot be loaded
+        backend = type(self.observer).__name__
+        if isinstance(self.observer, PollingObserver):
+            logger.warning(
+                f"Native file system events unavailable, using {backend}; "
+                "new files may be detected with a delay"
+            )
+        logger.info(f"Vault watcher started ({backend})")
 
     def stop(self) -> None:
         """Stop watching the vault directory"""
@@ -103,13 +378,16 @@ class VaultWatcher:
         self.observer.stop()
         self.observer.join()
         self.observer = None
+        if self.event_handler is not None:
+            self.event_handler.close()
+            self.event_handler = None
         logger.info("Vault watcher stopped")
 
     def run_forever(self) -> None:
         """Run the watcher forever (blocking)"""
         self.start()
         logger.info(f"Watching for audio files in: {self.vault_path}")
-        logger.info(f"Supported formats: {', '.join(AUDIO_EXTENSIONS)}")
+        logger.info(f"Supported formats: {', '.join(sorted(AUDIO_EXTENSIONS))}")
         logger.info("Press Ctrl+C to stop")
 
         try:
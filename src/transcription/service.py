@@ -1,36 +1,61 @@
 """Audio transcription service"""
 
+import asyncio
 import os
+import shutil
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple, Union
 
-from src.api.client import GeminiClient
+from src.api.client import GeminiClient, run_async
 from src.audio.vad import VADProcessor
 from src.audio.utils import get_audio_duration
-from src.constants import MAX_TRANSCRIPTION_PREVIEW_LENGTH
+from src.constants import (
+    MAX_CONCURRENT_SEGMENTS,
+    MAX_TRANSCRIPTION_PREVIEW_LENGTH,
+    SEGMENT_RAM_DIR,
+    VAD_SAMPLING_RATE,
+)
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Appended to a transcription preview that was cut short for summarization
+_TRUNCATION_MARKER = "\n\n[文字起こしの続きは省略されています...]"
+
 
 class TranscriptionService:
     """Service for transcribing audio files"""
 
-    def __init__(self, api_key: str, verbose: bool = False):
+    def __init__(
+        self,
+        api_key: str,
+        verbose: bool = False,
+        cache_path: Optional[Path] = None,
+        max_concurrency: int = MAX_CONCURRENT_SEGMENTS,
+    ):
         """
         Initialize transcription service
 
         Args:
             api_key: Gemini API key
             verbose: Enable verbose logging
+            cache_path: Optional path to a persistent result cache
+            max_concurrency: Maximum number of VAD segments transcribed at once
         """
-        self.client = GeminiClient(api_key)
+        self.client = GeminiClient(api_key, cache_path=cache_path)
         self.vad_processor = VADProcessor()
         self.verbose = verbose
+        self.max_concurrency = max_concurrency
         logger.info("Initialized transcription service")
 
     def transcribe_file(
-        self, audio_path: Path, use_vad: bool = True, vad_threshold_seconds: float = 600
+        self,
+        audio_path: Path,
+        use_vad: bool = True,
+        vad_threshold_seconds: float = 600,
+        file_hash: Optional[str] = None,
     ) -> str:
         """
         Transcribe an audio file
@@ -39,37 +64,152 @@ class TranscriptionService:
             audio_path: Path to the audio file
             use_vad: Whether to use VAD for long files
             vad_threshold_seconds: Duration threshold for using VAD
+            file_hash: Optional precomputed content hash of the file, reused
+                when it is sent without splitting
 
         Returns:
             Transcribed text
         """
-        logger.info(f"Starting transcription for: {audio_path}")
+        logger.info("Starting transcription for: %s", audio_path)
 
         try:
-            duration = get_audio_duration(audio_path)
-            logger.info(f"Audio duration: {duration:.2f} seconds")
-
-            if use_vad and duration > vad_threshold_seconds:
+            if self._needs_vad(audio_path, use_vad, vad_threshold_seconds):
                 return self._transcribe_with_vad(audio_path)
             else:
-                return self._transcribe_direct(audio_path)
+                return self._transcribe_direct(audio_path, file_hash)
 
         except Exception as e:
-            logger.error(f"Transcription failed: {e}")
+            logger.error("Transcription failed: %s", e)
+            raise
+
+    def transcribe_file_iter(
+        self, audio_path: Path, use_vad: bool = True, vad_threshold_seconds: float = 600
+    ) -> Iterator[str]:
+        """
+        Transcribe an audio file, yielding the text of each segment in order
+
+        Segments are transcribed concurrently as in transcribe_file, but each
+        is yielded as soon as it and all earlier segments are done, so the
+        caller can write them out without holding the joined text.
+
+        Args:
+            audio_path: Path to the audio file
+            use_vad: Whether to use VAD for long files
+            vad_threshold_seconds: Duration threshold for using VAD
+
+        Yields:
+            Transcribed text of each segment, with a marker for failed ones;
+            joining them with blank lines gives the transcribe_file result
+        """
+        logger.info("Starting transcription for: %s", audio_path)
+
+        if not self._needs_vad(audio_path, use_vad, vad_threshold_seconds):
+            yield self._transcribe_direct(audio_path)
+            return
+
+        logger.info("Transcribing audio with VAD splitting")
+
+        async def result_of(task: "asyncio.Task[str]") -> Union[str, BaseException]:
+            try:
+                return await task
+            except Exception as e:
+                return e
+
+        async def cancel(tasks: List["asyncio.Task[str]"]) -> None:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        tasks: List["asyncio.Task[str]"] = []
+        with self._segment_directory(get_audio_duration(audio_path)) as segment_dir:
+            try:
+                # Tasks keep running on the background loop while the caller
+                # handles each yielded segment
+                tasks = run_async(self._start_segments(audio_path, Path(segment_dir)))
+                for i, task in enumerate(tasks):
+                    yield self._format_segment_result(i, run_async(result_of(task)))
+            finally:
+                # Stop outstanding work if the caller gave up early
+                run_async(cancel(tasks))
+
+    async def _start_segments(
+        self, audio_path: Path, segment_dir: Path
+    ) -> List["asyncio.Task[str]"]:
+        """
+        Split audio with VAD, starting each segment's transcription as soon as
+        its file is written
+
+        Segment files are written on a worker thread, so uploads of earlier
+        segments proceed on the event loop in the meantime.
+
+        Args:
+            audio_path: Path to the audio file
+            segment_dir: Directory for the segment files, removed by the
+                caller once the tasks are done
+
+        Returns:
+            One transcription task per segment, in order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        segment_iter = self.vad_processor.iter_segments(
+            audio_path, output_dir=segment_dir
+        )
+        tasks = []
+        try:
+            while (
+                segment := await asyncio.to_thread(next, segment_iter, None)
+            ) is not None:
+                tasks.append(self.client.start_segment_task(*segment, semaphore))
+        except BaseException:
+            # The segment files are about to be removed; stop their uploads
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             raise
 
-    def _transcribe_direct(self, audio_path: Path) -> str:
+        logger.info(
+            "Audio split into %d segments (up to %d in parallel)",
+            len(tasks),
+            self.max_concurrency,
+        )
+        return tasks
+
+    def _needs_vad(
+        self, audio_path: Path, use_vad: bool, vad_threshold_seconds: float
+    ) -> bool:
+        """
+        Decide whether a file is long enough to be split with VAD
+
+        Args:
+            audio_path: Path to the audio file
+            use_vad: Whether VAD splitting is allowed
+            vad_threshold_seconds: Duration threshold for using VAD
+
+        Returns:
+            True if the file should be split with VAD
+        """
+        # Without VAD the file is sent whole, so its length does not matter
+        if not use_vad:
+            return False
+        duration = get_audio_duration(audio_path)
+        logger.info("Audio duration: %.2f seconds", duration)
+        return duration > vad_threshold_seconds
+
+    def _transcribe_direct(
+        self, audio_path: Path, file_hash: Optional[str] = None
+    ) -> str:
         """
         Transcribe audio file directly without splitting
 
         Args:
             audio_path: Path to the audio file
+            file_hash: Optional precomputed content hash of the file
 
         Returns:
             Transcribed text
         """
         logger.info("Transcribing audio directly (no splitting)")
-        return self.client.transcribe_audio(audio_path)
+        return self.client.transcribe_audio(audio_path, file_hash=file_hash)
 
     def _transcribe_with_vad(self, audio_path: Path) -> str:
         """
@@ -83,41 +223,165 @@ class TranscriptionService:
         """
         logger.info("Transcribing audio with VAD splitting")
 
-        # Split audio using VAD
-        segments = self.vad_processor.split_audio(audio_path)
-        logger.info(f"Audio split into {len(segments)} segments")
+        async def transcribe_all(segment_dir: Path) -> List[Union[str, BaseException]]:
+            tasks = await self._start_segments(audio_path, segment_dir)
+            return await asyncio.gather(*tasks, return_exceptions=True)
 
-        transcriptions = []
-        for i, (start, end, segment_path) in enumerate(segments):
-            logger.info(f"Processing segment {i + 1}/{len(segments)}")
+        with self._segment_directory(get_audio_duration(audio_path)) as segment_dir:
+            # Transcribe all segments concurrently
+            results = run_async(transcribe_all(Path(segment_dir)))
 
-            try:
-                # Transcribe segment
+        return self._combine_segment_results(results)
+
+    def transcribe_files_batch(
+        self,
+        audio_paths: List[Path],
+        vad_threshold_seconds: float = 600,
+        stop_event: Optional[threading.Event] = None,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Transcribe several audio files with a single Batch API job
+
+        Long files are split with VAD first and their segments are submitted
+        as separate requests of the same job.
+
+        Args:
+            audio_paths: Paths to the audio files
+            vad_threshold_seconds: Duration threshold for using VAD
+            stop_event: Optional event that stops waiting for the job when set
+
+        Returns:
+            Transcribed text for each file in input order, or the exception
+            raised for a file that failed
+
+        Raises:
+            BatchInterruptedError: If stop_event was set before the job finished
+        """
+        logger.info("Starting batch transcription for %d files", len(audio_paths))
+
+        file_results: List[Union[str, BaseException, None]] = [None] * len(audio_paths)
+        file_segments: List[List[Tuple[float, float, Path]]] = [[] for _ in audio_paths]
+        items: List[Tuple[Path, Optional[tuple[float, float]]]] = []
+        owners: List[int] = []
+
+        with self._segment_directory() as segment_root:
+            for file_index, audio_path in enumerate(audio_paths):
                 try:
-                    segment_text = self.client.transcribe_audio(
-                        segment_path, segment_info=(start, end)
-                    )
-                    transcriptions.append(segment_text)
+                    duration = get_audio_duration(audio_path)
+                    if duration > vad_threshold_seconds:
+                        segment_dir = Path(segment_root) / str(file_index)
+                        segment_dir.mkdir()
+                        segments = self.vad_processor.split_audio(
+                            audio_path, output_dir=segment_dir
+                        )
+                        file_segments[file_index] = segments
+                        for start, end, segment_path in segments:
+                            items.append((segment_path, (start, end)))
+                            owners.append(file_index)
+                    else:
+                        items.append((audio_path, None))
+                        owners.append(file_index)
                 except Exception as e:
-                    logger.error(f"Failed to transcribe segment {i + 1}: {e}")
-                    # Continue with other segments even if one fails
-                    transcriptions.append(
-                        f"[セグメント {i + 1} の文字起こしに失敗: {e}]"
-                    )
-            finally:
-                # Clean up temporary segment file
-                if segment_path.exists():
-                    os.remove(segment_path)
-                    logger.debug(f"Cleaned up segment file: {segment_path}")
+                    logger.error("Failed to prepare %s for batch: %s", audio_path, e)
+                    file_results[file_index] = e
+
+            item_results = self.client.transcribe_audio_batch(
+                items, stop_event=stop_event
+            )
+
+        grouped: List[List[Union[str, BaseException]]] = [[] for _ in audio_paths]
+        for owner, result in zip(owners, item_results, strict=True):
+            grouped[owner].append(result)
+
+        for file_index, results in enumerate(grouped):
+            if file_results[file_index] is not None:
+                continue
+            if file_segments[file_index]:
+                file_results[file_index] = self._combine_segment_results(results)
+            else:
+                file_results[file_index] = results[0]
+
+        return [
+            r if r is not None else RuntimeError("Missing batch result")
+            for r in file_results
+        ]
+
+    def _combine_segment_results(self, results: List[Union[str, BaseException]]) -> str:
+        """
+        Combine per-segment transcription results into a single text
+
+        Args:
+            results: Transcribed text or exception for each segment
+
+        Returns:
+            Combined transcription with markers for failed segments
+        """
+        transcriptions = [
+            self._format_segment_result(i, result) for i, result in enumerate(results)
+        ]
 
         # Combine transcriptions
         full_transcription = "\n\n".join(transcriptions)
         logger.info(
-            f"Transcription completed, total length: {len(full_transcription)} characters"
+            "Transcription completed, total length: %d characters",
+            len(full_transcription),
         )
 
         return full_transcription
 
+    def _format_segment_result(
+        self, index: int, result: Union[str, BaseException]
+    ) -> str:
+        """
+        Get the text for one segment, substituting a marker for a failure
+
+        Args:
+            index: Zero-based segment index
+            result: Transcribed text or the exception raised for the segment
+
+        Returns:
+            Segment text
+        """
+        if isinstance(result, BaseException):
+            logger.error(
+                "Failed to transcribe segment %d: %s",
+                index + 1,
+                result,
+                exc_info=result,
+            )
+            # Continue with other segments even if one fails. The marker names
+            # only the error type: API error messages can carry whole response
+            # bodies, which would bloat the note and the summary preview
+            return (
+                f"[セグメント {index + 1} の文字起こしに失敗: {type(result).__name__}]"
+            )
+        return result
+
+    @staticmethod
+    def _segment_directory(
+        duration: Optional[float] = None,
+    ) -> tempfile.TemporaryDirectory:
+        """
+        Create a temporary directory for VAD segment files
+
+        Segments are removed together with the directory in one call when
+        transcription finishes, rather than one file at a time. When the
+        audio duration is known and SEGMENT_RAM_DIR has room for its
+        segments, the directory is created there so segment files are
+        written to and uploaded from memory instead of disk.
+
+        Args:
+            duration: Duration in seconds of the audio being split, if known
+
+        Returns:
+            Temporary directory context manager yielding the directory path
+        """
+        return tempfile.TemporaryDirectory(
+            prefix="transcribe_segments_",
+            dir=_segment_parent_dir(duration),
+            ignore_cleanup_errors=True,
+        )
+
     def generate_summary(
         self, transcription: str, audio_path: Optional[Path] = None
     ) -> Optional[str]:
@@ -135,9 +399,9 @@ class TranscriptionService:
             logger.info("Generating summary of transcription")
 
             # Truncate transcription if too long
-            preview = transcription[:MAX_TRANSCRIPTION_PREVIEW_LENGTH]
+            preview = transcription
             if len(transcription) > MAX_TRANSCRIPTION_PREVIEW_LENGTH:
-                preview += "\n\n[文字起こしの続きは省略されています...]"
+                preview = _truncate_preview(transcription)
 
             # Add context if audio path is provided
             context = ""
@@ -149,5 +413,54 @@ class TranscriptionService:
             return summary
 
         except Exception as e:
-            logger.error(f"Summary generation failed: {e}")
+            logger.error("Summary generation failed: %s", e)
             return None
+
+
+def _segment_parent_dir(duration: Optional[float]) -> Optional[str]:
+    """
+    Choose where to create a segment directory
+
+    Args:
+        duration: Duration in seconds of the audio being split, if known
+
+    Returns:
+        SEGMENT_RAM_DIR if it is writable and has twice the space the
+        segments need, leaving room for other files; otherwise None for the
+        system temporary directory
+    """
+    if duration is None:
+        return None
+    try:
+        free_bytes = shutil.disk_usage(SEGMENT_RAM_DIR).free
+    except OSError:
+        return None
+    # Segments are 16-bit mono PCM at the VAD sampling rate
+    needed_bytes = duration * VAD_SAMPLING_RATE * 2
+    if free_bytes < needed_bytes * 2 or not os.access(SEGMENT_RAM_DIR, os.W_OK):
+        return None
+    return SEGMENT_RAM_DIR
+
+
+def _truncate_preview(transcription: str) -> str:
+    """
+    Cut a transcription to MAX_TRANSCRIPTION_PREVIEW_LENGTH for summarization
+
+    The cut is moved back to the last line or sentence break in the second
+    half of the allowed length, so the summary is not based on a sentence
+    that stops mid-word.
+
+    Args:
+        transcription: Transcribed text longer than the preview length
+
+    Returns:
+        Preview text ending with a truncation marker
+    """
+    limit = MAX_TRANSCRIPTION_PREVIEW_LENGTH
+    cut = max(
+        transcription.rfind("\n", limit // 2, limit),
+        transcription.rfind("。", limit // 2, limit) + 1,
+    )
+    if cut <= limit // 2:
+        cut = limit
+    return "".join((transcription[:cut], _TRUNCATION_MARKER))
@@ -1,23 +1,26 @@
 """System utility functions"""
 
-import subprocess
+import functools
+import hashlib
+import os
+import shutil
+import stat
 from pathlib import Path
+from typing import Optional, Sequence
 
 
+@functools.lru_cache(maxsize=1)
 def check_ffmpeg() -> bool:
     """
     Check if FFmpeg is installed on the system
 
+    Looks the executable up on PATH instead of running it. The result is
+    cached for the life of the process.
+
     Returns:
         True if FFmpeg is installed, False otherwise
     """
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"], capture_output=True, text=True, check=False
-        )
-        return result.returncode == 0
-    except FileNotFoundError:
-        return False
+    return shutil.which("ffmpeg") is not None
 
 
 def ensure_ffmpeg() -> None:
@@ -62,10 +65,11 @@ def validate_file_path(path: Path, must_exist: bool = True) -> Path:
         FileNotFoundError: If must_exist is True and file doesn't exist
         ValueError: If path is not a file
     """
-    if must_exist and not path.exists():
-        raise FileNotFoundError(f"File not found: {path}")
-
-    if path.exists() and not path.is_file():
+    mode = _stat_mode(path)
+    if mode is None:
+        if must_exist:
+            raise FileNotFoundError(f"File not found: {path}")
+    elif not stat.S_ISREG(mode):
         raise ValueError(f"Path is not a file: {path}")
 
     return path
@@ -86,10 +90,66 @@ def validate_directory_path(path: Path, must_exist: bool = True) -> Path:
         FileNotFoundError: If must_exist is True and directory doesn't exist
         ValueError: If path is not a directory
     """
-    if must_exist and not path.exists():
-        raise FileNotFoundError(f"Directory not found: {path}")
-
-    if path.exists() and not path.is_dir():
+    mode = _stat_mode(path)
+    if mode is None:
+        if must_exist:
+            raise FileNotFoundError(f"Directory not found: {path}")
+    elif not stat.S_ISDIR(mode):
         raise ValueError(f"Path is not a directory: {path}")
 
     return path
+
+
+def hash_file(file_path: Path, algorithm: str = "blake2b") -> str:
+    """
+    Calculate the content hash of a file
+
+    Args:
+        file_path: Path to the file
+        algorithm: hashlib algorithm name
+
+    Returns:
+        Hex digest string
+    """
+    # Unbuffered so file_digest reads straight into its own buffer with
+    # readinto and runs the whole loop in C
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, algorithm).hexdigest()
+
+
+def _stat_mode(path: Path) -> Optional[int]:
+    """
+    Get the file mode of a path with a single stat call
+
+    Args:
+        path: Path to check
+
+    Returns:
+        st_mode following symlinks, or None if nothing exists at the path
+    """
+    try:
+        return path.stat().st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def write_all(fd: int, buffers: Sequence[bytes]) -> None:
+    """
+    Write buffers to a file descriptor in order, retrying short writes
+
+    Args:
+        fd: Open file descriptor
+        buffers: Byte strings to write
+    """
+    pending = [memoryview(buffer) for buffer in buffers if buffer]
+    while pending:
+        if hasattr(os, "writev"):
+            written = os.writev(fd, pending)
+        else:  # pragma: no cover - Windows has no writev
+            written = os.write(fd, pending[0])
+        while written:
+            if written >= len(pending[0]):
+                written -= len(pending.pop(0))
+            else:
+                pending[0] = pending[0][written:]
+                written = 0
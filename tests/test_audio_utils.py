@@ -1,10 +1,22 @@
 """Tests for audio utility functions"""
 
+import os
+import subprocess
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from src.audio.utils import is_audio_file, format_duration, get_file_size_mb
+import numpy as np
+import soundfile as sf
+
+from src.audio.utils import (
+    is_audio_file,
+    format_duration,
+    get_file_size_mb,
+    load_audio_pcm,
+    probe_audio,
+)
 from src.constants import AUDIO_EXTENSIONS
 
 
@@ -13,19 +25,23 @@ class TestAudioUtils(unittest.TestCase):
 
     def test_is_audio_file_valid_extensions(self):
         """Test is_audio_file with valid extensions"""
-        for ext in AUDIO_EXTENSIONS:
-            path = Path(f"test{ext}")
-            self.assertTrue(is_audio_file(path))
-            # Test case insensitive
-            path_upper = Path(f"test{ext.upper()}")
-            self.assertTrue(is_audio_file(path_upper))
+        for ext in sorted(AUDIO_EXTENSIONS):
+            with self.subTest(ext=ext):
+                self.assertTrue(is_audio_file(Path(f"test{ext}")))
+                # Test case insensitive
+                self.assertTrue(is_audio_file(Path(f"test{ext.upper()}")))
 
     def test_is_audio_file_invalid_extensions(self):
         """Test is_audio_file with invalid extensions"""
         invalid_extensions = [".txt", ".md", ".pdf", ".docx", ".png"]
         for ext in invalid_extensions:
-            path = Path(f"test{ext}")
-            self.assertFalse(is_audio_file(path))
+            with self.subTest(ext=ext):
+                self.assertFalse(is_audio_file(Path(f"test{ext}")))
+
+    def test_is_audio_file_no_extension(self):
+        """Test is_audio_file with paths that have no extension"""
+        self.assertFalse(is_audio_file(Path("recordings")))
+        self.assertFalse(is_audio_file(Path(".mp3")))
 
     def test_format_duration_seconds_only(self):
         """Test format_duration with seconds only"""
@@ -58,6 +74,127 @@ class TestAudioUtils(unittest.TestCase):
         size_mb = get_file_size_mb(path)
         self.assertEqual(size_mb, 2.5)
 
+    def test_probe_audio_cached_until_modified(self):
+        """Test probe_audio reuses the header probe until the file changes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.wav"
+            sf.write(str(path), np.zeros(16000, dtype=np.float32), 16000)
+
+            with patch("src.audio.utils.sf.info", wraps=sf.info) as mock_info:
+                duration, size_bytes = probe_audio(path)
+                self.assertAlmostEqual(duration, 1.0)
+                self.assertEqual(size_bytes, path.stat().st_size)
+
+                probe_audio(path)
+                self.assertEqual(mock_info.call_count, 1)
+
+                sf.write(str(path), np.zeros(32000, dtype=np.float32), 16000)
+                stat = path.stat()
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                duration, _ = probe_audio(path)
+                self.assertAlmostEqual(duration, 2.0)
+                self.assertEqual(mock_info.call_count, 2)
+
+    @patch("src.audio.utils.AudioSegment.from_file")
+    @patch("src.audio.utils.subprocess.run")
+    def test_probe_audio_uses_ffprobe_fallback(self, mock_run, mock_from_file):
+        """Test files soundfile cannot read are probed without decoding"""
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout=b"754.250000\n", stderr=b""
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.m4a"
+            path.write_bytes(b"not a wav file")
+
+            duration, _ = probe_audio(path)
+
+        self.assertAlmostEqual(duration, 754.25)
+        self.assertEqual(mock_run.call_args.args[0][0], "ffprobe")
+        mock_from_file.assert_not_called()
+
+    @patch("src.audio.utils.AudioSegment.from_file")
+    @patch("src.audio.utils.subprocess.run", side_effect=FileNotFoundError)
+    def test_probe_audio_falls_back_to_pydub(self, _, mock_from_file):
+        """Test pydub is used when ffprobe is not installed"""
+        mock_from_file.return_value = MagicMock(duration_seconds=12.5)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.m4a"
+            path.write_bytes(b"not a wav file")
+
+            duration, _ = probe_audio(path)
+
+        self.assertAlmostEqual(duration, 12.5)
+        mock_from_file.assert_called_once_with(str(path))
+
+    @patch("src.audio.utils.subprocess.run")
+    @patch("src.utils.system.check_ffmpeg", return_value=False)
+    def test_load_audio_pcm_requires_ffmpeg(self, _, mock_run):
+        """Test formats libsndfile cannot read report a missing FFmpeg"""
+        with self.assertRaises(RuntimeError) as context:
+            load_audio_pcm(Path("test.m4a"), 16000)
+
+        self.assertIn("FFmpeg is not installed", str(context.exception))
+        mock_run.assert_not_called()
+
+    @patch("src.audio.utils.subprocess.run")
+    @patch("src.utils.system.check_ffmpeg", return_value=False)
+    def test_load_audio_pcm_wav_without_ffmpeg(self, _, mock_run):
+        """Test WAV files are decoded and downmixed without FFmpeg"""
+        stereo = np.stack(
+            [np.full(16000, 0.5, np.float32), np.full(16000, -0.25, np.float32)],
+            axis=1,
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.WAV"
+            sf.write(str(path), stereo, 16000, subtype="FLOAT")
+
+            samples = load_audio_pcm(path, 16000)
+
+        self.assertEqual(samples.dtype, np.float32)
+        self.assertEqual(samples.shape, (16000,))
+        np.testing.assert_allclose(samples, 0.125)
+        self.assertTrue(samples.flags.writeable)
+        mock_run.assert_not_called()
+
+    @patch("src.audio.utils.sf.SoundFile")
+    def test_load_audio_pcm_frame_count_underestimated(self, mock_soundfile):
+        """Test decoding more frames than the header announced"""
+        f = mock_soundfile.return_value.__enter__.return_value
+        f.samplerate = 16000
+        f.frames = 10
+        f.blocks.return_value = [
+            np.full((8, 2), value, dtype=np.float32) for value in (0.1, 0.2, 0.3)
+        ]
+
+        samples = load_audio_pcm(Path("test.mp3"), 16000)
+
+        self.assertEqual(samples.shape, (24,))
+        np.testing.assert_allclose(samples, np.repeat([0.1, 0.2, 0.3], 8), rtol=1e-6)
+
+    @patch("src.audio.utils._load_pcm_ffmpeg")
+    @patch("src.audio.utils._load_pcm_soundfile", side_effect=ValueError("shape"))
+    def test_load_audio_pcm_soundfile_error_uses_ffmpeg(self, _, mock_ffmpeg):
+        """Test a soundfile decoding error falls back to FFmpeg"""
+        mock_ffmpeg.return_value = np.zeros(16000, dtype=np.float32)
+
+        samples = load_audio_pcm(Path("test.ogg"), 16000)
+
+        self.assertEqual(len(samples), 16000)
+        mock_ffmpeg.assert_called_once_with(Path("test.ogg"), 16000)
+
+    @patch("src.audio.utils._resample")
+    def test_load_audio_pcm_resamples_other_rates(self, mock_resample):
+        """Test files at another rate are resampled to the target rate"""
+        mock_resample.side_effect = lambda samples, source, target: samples[::3]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.flac"
+            sf.write(str(path), np.zeros(48000, dtype=np.float32), 48000)
+
+            samples = load_audio_pcm(path, 16000)
+
+        self.assertEqual(len(samples), 16000)
+        self.assertEqual(mock_resample.call_args.args[1:], (48000, 16000))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for the persistent result cache"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.api.cache import ResultCache, hash_text
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = Path(self.temp_dir) / "cache.sqlite"
+
+    def test_get_missing_key(self):
+        """Test get returns None for unknown keys"""
+        cache = ResultCache(self.cache_path)
+        self.assertIsNone(cache.get("missing"))
+        cache.close()
+
+    def test_put_and_get(self):
+        """Test stored values are returned and persisted across instances"""
+        cache = ResultCache(self.cache_path)
+        cache.put("key", "文字起こし")
+        self.assertEqual(cache.get("key"), "文字起こし")
+        cache.close()
+
+        reopened = ResultCache(self.cache_path)
+        self.assertEqual(reopened.get("key"), "文字起こし")
+        reopened.close()
+
+    def test_put_overwrites(self):
+        """Test put replaces an existing value"""
+        cache = ResultCache(self.cache_path)
+        cache.put("key", "old")
+        cache.put("key", "new")
+        self.assertEqual(cache.get("key"), "new")
+        cache.close()
+
+    def test_hash_text(self):
+        """Test hash_text is deterministic"""
+        self.assertEqual(hash_text("abc"), hash_text("abc"))
+        self.assertNotEqual(hash_text("abc"), hash_text("abd"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,357 @@
+"""Tests for the Gemini API client wrapper"""
+
+import asyncio
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from google.genai.types import File, FileState, JobState
+
+from src.api.client import (
+    BatchInterruptedError,
+    GeminiClient,
+    get_genai_client,
+    run_async,
+)
+
+
+class TestRunAsync(unittest.TestCase):
+    """Test cases for run_async"""
+
+    def test_runs_on_one_persistent_loop(self):
+        """Test coroutines from any thread share the same event loop"""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        loop = run_async(current_loop())
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            loops = list(executor.map(lambda _: run_async(current_loop()), range(8)))
+
+        self.assertTrue(loop.is_running())
+        self.assertTrue(all(other is loop for other in loops))
+
+    def test_propagates_exceptions(self):
+        """Test exceptions raised by the coroutine reach the caller"""
+
+        async def fail():
+            raise ValueError("invalid argument")
+
+        with self.assertRaises(ValueError):
+            run_async(fail())
+
+
+class TestGetGenaiClient(unittest.TestCase):
+    """Test cases for the shared genai client"""
+
+    def setUp(self):
+        """Build a fresh client for each test"""
+        get_genai_client.cache_clear()
+        self.addCleanup(get_genai_client.cache_clear)
+
+    @patch("src.api.client._has_module", return_value=False)
+    def test_connection_pool_options(self, _):
+        """Test both transports keep idle connections open for reuse"""
+        api_client = get_genai_client("key")._api_client
+
+        for http_client in (api_client._httpx_client, api_client._async_httpx_client):
+            pool = http_client._transport._pool
+            self.assertEqual(pool._max_keepalive_connections, 16)
+            self.assertEqual(pool._keepalive_expiry, 60)
+            self.assertFalse(pool._http2)
+
+    def test_client_is_shared(self):
+        """Test GeminiClient instances reuse one connection pool per key"""
+        self.assertIs(get_genai_client("key"), get_genai_client("key"))
+        self.assertIsNot(get_genai_client("key"), get_genai_client("other"))
+
+
+@patch("src.api.client.get_genai_client")
+class TestGeminiClientAsync(unittest.TestCase):
+    """Test cases for the async API calls"""
+
+    def test_transcribe_audio_async_uses_async_transport(self, mock_get_client):
+        """Test async transcription awaits the SDK's aio surface directly"""
+        genai_client = MagicMock()
+        genai_client.aio.files.upload = AsyncMock(return_value=MagicMock())
+        genai_client.aio.models.generate_content = AsyncMock(
+            return_value=MagicMock(text="こんにちは")
+        )
+        mock_get_client.return_value = genai_client
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_path = Path(temp_dir) / "segment.wav"
+            audio_path.write_bytes(b"audio")
+            client = GeminiClient("key")
+
+            result = run_async(
+                client.transcribe_audio_async(audio_path, segment_info=(0.0, 60.0))
+            )
+
+        self.assertEqual(result, "こんにちは")
+        genai_client.aio.files.upload.assert_awaited_once_with(
+            file=str(audio_path), config={"mime_type": "audio/wav"}
+        )
+        genai_client.aio.models.generate_content.assert_awaited_once()
+        genai_client.files.upload.assert_not_called()
+        genai_client.models.generate_content.assert_not_called()
+
+    def test_transcribe_audio_async_keeps_cache_off_loop(self, mock_get_client):
+        """Test cache lookups and writes do not run on the event loop thread"""
+        genai_client = MagicMock()
+        genai_client.aio.files.upload = AsyncMock(return_value=MagicMock())
+        genai_client.aio.models.generate_content = AsyncMock(
+            return_value=MagicMock(text="こんにちは")
+        )
+        mock_get_client.return_value = genai_client
+
+        async def current_thread():
+            return threading.current_thread()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_path = Path(temp_dir) / "segment.wav"
+            audio_path.write_bytes(b"audio")
+            client = GeminiClient("key", cache_path=Path(temp_dir) / "cache.db")
+            threads = []
+            for name in ("get", "put"):
+                method = getattr(client.cache, name)
+                setattr(
+                    client.cache,
+                    name,
+                    lambda *args, method=method: (
+                        threads.append(threading.current_thread()) or method(*args)
+                    ),
+                )
+
+            run_async(client.transcribe_audio_async(audio_path))
+            client.cache.close()
+
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(run_async(current_thread()), threads)
+
+
+@patch("src.api.client.get_genai_client")
+class TestUploadCache(unittest.TestCase):
+    """Test cases for reusing uploads of identical content"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.first = Path(self.temp_dir.name) / "first.wav"
+        self.copy = Path(self.temp_dir.name) / "copy.wav"
+        self.other = Path(self.temp_dir.name) / "other.wav"
+        self.first.write_bytes(b"audio")
+        self.copy.write_bytes(b"audio")
+        self.other.write_bytes(b"other audio")
+
+    def _client(self, mock_get_client):
+        genai_client = MagicMock()
+        self.uploads = 0
+
+        def upload(file, config):
+            self.uploads += 1
+            return File(name=f"files/{self.uploads}", state=FileState.ACTIVE)
+
+        genai_client.files.upload.side_effect = upload
+        genai_client.files.get.side_effect = lambda name: File(
+            name=name, state=FileState.ACTIVE
+        )
+        mock_get_client.return_value = genai_client
+        return GeminiClient("key"), genai_client
+
+    def test_same_content_reuses_active_upload(self, mock_get_client):
+        """Test a copy of an uploaded file is not uploaded again"""
+        client, genai_client = self._client(mock_get_client)
+
+        first = client.upload_file(self.first)
+        copy = client.upload_file(self.copy)
+        other = client.upload_file(self.other)
+
+        self.assertEqual(copy.name, first.name)
+        self.assertNotEqual(other.name, first.name)
+        self.assertEqual(genai_client.files.upload.call_count, 2)
+        genai_client.files.get.assert_called_once_with(name=first.name)
+
+    def test_expired_upload_is_replaced(self, mock_get_client):
+        """Test an upload that is no longer active is uploaded again"""
+        client, genai_client = self._client(mock_get_client)
+        first = client.upload_file(self.first)
+        genai_client.files.get.side_effect = lambda name: File(
+            name=name, state=FileState.FAILED
+        )
+
+        second = client.upload_file(self.first)
+
+        self.assertNotEqual(second.name, first.name)
+        self.assertEqual(genai_client.files.upload.call_count, 2)
+
+    def test_missing_upload_is_evicted(self, mock_get_client):
+        """Test a deleted upload is evicted by hash and uploaded again"""
+        client, genai_client = self._client(mock_get_client)
+        client.upload_file(self.first)
+        genai_client.files.get.side_effect = RuntimeError("404 NOT_FOUND")
+
+        second = client.upload_file(self.copy)
+        genai_client.files.get.side_effect = lambda name: File(
+            name=name, state=FileState.ACTIVE
+        )
+        third = client.upload_file(self.first)
+
+        # The replacement upload is cached under the same content hash
+        self.assertEqual(third.name, second.name)
+        self.assertEqual(genai_client.files.upload.call_count, 2)
+        self.assertEqual(list(client._upload_cache.values()), [second])
+
+    def test_precomputed_hash_skips_reading_file(self, mock_get_client):
+        """Test a hash passed by the caller is used as the cache key"""
+        client, genai_client = self._client(mock_get_client)
+        client.upload_file(self.first, file_hash="known")
+
+        with patch("src.api.client.hash_file") as mock_hash:
+            client.upload_file(self.other, file_hash="known")
+
+        mock_hash.assert_not_called()
+        self.assertEqual(genai_client.files.upload.call_count, 1)
+
+
+def _batch_job(state, responses=None):
+    """Build a stand-in for a finished BatchJob"""
+    return SimpleNamespace(
+        name="batches/1", state=state, dest=SimpleNamespace(inlined_responses=responses)
+    )
+
+
+def _inlined(text=None, error=None):
+    """Build a stand-in for one InlinedResponse"""
+    return SimpleNamespace(
+        response=SimpleNamespace(text=text) if text is not None else None,
+        error=SimpleNamespace(message=error) if error is not None else None,
+    )
+
+
+@patch("src.api.client.get_genai_client")
+class TestGeminiClientBatch(unittest.TestCase):
+    """Test cases for the Batch API path"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = Path(self.temp_dir.name) / f"audio{i}.wav"
+            path.write_bytes(f"audio{i}".encode())
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _client(self, mock_get_client, *jobs):
+        genai_client = MagicMock()
+        genai_client.files.upload.side_effect = lambda file, config: File(
+            name=f"files/{Path(file.name).stem}",
+            uri=f"https://example.invalid/{Path(file.name).name}",
+            mime_type="audio/wav",
+        )
+        genai_client.batches.create.return_value = SimpleNamespace(name="batches/1")
+        genai_client.batches.get.side_effect = list(jobs)
+        mock_get_client.return_value = genai_client
+        return GeminiClient("key"), genai_client
+
+    def test_results_follow_input_order(self, mock_get_client):
+        """Test responses are mapped back to the items that produced them"""
+        client, genai_client = self._client(
+            mock_get_client,
+            _batch_job(
+                JobState.JOB_STATE_SUCCEEDED, [_inlined("zero"), _inlined("one")]
+            ),
+        )
+
+        results = client.transcribe_audio_batch(
+            [(self.paths[0], None), (self.paths[1], (0.0, 60.0))]
+        )
+
+        self.assertEqual(results, ["zero", "one"])
+        src = genai_client.batches.create.call_args.kwargs["src"]
+        self.assertEqual(len(src), 2)
+        self.assertTrue(
+            src[1].contents[0].parts[1].file_data.file_uri.endswith("1.wav")
+        )
+
+    def test_failed_and_expired_jobs_fail_every_request(self, mock_get_client):
+        """Test a job that did not succeed marks all of its requests failed"""
+        for state in (JobState.JOB_STATE_FAILED, JobState.JOB_STATE_EXPIRED):
+            with self.subTest(state=state):
+                client, _ = self._client(mock_get_client, _batch_job(state))
+
+                results = client.transcribe_audio_batch(
+                    [(self.paths[0], None), (self.paths[1], None)]
+                )
+
+                self.assertEqual(len(results), 2)
+                for result in results:
+                    self.assertIsInstance(result, RuntimeError)
+                    self.assertIn(state.name, str(result))
+
+    def test_partially_succeeded_job(self, mock_get_client):
+        """Test per-request errors and missing responses in a partial job"""
+        client, _ = self._client(
+            mock_get_client,
+            _batch_job(
+                JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+                [_inlined("zero"), _inlined(error="quota exceeded")],
+            ),
+        )
+
+        results = client.transcribe_audio_batch([(path, None) for path in self.paths])
+
+        self.assertEqual(results[0], "zero")
+        self.assertIn("quota exceeded", str(results[1]))
+        self.assertIn("no response", str(results[2]))
+
+    def test_prepare_failure_is_reported_per_item(self, mock_get_client):
+        """Test an item that cannot be uploaded does not shift later results"""
+        client, genai_client = self._client(
+            mock_get_client,
+            _batch_job(JobState.JOB_STATE_SUCCEEDED, [_inlined("two")]),
+        )
+        missing = Path(self.temp_dir.name) / "missing.wav"
+
+        results = client.transcribe_audio_batch(
+            [(missing, None), (self.paths[2], None)]
+        )
+
+        self.assertIsInstance(results[0], FileNotFoundError)
+        self.assertEqual(results[1], "two")
+        self.assertEqual(len(genai_client.batches.create.call_args.kwargs["src"]), 1)
+
+    def test_stop_event_cancels_job(self, mock_get_client):
+        """Test stopping the wait cancels the submitted job"""
+        client, genai_client = self._client(
+            mock_get_client, _batch_job(JobState.JOB_STATE_RUNNING)
+        )
+        stop_event = threading.Event()
+        stop_event.set()
+
+        with self.assertRaises(BatchInterruptedError):
+            client.transcribe_audio_batch(
+                [(self.paths[0], None)], stop_event=stop_event
+            )
+
+        genai_client.batches.cancel.assert_called_once_with(name="batches/1")
+
+    def test_interrupt_cancels_job(self, mock_get_client):
+        """Test Ctrl+C while waiting cancels the submitted job"""
+        client, genai_client = self._client(mock_get_client)
+        genai_client.batches.get.side_effect = KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            client.transcribe_audio_batch([(self.paths[0], None)])
+
+        genai_client.batches.cancel.assert_called_once_with(name="batches/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from unittest.mock import patch
 from argparse import Namespace
 
 from src.config import Config
+from src.constants import MAX_CONCURRENT_SEGMENTS
 
 
 class TestConfig(unittest.TestCase):
@@ -65,6 +66,31 @@ class TestConfig(unittest.TestCase):
         self.assertFalse(config.create_summary)
         self.assertFalse(config.scan_existing)
 
+    def test_from_args_batch_mode(self):
+        """Test Config.from_args enables batch mode"""
+        args = Namespace(
+            api_key="explicit_api_key",
+            scan_existing=True,
+            batch=True,
+            env_file=None,
+        )
+        config = Config.from_args(args)
+        self.assertTrue(config.batch_mode)
+
+    def test_from_args_concurrency(self):
+        """Test Config.from_args reads and validates the segment concurrency"""
+        args = Namespace(api_key="explicit_api_key", env_file=None)
+        self.assertEqual(
+            Config.from_args(args).max_concurrency, MAX_CONCURRENT_SEGMENTS
+        )
+
+        args.concurrency = 8
+        self.assertEqual(Config.from_args(args).max_concurrency, 8)
+
+        args.concurrency = 0
+        with self.assertRaises(ValueError):
+            Config.from_args(args)
+
     def test_get_db_path_explicit(self):
         """Test get_db_path with explicit path"""
         config = Config(api_key="test", db_path=Path("/explicit/db.json"))
@@ -91,6 +117,13 @@ class TestConfig(unittest.TestCase):
         config = Config(api_key="test")
         self.assertEqual(config.get_db_path(), Path(".transcription_db.json"))
 
+    def test_get_cache_path(self):
+        """Test get_cache_path is placed next to the database"""
+        config = Config(api_key="test", db_path=Path("/explicit/db.json"))
+        self.assertEqual(
+            config.get_cache_path(), Path("/explicit/.transcription_cache.sqlite")
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,17 @@
 """Tests for processed files database"""
 
+import hashlib
+import os
 import unittest
 import json
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
 from src.obsidian.database import ProcessedFilesDatabase
+from src.obsidian import storage
+from src.obsidian.storage import JsonStorage, SqliteStorage
 
 
 class TestProcessedFilesDatabase(unittest.TestCase):
@@ -74,6 +79,254 @@ class TestProcessedFilesDatabase(unittest.TestCase):
             saved_data = json.load(f)
         self.assertIn("last_updated", saved_data)
         self.assertEqual(saved_data["files"]["/test/file.mp3"]["hash"], "test_hash")
+        self.assertEqual(list(Path(self.temp_dir).iterdir()), [self.db_path])
+
+    def test_save_failure_keeps_previous_file(self):
+        """Test a failed save leaves the existing database intact"""
+        db = ProcessedFilesDatabase(self.db_path)
+        db.data["files"]["/test/file.mp3"] = {"hash": "old_hash"}
+        db.save()
+
+        db.data["files"]["/test/file.mp3"] = {"hash": "new_hash"}
+        with patch("src.obsidian.storage.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                db.save()
+
+        with open(self.db_path, "r") as f:
+            saved_data = json.load(f)
+        self.assertEqual(saved_data["files"]["/test/file.mp3"]["hash"], "old_hash")
+
+    def test_mutations_append_to_journal(self):
+        """Test mutations are journaled and replayed until compaction"""
+        journal_path = self.db_path.with_suffix(".jsonl")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.save()
+        snapshot = self.db_path.read_bytes()
+
+        with patch.object(db, "get_file_hash", return_value="blake2b:abc"):
+            db.add_processed_file(Path("/test/a.mp3"), Path("/test/a.md"))
+            db.add_failed_file(Path("/test/b.mp3"), "error")
+        db.remove_processed_file(Path("/test/a.mp3"))
+
+        self.assertEqual(self.db_path.read_bytes(), snapshot)
+        self.assertTrue(journal_path.exists())
+
+        # A partial line left by a crash is skipped on replay
+        with open(journal_path, "ab") as f:
+            f.write(b'{"op": "upsert", "pa')
+        reloaded = ProcessedFilesDatabase(self.db_path)
+        self.assertEqual(list(reloaded.data["files"]), [str(Path("/test/b.mp3"))])
+        self.assertEqual(reloaded.data["statistics"]["total_failed"], 1)
+
+        # The damaged journal is folded into the snapshot on load, so new
+        # records are not appended after the partial line
+        self.assertFalse(journal_path.exists())
+        reloaded.add_failed_file(Path("/test/c.mp3"), "error")
+        self.assertIn(
+            str(Path("/test/c.mp3")), ProcessedFilesDatabase(self.db_path).data["files"]
+        )
+
+        reloaded.close()
+        self.assertFalse(journal_path.exists())
+        with open(self.db_path, "r") as f:
+            saved_data = json.load(f)
+        self.assertEqual(
+            list(saved_data["files"]),
+            [str(Path("/test/b.mp3")), str(Path("/test/c.mp3"))],
+        )
+
+    def test_journal_compacted_on_startup(self):
+        """Test a journal left by a killed process is folded in on load"""
+        journal_path = self.db_path.with_suffix(".jsonl")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.save()
+        db.add_failed_file(Path("/test/a.mp3"), "error")
+        self.assertTrue(journal_path.exists())
+
+        # No close(): the process was stopped by a signal
+        reloaded = ProcessedFilesDatabase(self.db_path)
+
+        self.assertFalse(journal_path.exists())
+        with open(self.db_path, "r") as f:
+            saved_data = json.load(f)
+        self.assertIn(str(Path("/test/a.mp3")), saved_data["files"])
+        self.assertIn(str(Path("/test/a.mp3")), reloaded.data["files"])
+
+    def test_corrupt_snapshot_rewritten_on_next_save(self):
+        """Test files recorded after a corrupt snapshot survive a restart"""
+        self.db_path.write_text("{not json", encoding="utf-8")
+
+        db = ProcessedFilesDatabase(self.db_path)
+        self.assertEqual(db.data["files"], {})
+        db.add_failed_file(Path("/test/a.mp3"), "error")
+
+        reloaded = ProcessedFilesDatabase(self.db_path)
+        self.assertEqual(list(reloaded.data["files"]), [str(Path("/test/a.mp3"))])
+
+    @patch("src.obsidian.storage.JOURNAL_COMPACT_THRESHOLD", 0)
+    def test_journal_compacted_when_large(self):
+        """Test the journal is merged into the snapshot past the threshold"""
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_failed_file(Path("/test/a.mp3"), "error")
+
+        self.assertFalse(self.db_path.with_suffix(".jsonl").exists())
+        with open(self.db_path, "r") as f:
+            saved_data = json.load(f)
+        self.assertIn(str(Path("/test/a.mp3")), saved_data["files"])
+
+    def test_get_file_hash(self):
+        """Test file hashes are prefixed with the algorithm"""
+        audio_file = Path(self.temp_dir) / "audio.mp3"
+        audio_file.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+
+        expected = hashlib.blake2b(b"audio data").hexdigest()
+        self.assertEqual(db.get_file_hash(audio_file), f"blake2b:{expected}")
+        self.assertEqual(
+            db.get_file_hash(audio_file, "md5"), hashlib.md5(b"audio data").hexdigest()
+        )
+
+    def test_batch_hash(self):
+        """Test batch_hash matches get_file_hash and skips unreadable files"""
+        paths = []
+        for i in range(5):
+            path = Path(self.temp_dir) / f"audio{i}.mp3"
+            path.write_bytes(f"audio data {i}".encode())
+            paths.append(path)
+        missing = Path(self.temp_dir) / "missing.mp3"
+        db = ProcessedFilesDatabase(self.db_path)
+
+        hashes = db.batch_hash(paths + [missing], max_workers=3)
+
+        self.assertEqual(
+            hashes, {str(path.resolve()): db.get_file_hash(path) for path in paths}
+        )
+
+    def test_is_processed_legacy_md5_hash(self):
+        """Test entries hashed with MD5 by older versions are still recognized"""
+        audio_file = Path(self.temp_dir) / "audio.mp3"
+        audio_file.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.data["files"][str(audio_file)] = {
+            "hash": hashlib.md5(b"audio data").hexdigest(),
+            "status": "completed",
+        }
+
+        self.assertTrue(db.is_processed(audio_file))
+        audio_file.write_bytes(b"changed")
+        self.assertFalse(db.is_processed(audio_file))
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_is_processed_uses_stat_fingerprint(self, mock_save):
+        """Test unchanged files are recognized without re-hashing"""
+        audio_file = Path(self.temp_dir) / "audio.mp3"
+        audio_file.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_processed_file(audio_file, Path(self.temp_dir) / "audio.md")
+
+        entry = db.get_processed_info(audio_file)
+        self.assertEqual(entry["size"], len(b"audio data"))
+        self.assertEqual(entry["mtime_ns"], audio_file.stat().st_mtime_ns)
+
+        with patch.object(db, "get_file_hash") as mock_hash:
+            self.assertTrue(db.is_processed(audio_file))
+            mock_hash.assert_not_called()
+
+        # A touched file falls back to comparing content hashes
+        stat = audio_file.stat()
+        os.utime(audio_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with patch.object(db, "get_file_hash", wraps=db.get_file_hash) as mock_hash:
+            self.assertTrue(db.is_processed(audio_file))
+            mock_hash.assert_called_once()
+
+        # Its new fingerprint is recorded, so the next check skips the hash
+        with patch.object(db, "get_file_hash") as mock_hash:
+            self.assertTrue(db.is_processed(audio_file))
+            mock_hash.assert_not_called()
+
+        # A file whose size changed is known to differ without hashing
+        audio_file.write_bytes(b"longer audio data")
+        with patch.object(db, "get_file_hash") as mock_hash:
+            self.assertFalse(db.is_processed(audio_file))
+            mock_hash.assert_not_called()
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_is_processed_batch(self, mock_save):
+        """Test batch checks match is_processed and hash only changed files"""
+        paths = []
+        for i in range(4):
+            path = Path(self.temp_dir) / f"audio{i}.mp3"
+            path.write_bytes(f"audio data {i}".encode())
+            paths.append(path)
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_processed_file(paths[0], Path(self.temp_dir) / "audio0.md")
+        db.add_processed_file(paths[1], Path(self.temp_dir) / "audio1.md")
+        db.add_failed_file(paths[2], "error")
+        stat = paths[1].stat()
+        os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with (
+            patch.object(db, "get_file_hash", wraps=db.get_file_hash) as mock_hash,
+            patch.object(db, "batch_hash", wraps=db.batch_hash) as mock_batch_hash,
+        ):
+            results = db.is_processed_batch(paths, max_workers=2)
+
+        self.assertEqual(results, [True, True, False, False])
+        # The touched file is confirmed by content, and the unknown one is
+        # hashed to look for a moved entry, each read once in a single batch
+        mock_batch_hash.assert_called_once()
+        self.assertEqual(
+            sorted(call.args[0].name for call in mock_hash.call_args_list),
+            ["audio1.mp3", "audio3.mp3"],
+        )
+        self.assertEqual(results, [db.is_processed(path) for path in paths])
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_paths_are_canonicalized(self, mock_save):
+        """Test equivalent spellings of a path share one entry"""
+        audio_file = Path(self.temp_dir) / "audio.mp3"
+        audio_file.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_processed_file(audio_file, Path(self.temp_dir) / "audio.md")
+
+        alias = Path(self.temp_dir) / "sub" / ".." / "audio.mp3"
+        self.assertTrue(db.is_processed(alias))
+        self.assertIsNotNone(db.get_processed_info(alias))
+        self.assertEqual(list(db.data["files"]), [str(audio_file.resolve())])
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_is_processed_moved_file(self, mock_save):
+        """Test a moved file is recognized by content and its entry follows it"""
+        old_path = Path(self.temp_dir) / "audio.mp3"
+        old_path.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_processed_file(old_path, Path(self.temp_dir) / "audio.md")
+
+        new_path = Path(self.temp_dir) / "moved.mp3"
+        old_path.rename(new_path)
+
+        self.assertTrue(db.is_processed(new_path))
+        self.assertIsNone(db.get_processed_info(old_path))
+        self.assertEqual(db.get_processed_info(new_path)["status"], "completed")
+
+        other = Path(self.temp_dir) / "other.mp3"
+        other.write_bytes(b"other data")
+        self.assertFalse(db.is_processed(other))
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_is_processed_copied_file(self, mock_save):
+        """Test a copy of a processed file is processed on its own"""
+        original = Path(self.temp_dir) / "audio.mp3"
+        original.write_bytes(b"audio data")
+        db = ProcessedFilesDatabase(self.db_path)
+        db.add_processed_file(original, Path(self.temp_dir) / "audio.md")
+
+        copy = Path(self.temp_dir) / "copy.mp3"
+        copy.write_bytes(b"audio data")
+
+        self.assertFalse(db.is_processed(copy))
+        self.assertTrue(db.is_processed(original))
+        self.assertIsNone(db.get_processed_info(copy))
 
     @patch("src.obsidian.database.ProcessedFilesDatabase.get_file_hash")
     def test_is_processed_true(self, mock_hash):
@@ -153,6 +406,179 @@ class TestProcessedFilesDatabase(unittest.TestCase):
         self.assertNotIn(str(test_file), db.data["files"])
         mock_save.assert_called_once()
 
+    @patch("src.obsidian.database.ProcessedFilesDatabase.get_file_hash")
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_batched_saves_once(self, mock_save, mock_hash):
+        """Test mutations inside batched() are saved once on exit"""
+        mock_hash.return_value = "test_hash"
+
+        db = ProcessedFilesDatabase(self.db_path)
+        with db.batched():
+            for i in range(3):
+                db.add_processed_file(
+                    Path(f"/test/audio{i}.mp3"), Path(f"/test/audio{i}.md")
+                )
+            with db.batched():
+                db.remove_processed_file(Path("/test/audio0.mp3"))
+            mock_save.assert_not_called()
+
+        mock_save.assert_called_once()
+        self.assertEqual(len(db.data["files"]), 2)
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_batched_without_changes_does_not_save(self, mock_save):
+        """Test batched() skips saving when nothing changed"""
+        db = ProcessedFilesDatabase(self.db_path)
+        with db.batched():
+            pass
+        mock_save.assert_not_called()
+
+    @patch("src.obsidian.database.ProcessedFilesDatabase.get_file_hash")
+    @patch("src.obsidian.database.ProcessedFilesDatabase.save")
+    def test_status_counts_follow_mutations(self, mock_save, mock_hash):
+        """Test get_summary status counts track adds, failures and removals"""
+        mock_hash.return_value = "test_hash"
+        db = ProcessedFilesDatabase(self.db_path)
+        first = Path("/test/first.mp3")
+        second = Path("/test/second.mp3")
+
+        db.add_processed_file(first, Path("/test/first.md"))
+        db.add_failed_file(second, "error")
+        breakdown = db.get_summary()["status_breakdown"]
+        self.assertEqual(breakdown["completed"], 1)
+        self.assertEqual(breakdown["failed"], 1)
+
+        db.add_processed_file(second, Path("/test/second.md"))
+        db.remove_processed_file(first)
+        breakdown = db.get_summary()["status_breakdown"]
+        self.assertEqual(breakdown["completed"], 1)
+        self.assertEqual(breakdown["failed"], 0)
+
+    def test_status_counts_backfilled_on_load(self):
+        """Test databases without status counts are backfilled on load"""
+        test_data = {
+            "version": "1.0.0",
+            "statistics": {},
+            "files": {
+                "/test/a.mp3": {"status": "completed"},
+                "/test/b.mp3": {"status": "completed"},
+                "/test/c.mp3": {"status": "failed"},
+            },
+        }
+        with open(self.db_path, "w") as f:
+            json.dump(test_data, f)
+
+        db = ProcessedFilesDatabase(self.db_path)
+        breakdown = db.get_summary()["status_breakdown"]
+        self.assertEqual(breakdown["completed"], 2)
+        self.assertEqual(breakdown["failed"], 1)
+        self.assertEqual(breakdown["pending"], 0)
+
+    def test_concurrent_mutations(self):
+        """Test mutations from several threads are all recorded"""
+        db = ProcessedFilesDatabase(self.db_path)
+        audio_files = []
+        for i in range(20):
+            audio_file = Path(self.temp_dir) / f"audio{i}.mp3"
+            audio_file.write_bytes(f"audio {i}".encode())
+            audio_files.append(audio_file)
+
+        def record(audio_file):
+            db.add_processed_file(audio_file, audio_file.with_suffix(".md"))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(record, audio_files))
+
+        self.assertEqual(db.get_statistics()["total_processed"], 20)
+        self.assertEqual(db.get_summary()["status_breakdown"]["completed"], 20)
+        reloaded = ProcessedFilesDatabase(self.db_path)
+        self.assertEqual(len(reloaded.data["files"]), 20)
+
+    @unittest.skipIf(storage.ijson is None, "ijson is not installed")
+    def test_load_large_database_streaming(self):
+        """Test databases above the threshold are parsed incrementally"""
+        db = ProcessedFilesDatabase(self.db_path)
+        db.data["files"]["/test/file.mp3"] = {
+            "hash": "test_hash",
+            "status": "completed",
+            "metadata": {"duration_seconds": 12.5},
+        }
+        db.save()
+
+        load_streaming = JsonStorage._load_streaming
+        with (
+            patch("src.obsidian.storage.STREAMING_LOAD_THRESHOLD", 0),
+            patch.object(
+                JsonStorage,
+                "_load_streaming",
+                autospec=True,
+                side_effect=load_streaming,
+            ) as mock_streaming,
+        ):
+            reloaded = ProcessedFilesDatabase(self.db_path)
+
+        mock_streaming.assert_called_once()
+        self.assertEqual(reloaded.data, db.data)
+
+
+class TestSqliteDatabase(unittest.TestCase):
+    """Test cases for ProcessedFilesDatabase backed by SQLite"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "test_db.sqlite"
+        self.audio_files = []
+        for i in range(3):
+            audio_file = Path(self.temp_dir) / f"audio{i}.mp3"
+            audio_file.write_bytes(f"audio {i}".encode())
+            self.audio_files.append(audio_file)
+
+    def test_storage_selected_by_suffix(self):
+        """Test .sqlite paths use SQLite storage and others use JSON"""
+        db = ProcessedFilesDatabase(self.db_path)
+        self.assertIsInstance(db._storage, SqliteStorage)
+        db.close()
+
+        json_db = ProcessedFilesDatabase(Path(self.temp_dir) / "db.json")
+        self.assertIsInstance(json_db._storage, JsonStorage)
+
+    def test_round_trip(self):
+        """Test entries, statistics and counts survive a reload"""
+        db = ProcessedFilesDatabase(self.db_path)
+        for audio_file in self.audio_files:
+            db.add_processed_file(
+                audio_file, audio_file.with_suffix(".md"), duration_seconds=60
+            )
+        db.add_failed_file(self.audio_files[2], "error")
+        db.remove_processed_file(self.audio_files[0])
+        db.close()
+
+        reloaded = ProcessedFilesDatabase(self.db_path)
+        self.assertIsNone(reloaded.get_processed_info(self.audio_files[0]))
+        self.assertTrue(reloaded.is_processed(self.audio_files[1]))
+        self.assertEqual(
+            reloaded.get_processed_info(self.audio_files[2])["status"], "failed"
+        )
+        breakdown = reloaded.get_summary()["status_breakdown"]
+        self.assertEqual(breakdown["completed"], 1)
+        self.assertEqual(breakdown["failed"], 1)
+        self.assertEqual(reloaded.get_statistics()["total_processed"], 1)
+        reloaded.close()
+
+    def test_save_writes_only_changed_entries(self):
+        """Test mutations pass only their own keys to the storage backend"""
+        db = ProcessedFilesDatabase(self.db_path)
+        with db.batched():
+            db.add_processed_file(self.audio_files[0], Path("/test/a.md"))
+            db.add_processed_file(self.audio_files[1], Path("/test/b.md"))
+
+        with patch.object(db._storage, "save", wraps=db._storage.save) as mock_save:
+            db.add_processed_file(self.audio_files[2], Path("/test/c.md"))
+            _, changed_keys = mock_save.call_args[0]
+            self.assertEqual(changed_keys, {str(self.audio_files[2].resolve())})
+        db.close()
+
 
 if __name__ == "__main__":
     unittest.main()
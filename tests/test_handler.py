@@ -0,0 +1,105 @@
+"""Tests for the Obsidian transcription handler"""
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.api.client import BatchInterruptedError
+from src.obsidian.handler import ObsidianTranscriptionHandler
+from src.utils.system import hash_file
+
+
+@patch("src.obsidian.handler.TranscriptionService")
+class TestProcessAudioFile(unittest.TestCase):
+    """Test cases for processing a single audio file"""
+
+    def setUp(self):
+        """Create a vault with one unprocessed audio file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.vault_path = Path(self.temp_dir.name)
+        self.audio_path = self.vault_path / "memo.mp3"
+        self.audio_path.write_bytes(b"audio")
+
+    @patch("src.obsidian.handler.probe_audio", return_value=(60.0, 5))
+    def test_file_is_hashed_once(self, mock_probe, mock_service):
+        """Test the digest is shared by transcription and the database entry"""
+        handler = ObsidianTranscriptionHandler(
+            "key", self.vault_path, self.vault_path / "db.json", create_summary=False
+        )
+        self.addCleanup(handler.close)
+        # A completed entry for other content, so the moved-file lookup runs
+        other_path = self.vault_path / "other.mp3"
+        other_path.write_bytes(b"other audio")
+        handler.database.add_processed_file(other_path, self.vault_path / "other.md")
+        service = handler.transcription_service
+        service.transcribe_file.return_value = "文字起こし"
+
+        with (
+            patch("src.obsidian.handler.hash_file", wraps=hash_file) as mock_hash,
+            patch.object(handler.database, "get_file_hash") as mock_db_hash,
+        ):
+            self.assertTrue(handler.process_audio_file(self.audio_path))
+
+        mock_hash.assert_called_once_with(self.audio_path)
+        mock_db_hash.assert_not_called()
+        self.assertEqual(
+            service.transcribe_file.call_args.kwargs["file_hash"],
+            hash_file(self.audio_path),
+        )
+        self.assertTrue(handler.database.is_processed(self.audio_path))
+
+    def test_unchanged_file_is_not_read(self, mock_service):
+        """Test a processed, untouched file is skipped without hashing"""
+        handler = ObsidianTranscriptionHandler(
+            "key", self.vault_path, self.vault_path / "db.json", create_summary=False
+        )
+        self.addCleanup(handler.close)
+        handler.database.add_processed_file(self.audio_path, self.vault_path / "a.md")
+
+        with patch("src.obsidian.handler.hash_file") as mock_hash:
+            self.assertTrue(handler.process_audio_file(self.audio_path))
+
+        mock_hash.assert_not_called()
+        handler.transcription_service.transcribe_file.assert_not_called()
+
+
+@patch("src.obsidian.handler.TranscriptionService")
+class TestBatchScan(unittest.TestCase):
+    """Test cases for the background Batch API scan"""
+
+    def setUp(self):
+        """Create a vault with one unprocessed audio file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.vault_path = Path(self.temp_dir.name)
+        self.audio_path = self.vault_path / "memo.mp3"
+        self.audio_path.write_bytes(b"audio")
+
+    def test_close_stops_running_scan(self, mock_service):
+        """Test close() stops waiting for the job and returns promptly"""
+        handler = ObsidianTranscriptionHandler(
+            "key", self.vault_path, self.vault_path / "db.json"
+        )
+        submitted = threading.Event()
+
+        def transcribe_files_batch(paths, stop_event=None):
+            submitted.set()
+            stop_event.wait()
+            raise BatchInterruptedError("stopped")
+
+        service = handler.transcription_service
+        service.transcribe_files_batch.side_effect = transcribe_files_batch
+
+        thread = handler.start_batch_scan([self.audio_path])
+        self.assertTrue(submitted.wait(5))
+        handler.close()
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(handler.database.is_processed(self.audio_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Tests for Obsidian note generation"""
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.obsidian.note import NoteGenerator
+
+
+class TestNoteGenerator(unittest.TestCase):
+    """Test cases for NoteGenerator"""
+
+    def setUp(self):
+        """Create a vault containing a 75 second audio file"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.vault = Path(self.temp_dir.name)
+        self.audio_path = self.vault / "recordings" / "meeting.wav"
+        self.audio_path.parent.mkdir()
+        sf.write(str(self.audio_path), np.zeros(16000 * 75, dtype=np.float32), 16000)
+        self.generator = NoteGenerator(self.vault)
+
+        patcher = patch("src.obsidian.note.datetime")
+        mock_datetime = patcher.start()
+        mock_datetime.now.return_value = datetime(2024, 5, 6, 7, 8, 9)
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove the temporary vault"""
+        self.temp_dir.cleanup()
+
+    def test_create_transcription_note(self):
+        """Test transcription note front matter and metadata"""
+        parts = self.generator.create_transcription_note(
+            self.audio_path, "こんにちは {not a field}"
+        )
+        content = "".join(parts)
+
+        self.assertTrue(
+            content.startswith("---\ntags: ['音声文字起こし', '自動生成']\n")
+        )
+        self.assertIn("created: 2024-05-06 07:08:09\n", content)
+        self.assertIn("source: recordings/meeting.wav\n", content)
+        self.assertIn("duration: 1分15秒\n", content)
+        self.assertIn("# meeting - 文字起こし\n", content)
+        self.assertIn("- **文字起こし日時**: 2024年05月06日 07:08:09\n", content)
+        self.assertIn("\nこんにちは {not a field}\n", content)
+        self.assertEqual(parts[1], "こんにちは {not a field}")
+
+    def test_create_summary_note(self):
+        """Test summary note links back to the transcription"""
+        content = "".join(
+            self.generator.create_summary_note(self.audio_path, "あ" * 1234, "要約")
+        )
+
+        self.assertIn("transcription_length: 1234文字\n", content)
+        self.assertIn("- **文字数**: 1,234文字\n", content)
+        self.assertIn("- [[meeting_文字起こし|完全な文字起こしを見る]]\n", content)
+
+    @patch("src.obsidian.note.probe_audio")
+    @patch("src.obsidian.note.get_audio_duration")
+    def test_known_metadata_skips_probe(self, mock_duration, mock_probe):
+        """Test metadata passed by the caller is used without probing"""
+        content = "".join(
+            self.generator.create_transcription_note(
+                self.audio_path, "text", duration=3661, file_size_bytes=3 * 1024 * 1024
+            )
+        )
+        self.assertIn("duration: 1時間1分1秒\n", content)
+        self.assertIn("file_size: 3.00 MB\n", content)
+
+        content = "".join(
+            self.generator.create_summary_note(
+                self.audio_path, "text", "summary", duration=90
+            )
+        )
+        self.assertIn("duration: 1分30秒\n", content)
+
+        mock_probe.assert_not_called()
+        mock_duration.assert_not_called()
+
+    def test_missing_audio_metadata(self):
+        """Test notes are still created when the audio cannot be probed"""
+        content = "".join(
+            self.generator.create_transcription_note(self.vault / "missing.mp3", "text")
+        )
+
+        self.assertIn("duration: 不明\n", content)
+        self.assertIn("file_size: 0.00 MB\n", content)
+
+    def test_save_note(self):
+        """Test note parts are written in order, replacing any existing note"""
+        note_path = self.vault / "notes" / "meeting_文字起こし.md"
+        self.generator.save_note("old", note_path)
+        self.generator.save_note(("header\n", "本文" * 10000, "\nfooter"), note_path)
+
+        self.assertEqual(
+            note_path.read_text(encoding="utf-8"),
+            "header\n" + "本文" * 10000 + "\nfooter",
+        )
+        self.assertEqual(list(note_path.parent.iterdir()), [note_path])
+
+    def test_save_note_failure_keeps_previous_note(self):
+        """Test a failed save leaves the existing note and no temporary file"""
+        note_path = self.vault / "meeting_文字起こし.md"
+        self.generator.save_note("old", note_path)
+
+        with patch("src.obsidian.note.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.generator.save_note("new", note_path)
+
+        self.assertEqual(note_path.read_text(encoding="utf-8"), "old")
+        self.assertEqual(
+            sorted(p.name for p in self.vault.iterdir()),
+            ["meeting_文字起こし.md", "recordings"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
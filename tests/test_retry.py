@@ -0,0 +1,114 @@
+"""Tests for API retry logic"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from src.api.retry import (
+    RetryableError,
+    get_backoff_wait_time,
+    get_retry_after,
+    is_retryable_error,
+    retry_with_backoff_async,
+)
+from src.constants import MAX_RETRY_WAIT, RETRY_BACKOFF_BASE, RETRY_JITTER_FACTOR
+
+
+class TestRetry(unittest.TestCase):
+    """Test cases for retry helpers"""
+
+    @patch("src.api.retry.random.uniform", side_effect=lambda low, high: 1.0)
+    def test_get_backoff_wait_time(self, mock_uniform):
+        """Test exponential backoff is capped at MAX_RETRY_WAIT"""
+        self.assertEqual(get_backoff_wait_time(1), RETRY_BACKOFF_BASE)
+        self.assertEqual(get_backoff_wait_time(2), RETRY_BACKOFF_BASE * 2)
+        self.assertEqual(get_backoff_wait_time(20), MAX_RETRY_WAIT)
+        mock_uniform.assert_called_with(
+            1 - RETRY_JITTER_FACTOR, 1 + RETRY_JITTER_FACTOR
+        )
+
+    def test_get_backoff_wait_time_jitter(self):
+        """Test backoff stays within the jitter range"""
+        for _ in range(100):
+            wait_time = get_backoff_wait_time(1)
+            self.assertGreaterEqual(
+                wait_time, RETRY_BACKOFF_BASE * (1 - RETRY_JITTER_FACTOR)
+            )
+            self.assertLessEqual(
+                wait_time, RETRY_BACKOFF_BASE * (1 + RETRY_JITTER_FACTOR)
+            )
+
+    def test_get_backoff_wait_time_retry_after(self):
+        """Test server-provided delay takes precedence over backoff"""
+        self.assertEqual(get_backoff_wait_time(3, retry_after=7.0), 7.0)
+        self.assertEqual(
+            get_backoff_wait_time(1, retry_after=MAX_RETRY_WAIT * 10), MAX_RETRY_WAIT
+        )
+
+    def test_get_retry_after(self):
+        """Test retry delay extraction from errors"""
+        error = Exception("429")
+        error.retry_after = 5
+        self.assertEqual(get_retry_after(error), 5.0)
+
+        response = httpx.Response(429, headers={"Retry-After": "12"})
+        error = Exception("429")
+        error.response = response
+        self.assertEqual(get_retry_after(error), 12.0)
+
+        error = Exception("429 RESOURCE_EXHAUSTED")
+        error.details = {
+            "error": {
+                "details": [
+                    {
+                        "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                        "retryDelay": "17s",
+                    }
+                ]
+            }
+        }
+        self.assertEqual(get_retry_after(error), 17.0)
+
+        self.assertIsNone(get_retry_after(Exception("503")))
+
+    def test_is_retryable_error(self):
+        """Test retryable error classification"""
+        self.assertTrue(is_retryable_error(RetryableError("anything")))
+        self.assertTrue(is_retryable_error(httpx.ReadTimeout("timed out")))
+        self.assertTrue(is_retryable_error(Exception("503 Service Unavailable")))
+        self.assertTrue(is_retryable_error(Exception("RATE LIMIT exceeded")))
+        self.assertFalse(is_retryable_error(ValueError("invalid argument")))
+
+    @patch("src.api.retry.asyncio.sleep")
+    def test_retry_async_retries_retryable_error(self, mock_sleep):
+        """Test async retry succeeds after a retryable error"""
+        calls = []
+
+        async def func():
+            calls.append(1)
+            if len(calls) < 2:
+                raise RetryableError("API returned empty response")
+            return "ok"
+
+        result = asyncio.run(retry_with_backoff_async(func, max_retries=3))
+        self.assertEqual(result, "ok")
+        self.assertEqual(len(calls), 2)
+        mock_sleep.assert_called_once()
+
+    def test_retry_async_raises_non_retryable_error(self):
+        """Test async retry does not retry non-retryable errors"""
+        calls = []
+
+        async def func():
+            calls.append(1)
+            raise ValueError("invalid argument")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(retry_with_backoff_async(func, max_retries=3))
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
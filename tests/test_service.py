@@ -0,0 +1,270 @@
+"""Tests for the transcription service"""
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.transcription.service import TranscriptionService, _segment_parent_dir
+
+
+class FakeClient:
+    """Client stub whose segment transcriptions finish in reverse order"""
+
+    def __init__(self, *args, **kwargs):
+        """Record the order in which segments finish"""
+        self.transcribed = []
+
+    def transcribe_audio(self, audio_path, file_hash=None):
+        """Return a fixed transcription for a whole file"""
+        return f"direct {audio_path.name}"
+
+    def start_segment_task(self, start, end, segment_path, semaphore):
+        """Schedule one segment; later segments finish first, fail.wav raises"""
+        index = int(start // 600)
+
+        async def transcribe():
+            async with semaphore:
+                await asyncio.sleep(0.01 * (3 - index))
+            self.transcribed.append(index)
+            if segment_path.name == "fail.wav":
+                raise RuntimeError("API error")
+            return f"text {index}"
+
+        return asyncio.ensure_future(transcribe())
+
+
+@patch("src.transcription.service.VADProcessor")
+@patch("src.transcription.service.GeminiClient", FakeClient)
+class TestTranscribeFileIter(unittest.TestCase):
+    """Test cases for TranscriptionService.transcribe_file_iter"""
+
+    def setUp(self):
+        """Create the source audio path in a temporary directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.audio_path = Path(self.temp_dir.name) / "long.mp3"
+        self.audio_path.touch()
+        self.segments = []
+
+    def iter_segments(self, audio_path, output_dir=None):
+        """Write three segment files to output_dir, yielding each in turn"""
+        for i, name in enumerate(["a.wav", "fail.wav", "c.wav"]):
+            path = output_dir / name
+            path.touch()
+            self.segments.append((i * 600.0, (i + 1) * 600.0, path))
+            yield self.segments[-1]
+
+    def assertSegmentsRemoved(self):
+        """Assert the segment files and their directory are gone"""
+        self.assertTrue(self.segments)
+        self.assertFalse(self.segments[0][2].parent.exists())
+        self.assertTrue(self.audio_path.exists())
+
+    @patch("src.transcription.service.get_audio_duration", return_value=1800)
+    def test_yields_segments_in_order(self, mock_duration, mock_vad):
+        """Test segments are yielded in order and temp files are removed"""
+        service = TranscriptionService("key")
+        service.vad_processor.iter_segments.side_effect = self.iter_segments
+
+        texts = list(service.transcribe_file_iter(self.audio_path))
+
+        self.assertEqual(
+            texts,
+            [
+                "text 0",
+                "[セグメント 2 の文字起こしに失敗: RuntimeError]",
+                "text 2",
+            ],
+        )
+        self.assertEqual(service.client.transcribed, [2, 1, 0])
+        self.assertSegmentsRemoved()
+
+    @patch("src.transcription.service.get_audio_duration", return_value=1800)
+    def test_transcribe_file_matches_iter(self, mock_duration, mock_vad):
+        """Test transcribe_file joins the same per-segment texts"""
+        service = TranscriptionService("key")
+        service.vad_processor.iter_segments.side_effect = self.iter_segments
+
+        self.assertEqual(
+            service.transcribe_file(self.audio_path),
+            "text 0\n\n[セグメント 2 の文字起こしに失敗: RuntimeError]\n\ntext 2",
+        )
+        self.assertSegmentsRemoved()
+
+    @patch("src.transcription.service.get_audio_duration", return_value=1800)
+    def test_split_failure_cancels_started_segments(self, mock_duration, mock_vad):
+        """Test segments already sent are cancelled when splitting fails"""
+
+        def iter_segments(audio_path, output_dir=None):
+            yield next(self.iter_segments(audio_path, output_dir))
+            raise RuntimeError("ffmpeg failed")
+
+        service = TranscriptionService("key")
+        service.vad_processor.iter_segments.side_effect = iter_segments
+
+        with self.assertRaises(RuntimeError):
+            service.transcribe_file(self.audio_path)
+
+        self.assertEqual(service.client.transcribed, [])
+        self.assertSegmentsRemoved()
+
+    @patch("src.transcription.service.get_audio_duration", return_value=60)
+    def test_short_file_is_transcribed_directly(self, mock_duration, mock_vad):
+        """Test files under the threshold yield a single direct transcription"""
+        service = TranscriptionService("key")
+
+        texts = list(service.transcribe_file_iter(self.audio_path))
+
+        self.assertEqual(texts, ["direct long.mp3"])
+        service.vad_processor.iter_segments.assert_not_called()
+
+    @patch("src.transcription.service.get_audio_duration")
+    def test_no_vad_skips_duration_probe(self, mock_duration, mock_vad):
+        """Test files are sent whole without probing when VAD is disabled"""
+        service = TranscriptionService("key")
+
+        self.assertEqual(
+            service.transcribe_file(self.audio_path, use_vad=False), "direct long.mp3"
+        )
+        mock_duration.assert_not_called()
+        service.vad_processor.iter_segments.assert_not_called()
+
+
+@patch("src.transcription.service.os.access", return_value=True)
+@patch("src.transcription.service.shutil.disk_usage")
+class TestSegmentParentDir(unittest.TestCase):
+    """Test cases for choosing where segment files are written"""
+
+    def test_ram_dir_with_room(self, mock_usage, mock_access):
+        """Test segments go to the RAM directory when they fit twice over"""
+        # 600 seconds of 16 kHz 16-bit mono is 19.2 MB
+        mock_usage.return_value.free = 40_000_000
+        self.assertEqual(_segment_parent_dir(600), "/dev/shm")
+
+    def test_disk_when_ram_dir_is_small(self, mock_usage, mock_access):
+        """Test a small RAM directory, such as a container's, is not used"""
+        mock_usage.return_value.free = 64 * 1024 * 1024
+        self.assertIsNone(_segment_parent_dir(3600))
+
+    def test_disk_without_ram_dir(self, mock_usage, mock_access):
+        """Test platforms without the RAM directory use the temp directory"""
+        mock_usage.side_effect = FileNotFoundError
+        self.assertIsNone(_segment_parent_dir(600))
+        self.assertIsNone(_segment_parent_dir(None))
+
+
+@patch("src.transcription.service.VADProcessor")
+@patch("src.transcription.service.GeminiClient")
+class TestGenerateSummary(unittest.TestCase):
+    """Test cases for TranscriptionService.generate_summary"""
+
+    @patch("src.transcription.service.MAX_TRANSCRIPTION_PREVIEW_LENGTH", 20)
+    def test_short_transcription_passed_unchanged(self, mock_client, mock_vad):
+        """Test a transcription within the limit is summarized as is"""
+        service = TranscriptionService("key")
+        transcription = "短い文字起こし。"
+
+        service.generate_summary(transcription)
+
+        self.assertIs(service.client.summarize_text.call_args.args[0], transcription)
+
+    @patch("src.transcription.service.MAX_TRANSCRIPTION_PREVIEW_LENGTH", 20)
+    def test_long_transcription_cut_at_sentence(self, mock_client, mock_vad):
+        """Test a long transcription is cut after the last full sentence"""
+        service = TranscriptionService("key")
+
+        service.generate_summary("一二三四五六七八九十。一二三四五六七八九十。")
+
+        self.assertEqual(
+            service.client.summarize_text.call_args.args[0],
+            "一二三四五六七八九十。\n\n[文字起こしの続きは省略されています...]",
+        )
+
+    @patch("src.transcription.service.MAX_TRANSCRIPTION_PREVIEW_LENGTH", 20)
+    def test_long_transcription_without_breaks(self, mock_client, mock_vad):
+        """Test text without sentence breaks is cut at the limit"""
+        service = TranscriptionService("key")
+
+        service.generate_summary("あ" * 30)
+
+        self.assertEqual(
+            service.client.summarize_text.call_args.args[0],
+            "あ" * 20 + "\n\n[文字起こしの続きは省略されています...]",
+        )
+
+
+@patch("src.transcription.service.VADProcessor")
+@patch("src.transcription.service.GeminiClient")
+class TestTranscribeFilesBatch(unittest.TestCase):
+    """Test cases for TranscriptionService.transcribe_files_batch"""
+
+    def setUp(self):
+        """Create short, long and unreadable audio paths"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.paths = []
+        for name in ["short.mp3", "long.mp3", "broken.mp3"]:
+            path = Path(self.temp_dir.name) / name
+            path.touch()
+            self.paths.append(path)
+
+    @staticmethod
+    def duration(audio_path):
+        """Return the fake duration of a test file"""
+        if audio_path.name == "broken.mp3":
+            raise RuntimeError("cannot decode")
+        return 1800 if audio_path.name == "long.mp3" else 60
+
+    @staticmethod
+    def split_audio(audio_path, output_dir=None):
+        """Write two segment files to output_dir"""
+        segments = []
+        for i in range(2):
+            path = output_dir / f"segment_{i}.wav"
+            path.touch()
+            segments.append((i * 900.0, (i + 1) * 900.0, path))
+        return segments
+
+    def test_segments_are_grouped_per_file(self, mock_client, mock_vad):
+        """Test segment results are combined into their file's transcription"""
+        service = TranscriptionService("key")
+        service.vad_processor.split_audio.side_effect = self.split_audio
+        service.client.transcribe_audio_batch.return_value = [
+            "short text",
+            "segment 0",
+            RuntimeError("Batch request failed: quota"),
+        ]
+        stop_event = threading.Event()
+
+        with patch(
+            "src.transcription.service.get_audio_duration", side_effect=self.duration
+        ):
+            results = service.transcribe_files_batch(self.paths, stop_event=stop_event)
+
+        items = service.client.transcribe_audio_batch.call_args.args[0]
+        self.assertEqual(
+            [(path.name, info) for path, info in items],
+            [
+                ("short.mp3", None),
+                ("segment_0.wav", (0.0, 900.0)),
+                ("segment_1.wav", (900.0, 1800.0)),
+            ],
+        )
+        self.assertIs(
+            service.client.transcribe_audio_batch.call_args.kwargs["stop_event"],
+            stop_event,
+        )
+        self.assertEqual(results[0], "short text")
+        self.assertEqual(
+            results[1], "segment 0\n\n[セグメント 2 の文字起こしに失敗: RuntimeError]"
+        )
+        self.assertIsInstance(results[2], RuntimeError)
+        # Segment files only live for the duration of the call
+        self.assertFalse(items[1][0].exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests for system utility functions"""
+
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.system import (
+    check_ffmpeg,
+    ensure_ffmpeg,
+    hash_file,
+    validate_directory_path,
+    validate_file_path,
+    write_all,
+)
+
+
+class TestCheckFfmpeg(unittest.TestCase):
+    """Test cases for FFmpeg detection"""
+
+    def setUp(self):
+        """Reset the cached detection result"""
+        check_ffmpeg.cache_clear()
+        self.addCleanup(check_ffmpeg.cache_clear)
+
+    @patch("src.utils.system.shutil.which", return_value="/usr/bin/ffmpeg")
+    def test_result_is_cached(self, mock_which):
+        """Test FFmpeg is only looked up once per process"""
+        self.assertTrue(check_ffmpeg())
+        ensure_ffmpeg()
+        ensure_ffmpeg()
+        mock_which.assert_called_once_with("ffmpeg")
+
+    @patch("src.utils.system.shutil.which", return_value=None)
+    def test_missing_ffmpeg(self, mock_which):
+        """Test a missing FFmpeg binary raises with instructions"""
+        self.assertFalse(check_ffmpeg())
+        with self.assertRaises(RuntimeError) as context:
+            ensure_ffmpeg()
+        self.assertIn("FFmpeg is not installed", str(context.exception))
+
+
+class TestHashFile(unittest.TestCase):
+    """Test cases for hash_file"""
+
+    def test_hash_file_depends_on_content(self):
+        """Test hash_file is stable for equal content and differs otherwise"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = Path(temp_dir) / "a.wav"
+            second = Path(temp_dir) / "b.wav"
+            first.write_bytes(b"audio")
+            second.write_bytes(b"audio")
+            self.assertEqual(hash_file(first), hash_file(second))
+            self.assertEqual(hash_file(first), hashlib.blake2b(b"audio").hexdigest())
+
+            second.write_bytes(b"other")
+            self.assertNotEqual(hash_file(first), hash_file(second))
+
+
+class TestValidatePaths(unittest.TestCase):
+    """Test cases for path validation"""
+
+    def setUp(self):
+        """Create a directory containing one file"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir_path = Path(temp_dir.name)
+        self.file_path = self.dir_path / "audio.mp3"
+        self.file_path.write_bytes(b"audio")
+
+    def test_validate_file_path(self):
+        """Test files pass and directories or missing paths are rejected"""
+        self.assertEqual(validate_file_path(self.file_path), self.file_path)
+        with self.assertRaises(ValueError):
+            validate_file_path(self.dir_path)
+        with self.assertRaises(FileNotFoundError):
+            validate_file_path(self.dir_path / "missing.mp3")
+        with self.assertRaises(FileNotFoundError):
+            validate_file_path(self.file_path / "child.mp3")
+        missing = self.dir_path / "missing.mp3"
+        self.assertEqual(validate_file_path(missing, must_exist=False), missing)
+
+    def test_validate_directory_path(self):
+        """Test directories pass and files or missing paths are rejected"""
+        self.assertEqual(validate_directory_path(self.dir_path), self.dir_path)
+        with self.assertRaises(ValueError):
+            validate_directory_path(self.file_path)
+        with self.assertRaises(FileNotFoundError):
+            validate_directory_path(self.dir_path / "missing")
+        missing = self.dir_path / "missing"
+        self.assertEqual(validate_directory_path(missing, must_exist=False), missing)
+
+    def test_single_stat_call(self):
+        """Test a path is stat'ed once per validation"""
+        with patch.object(Path, "stat", autospec=True, wraps=Path.stat) as mock_stat:
+            validate_file_path(self.file_path)
+            validate_directory_path(self.dir_path)
+        self.assertEqual(mock_stat.call_count, 2)
+
+
+class TestWriteAll(unittest.TestCase):
+    """Test cases for write_all"""
+
+    def test_retries_short_writes(self):
+        """Test every buffer is written in order when the OS writes less"""
+        written = []
+
+        def short_writev(fd, buffers):
+            data = b"".join(bytes(buffer) for buffer in buffers)[:3]
+            written.append(data)
+            return len(data)
+
+        with patch("src.utils.system.os.writev", side_effect=short_writev, create=True):
+            write_all(1, [b"ab", b"", b"cdefg", b"h"])
+
+        self.assertEqual(b"".join(written), b"abcdefgh")
+
+    def test_writes_to_file(self):
+        """Test buffers reach the file descriptor"""
+        with tempfile.TemporaryFile() as f:
+            write_all(f.fileno(), ["本文".encode("utf-8"), b"\n"])
+            f.seek(0)
+            self.assertEqual(f.read().decode("utf-8"), "本文\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
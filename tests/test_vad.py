@@ -0,0 +1,50 @@
+"""Tests for VAD segment grouping"""
+
+import unittest
+
+from src.audio.vad import VADProcessor
+from src.constants import MIN_SEGMENT_DURATION
+
+
+def _timestamps(*spans):
+    """Build speech timestamp dictionaries from (start, end) pairs"""
+    return [{"start": start, "end": end} for start, end in spans]
+
+
+class TestGroupSegments(unittest.TestCase):
+    """Test cases for VADProcessor._group_segments"""
+
+    def setUp(self):
+        """Create a processor; grouping does not need the model"""
+        self.processor = VADProcessor()
+
+    def test_groups_up_to_max_duration(self):
+        """Test timestamps are packed into segments of at most max_duration"""
+        segments = self.processor._group_segments(
+            _timestamps((0, 40), (50, 90), (100, 140), (150, 190)), 100
+        )
+        self.assertEqual(segments, [(0, 90), (100, 190)])
+
+    def test_short_tail_merged_into_previous(self):
+        """Test a short final segment joins the previous one"""
+        tail = MIN_SEGMENT_DURATION / 2
+        segments = self.processor._group_segments(
+            _timestamps((0, 50), (60, 100), (101, 101 + tail)), 100
+        )
+        self.assertEqual(segments, [(0, 101 + tail)])
+
+    def test_short_tail_kept_after_long_silence(self):
+        """Test a short final segment far from the previous one stays separate"""
+        segments = self.processor._group_segments(
+            _timestamps((0, 50), (60, 100), (1000, 1005)), 100
+        )
+        self.assertEqual(segments, [(0, 100), (1000, 1005)])
+
+    def test_single_short_segment(self):
+        """Test a lone short segment is returned as is"""
+        segments = self.processor._group_segments(_timestamps((3, 5)), 100)
+        self.assertEqual(segments, [(3, 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
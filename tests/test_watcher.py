@@ -0,0 +1,275 @@
+"""Tests for the vault file watcher"""
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from watchdog.events import (
+    DirCreatedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+
+from src.obsidian.watcher import (
+    AudioFileHandler,
+    EventDebouncer,
+    VaultWatcher,
+    wait_until_stable,
+)
+
+
+class TestEventDebouncer(unittest.TestCase):
+    """Test cases for EventDebouncer"""
+
+    def setUp(self):
+        """Set up a debouncer that records processed paths"""
+        self.processed = []
+        self.done = threading.Event()
+
+        def callback(path):
+            self.processed.append(path)
+            self.done.set()
+
+        self.debouncer = EventDebouncer(callback, delay=0.05)
+
+    def tearDown(self):
+        """Shut down the debouncer"""
+        self.debouncer.close()
+
+    def test_coalesces_repeated_events(self):
+        """Test repeated events for one path trigger a single callback"""
+        path = Path("recording.m4a")
+        for _ in range(10):
+            self.debouncer.schedule(path)
+
+        self.assertTrue(self.done.wait(timeout=2))
+        self.debouncer.close()
+        self.assertEqual(self.processed, [path])
+
+    def test_paths_are_debounced_independently(self):
+        """Test events for different paths are processed separately"""
+        first = Path("first.m4a")
+        second = Path("second.m4a")
+        self.debouncer.schedule(first)
+        self.debouncer.schedule(second)
+
+        self.assertTrue(_wait_for(lambda: len(self.processed) == 2))
+        self.assertCountEqual(self.processed, [first, second])
+
+    def test_close_drops_pending_events(self):
+        """Test close cancels events that have not settled yet"""
+        self.debouncer.delay = 10
+        self.debouncer.schedule(Path("recording.m4a"))
+        self.debouncer.close()
+        self.assertEqual(self.processed, [])
+
+    def test_callback_errors_are_contained(self):
+        """Test a failing callback does not stop later paths"""
+        calls = []
+        done = threading.Event()
+
+        def callback(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise RuntimeError("processing failed")
+            done.set()
+
+        debouncer = EventDebouncer(callback, delay=0.01)
+        try:
+            debouncer.schedule(Path("first.m4a"))
+            self.assertTrue(_wait_for(lambda: len(calls) == 1))
+            debouncer.schedule(Path("second.m4a"))
+            self.assertTrue(done.wait(timeout=2))
+        finally:
+            debouncer.close()
+
+
+class TestAudioFileHandler(unittest.TestCase):
+    """Test cases for AudioFileHandler"""
+
+    def test_unchanged_file_is_processed_once(self):
+        """Test a file is only processed again after its mtime changes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.mp3"
+            path.write_bytes(b"audio")
+            processed = []
+
+            def callback(p):
+                processed.append(p)
+                return True
+
+            handler = AudioFileHandler(callback)
+            try:
+                handler._process(path)
+                handler._process(path)
+                self.assertEqual(processed, [path])
+
+                stat = path.stat()
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                handler._process(path)
+                self.assertEqual(processed, [path, path])
+            finally:
+                handler.close()
+
+    def test_only_audio_events_are_scheduled(self):
+        """Test events are filtered by audio extension before scheduling"""
+        handler = AudioFileHandler(lambda path: None, delay=10)
+        try:
+            with patch.object(handler.debouncer, "schedule") as mock_schedule:
+                handler.on_created(FileCreatedEvent("/vault/a.MP3"))
+                handler.on_modified(FileModifiedEvent("/vault/note.md"))
+                handler.on_modified(FileModifiedEvent("/vault/.mp3"))
+                handler.on_moved(FileMovedEvent("/vault/b.tmp", "/vault/b.m4a"))
+                handler.on_created(DirCreatedEvent("/vault/c.wav"))
+
+            self.assertEqual(
+                [call.args[0] for call in mock_schedule.call_args_list],
+                [Path("/vault/a.MP3"), Path("/vault/b.m4a")],
+            )
+        finally:
+            handler.close()
+
+    def test_deleted_and_moved_files_are_forgotten(self):
+        """Test paths that no longer exist are dropped from the mtime record"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = Path(temp_dir) / "a.mp3"
+            second = Path(temp_dir) / "b.mp3"
+            first.write_bytes(b"audio")
+            second.write_bytes(b"audio")
+            handler = AudioFileHandler(lambda path: True, delay=10)
+            try:
+                handler._process(first)
+                handler._process(second)
+                self.assertEqual(set(handler._last_seen), {first, second})
+
+                handler.on_deleted(FileDeletedEvent(str(first)))
+                handler.on_moved(
+                    FileMovedEvent(str(second), str(Path(temp_dir) / "c.mp3"))
+                )
+
+                self.assertEqual(handler._last_seen, {})
+            finally:
+                handler.close()
+
+    def test_failed_file_is_retried(self):
+        """Test a failed file is processed again on the next event"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.mp3"
+            path.write_bytes(b"audio")
+            calls = []
+
+            def callback(p):
+                calls.append(p)
+                return len(calls) > 1
+
+            handler = AudioFileHandler(callback)
+            try:
+                handler._process(path)
+                handler._process(path)
+                handler._process(path)
+                self.assertEqual(len(calls), 2)
+            finally:
+                handler.close()
+
+
+class TestWaitUntilStable(unittest.TestCase):
+    """Test cases for wait_until_stable"""
+
+    def test_stable_file(self):
+        """Test a file that is not being written settles after one interval"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.mp3"
+            path.write_bytes(b"audio")
+            self.assertTrue(wait_until_stable(path, interval=0.01, max_wait=1))
+
+    def test_missing_file(self):
+        """Test a missing file is reported as not stable"""
+        self.assertFalse(
+            wait_until_stable(Path("missing.mp3"), interval=0.01, max_wait=1)
+        )
+
+    def test_growing_file_times_out(self):
+        """Test a file that keeps growing is given up on after max_wait"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "a.mp3"
+            path.write_bytes(b"")
+            stop = threading.Event()
+
+            def writer():
+                with open(path, "ab", buffering=0) as f:
+                    while not stop.wait(0.005):
+                        f.write(b"x")
+
+            thread = threading.Thread(target=writer)
+            thread.start()
+            try:
+                self.assertFalse(wait_until_stable(path, interval=0.05, max_wait=0.3))
+            finally:
+                stop.set()
+                thread.join()
+
+
+class TestVaultWatcher(unittest.TestCase):
+    """Test cases for VaultWatcher"""
+
+    def test_find_audio_files(self):
+        """Test audio files are found recursively regardless of extension case"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault = Path(temp_dir)
+            (vault / "sub" / "deeper").mkdir(parents=True)
+            expected = [
+                vault / "a.mp3",
+                vault / "sub" / "b.M4A",
+                vault / "sub" / "deeper" / "c.wav",
+            ]
+            for path in expected:
+                path.touch()
+            (vault / "note.md").touch()
+            (vault / "sub" / "mp3").touch()
+
+            watcher = VaultWatcher(vault, lambda path: None)
+            self.assertCountEqual(watcher.find_audio_files(), expected)
+
+    def test_scan_existing_files_continues_after_failure(self):
+        """Test a failing file does not stop the scan"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            vault = Path(temp_dir)
+            (vault / "a.mp3").touch()
+            (vault / "b.mp3").touch()
+            processed = []
+
+            def callback(path):
+                processed.append(path)
+                raise RuntimeError("processing failed")
+
+            VaultWatcher(vault, callback).scan_existing_files()
+            self.assertEqual(len(processed), 2)
+
+    @patch("src.obsidian.watcher.os.cpu_count", return_value=16)
+    @patch("src.obsidian.watcher.ThreadPoolExecutor")
+    def test_scan_workers_sized_by_segment_concurrency(self, mock_pool, mock_cpu):
+        """Test the default pool keeps workers x segments within the cap"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watcher = VaultWatcher(Path(temp_dir), lambda path: True)
+            for concurrency, workers in [(1, 8), (4, 2), (16, 1)]:
+                watcher.scan_existing_files(segment_concurrency=concurrency)
+                self.assertEqual(mock_pool.call_args.kwargs["max_workers"], workers)
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Poll a predicate until it holds or the timeout expires"""
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return True
+        event.wait(0.01)
+    return predicate()
+
+
+if __name__ == "__main__":
+    unittest.main()
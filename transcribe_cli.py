@@ -2,14 +2,21 @@
 """Command-line interface for audio transcription"""
 
 import argparse
+import os
 import sys
+import uuid
 from pathlib import Path
 
 from src.config import Config
+from src.constants import MAX_CONCURRENT_SEGMENTS
 from src.transcription.service import TranscriptionService
-from src.utils.system import ensure_ffmpeg, validate_file_path
+from src.utils.system import ensure_ffmpeg, validate_file_path, write_all
 from src.utils.logging import setup_logging, get_logger
 
+# WAV files are read without FFmpeg; other spellings of the suffix just get
+# the FFmpeg check
+_WAV_SUFFIXES = frozenset({'.wav', '.WAV'})
+
 
 def main():
     """Main function for CLI transcription"""
@@ -49,6 +56,13 @@ def main():
         help='VADによる分割を無効化（短い音声ファイルの場合に推奨）'
     )
 
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=None,
+        help=f'VAD分割したセグメントを同時に文字起こしする数（デフォルト: {MAX_CONCURRENT_SEGMENTS}）'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -80,21 +94,21 @@ def main():
     logger = get_logger('cli')
 
     try:
+        # Validate audio file before any FFmpeg lookup
+        audio_path = validate_file_path(Path(args.audio_file))
+
         # Check for non-WAV files
-        audio_path = Path(args.audio_file)
-        if not audio_path.suffix.lower() == '.wav':
+        if audio_path.suffix not in _WAV_SUFFIXES:
             ensure_ffmpeg()
 
-        # Validate audio file
-        audio_path = validate_file_path(audio_path)
-
         # Create configuration
         config = Config.from_args(args)
 
         # Create transcription service
         service = TranscriptionService(
             api_key=config.api_key,
-            verbose=config.verbose
+            verbose=config.verbose,
+            max_concurrency=config.max_concurrency
         )
 
         logger.info(f"Transcribing: {audio_path}")
@@ -105,24 +119,51 @@ def main():
             print(f"出力ファイル: {args.output}")
             print("文字起こし中...")
 
-        # Transcribe the audio
-        transcription = service.transcribe_file(
-            audio_path,
-            use_vad=not args.no_vad
-        )
-
-        # Save the transcription
+        # Transcribe the audio, writing each segment as soon as it is ready
+        # so the full text is never held in memory at once. Segments go to a
+        # hidden file beside the output, which replaces it only on success,
+        # so a failed or interrupted run leaves any existing output intact.
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(
+            f".{output_path.name}.{uuid.uuid4().hex}.tmp"
+        )
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(transcription)
+        preview = ""
+        total_length = 0
+        fd = os.open(
+            tmp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0),
+            0o666
+        )
+        try:
+            try:
+                segments = service.transcribe_file_iter(
+                    audio_path,
+                    use_vad=not args.no_vad
+                )
+                for i, text in enumerate(segments):
+                    # Encode each segment once and hand the bytes straight to
+                    # the OS, without a text-layer buffer in between
+                    data = text.encode('utf-8')
+                    write_all(fd, (b'\n\n', data) if i > 0 else (data,))
+                    total_length += len(text) + (2 if i > 0 else 0)
+                    if len(preview) < 500:
+                        preview = (preview + "\n\n" + text if i > 0 else text)[:500]
+                    if args.verbose:
+                        print(f"  セグメント {i + 1} 完了")
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
         if args.verbose:
             print("\n文字起こし完了！")
             print(f"結果を {output_path} に保存しました")
             print("\n--- 文字起こし内容 (最初の500文字) ---")
-            print(transcription[:500] + "..." if len(transcription) > 500 else transcription)
+            print(preview + "..." if total_length > 500 else preview)
         else:
             print(f"文字起こし完了: {output_path}")
 